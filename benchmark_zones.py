@@ -0,0 +1,553 @@
+"""
+Micro-benchmark-uri pentru monitorizarea zonelor.
+
+Generează zone și detectări sintetice și măsoară costul operațiilor din
+`zone_monitor.py` pe frame, fără model YOLO sau sursă video.
+
+Usage:
+    python benchmark_zones.py --bench point_lookup
+
+Example:
+    python benchmark_zones.py --bench point_lookup --points 40 --zones 30 --repeats 500
+    python benchmark_zones.py --bench ppe_association --points 40 --ppe 120
+    python benchmark_zones.py --bench allocations --frames 10000 --points 20 --ppe 60
+    python benchmark_zones.py --bench tracking --tracks 200 --frames 2000
+    python benchmark_zones.py --bench tracker_store --tracks 200 --frames 3000
+    python benchmark_zones.py --bench draw_zones --zones 4
+    python benchmark_zones.py --bench render --zones 4 --points 20 --ppe 40
+"""
+
+import gc
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from datetime import datetime, timedelta
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from zone_monitor import ZoneMonitor, Detection, DetectionBatch, ZoneViolation
+
+
+def make_zones_config(n_zones: int,
+                      width: int = 1920,
+                      height: int = 1080,
+                      vertices: int = 6,
+                      seed: int = 0) -> dict:
+    """Generează o configurație de zone cu poligoane regulate aleatoare.
+
+    Args:
+        n_zones (int): Numărul de zone.
+        width (int): Lățimea frame-ului.
+        height (int): Înălțimea frame-ului.
+        vertices (int): Numărul de vârfuri per poligon.
+        seed (int): Seed pentru generatorul aleator.
+
+    Returns:
+        dict: Configurație în formatul `zones_config_example.json`.
+    """
+    rng = np.random.default_rng(seed)
+    zones = []
+
+    for i in range(n_zones):
+        cx, cy = rng.uniform(0, width), rng.uniform(0, height)
+        radius = rng.uniform(40, 200)
+        angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+        polygon = np.stack([cx + radius * np.cos(angles),
+                            cy + radius * np.sin(angles)], axis=1)
+
+        zones.append({
+            'id': f'zone_{i}',
+            'name': f'Zona {i}',
+            'polygon': polygon.astype(int).tolist(),
+            'rules': {
+                'ppe_required': ['helmet', 'vest'],
+                'max_dwell_time': 180,
+                'restricted_access': i % 3 == 0
+            }
+        })
+
+    return {'image_size': {'width': width, 'height': height}, 'zones': zones}
+
+
+def make_monitor(config: dict, **kwargs) -> ZoneMonitor:
+    """Creează un ZoneMonitor dintr-o configurație în memorie (via fișier temporar)."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = Path(tmp_dir) / 'zones.json'
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+        return ZoneMonitor(str(config_path), **kwargs)
+
+
+def make_detections(n_persons: int,
+                    n_ppe: int,
+                    width: int = 1920,
+                    height: int = 1080,
+                    seed: int = 2):
+    """Generează detectări sintetice de persoane și PPE (PPE-uri plasate pe persoane).
+
+    Returns:
+        Tuple[List[Detection], List[Detection]]: (persoane, PPE).
+    """
+    rng = np.random.default_rng(seed)
+    ppe_names = ['Hardhat', 'Safety Vest', 'gloves', 'boots']
+    persons, ppe = [], []
+
+    for _ in range(n_persons):
+        x1, y1 = int(rng.integers(0, width - 80)), int(rng.integers(0, height - 200))
+        persons.append(Detection(bbox=(x1, y1, x1 + 80, y1 + 200),
+                                 class_name='person', confidence=0.9))
+
+    for j in range(n_ppe):
+        px1, py1, _, _ = persons[j % n_persons].bbox if persons else (0, 0, 0, 0)
+        x1, y1 = px1 + int(rng.integers(0, 60)), py1 + int(rng.integers(0, 180))
+        ppe.append(Detection(bbox=(x1, y1, x1 + 20, y1 + 20),
+                             class_name=ppe_names[j % len(ppe_names)], confidence=0.8))
+
+    return persons, ppe
+
+
+def _time_per_call(fn, repeats: int) -> float:
+    """Returnează timpul mediu per apel în microsecunde."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def bench_point_lookup(n_points: int, n_zones: int, repeats: int, vertices: int = 6):
+    """Compară bucla `get_zone_for_point` cu lookup-ul vectorizat și cu rasterul.
+
+    Args:
+        n_points (int): Numărul de persoane (centre) per frame.
+        n_zones (int): Numărul de zone.
+        repeats (int): Numărul de repetări pentru medie.
+        vertices (int): Numărul de vârfuri per poligon.
+    """
+    config = make_zones_config(n_zones, vertices=vertices)
+    monitor = make_monitor(config, raster_scale=None)
+    raster_monitor = make_monitor(config, raster_scale=1.0)
+    half_monitor = make_monitor(config, raster_scale=0.5)
+    width, height = config['image_size']['width'], config['image_size']['height']
+
+    rng = np.random.default_rng(1)
+    centers = np.stack([rng.integers(0, width, n_points),
+                        rng.integers(0, height, n_points)], axis=1)
+    points = [(int(x), int(y)) for x, y in centers]
+
+    def loop():
+        return [monitor.get_zone_for_point(p) for p in points]
+
+    def vectorized():
+        return monitor.zones_for_points(centers)
+
+    def raster():
+        return raster_monitor.zones_for_points(centers)
+
+    def raster_half():
+        return half_monitor.zones_for_points(centers)
+
+    # Verifică echivalența înainte de măsurare
+    expected = np.array([monitor.zones.index(z) if z is not None else -1 for z in loop()])
+    assert expected.tolist() == vectorized().tolist(), "Rezultate diferite între implementări"
+    # Rasterul poate diferi doar pe pixelii de contur
+    agree_full = (raster() == expected).mean() * 100
+    agree_half = (raster_half() == expected).mean() * 100
+
+    t_loop = _time_per_call(loop, repeats)
+    t_vec = _time_per_call(vectorized, repeats)
+    t_raster = _time_per_call(raster, repeats)
+    t_half = _time_per_call(raster_half, repeats)
+
+    print(f"\n📊 Point lookup: {n_points} puncte × {n_zones} zone × {vertices} vârfuri")
+    print(f"  • get_zone_for_point (buclă): {t_loop:10.1f} µs/frame")
+    print(f"  • zones_for_points (NumPy):   {t_vec:10.1f} µs/frame  ({t_loop / t_vec:.1f}x)")
+    print(f"  • raster 1.0:                 {t_raster:10.1f} µs/frame  "
+          f"({t_loop / t_raster:.1f}x, acord {agree_full:.1f}%)")
+    print(f"  • raster 0.5:                 {t_half:10.1f} µs/frame  "
+          f"({t_loop / t_half:.1f}x, acord {agree_half:.1f}%)")
+
+
+def bench_ppe_association(n_persons: int, n_ppe: int, repeats: int):
+    """Compară `check_ppe_requirements` per persoană cu `associate_ppe` pe grilă.
+
+    Args:
+        n_persons (int): Persoane per frame.
+        n_ppe (int): Detectări PPE per frame.
+        repeats (int): Numărul de repetări pentru medie.
+    """
+    monitor = make_monitor(make_zones_config(1))
+    persons, ppe = make_detections(n_persons, n_ppe)
+    required = list(ZoneMonitor.PPE_CLASSES)
+
+    def per_person():
+        return [monitor.check_ppe_requirements(p, ppe, required) for p in persons]
+
+    def grid():
+        return [[r for r in required if r not in s] for s in monitor.associate_ppe(persons, ppe)]
+
+    assert per_person() == grid(), "Rezultate diferite între implementări"
+
+    t_loop = _time_per_call(per_person, repeats)
+    t_grid = _time_per_call(grid, repeats)
+
+    print(f"\n📊 Asociere PPE: {n_persons} persoane × {n_ppe} PPE")
+    print(f"  • check_ppe_requirements (buclă): {t_loop:10.1f} µs/frame")
+    print(f"  • associate_ppe (grilă):          {t_grid:10.1f} µs/frame  ({t_loop / t_grid:.1f}x)")
+
+
+def _draw_zones_per_frame(monitor: ZoneMonitor, image: np.ndarray, alpha: float) -> np.ndarray:
+    """Referință: randarea zonelor la fiecare frame, fără cache (varianta inițială)."""
+    overlay = image.copy()
+    output = image.copy()
+    for i, zone in enumerate(monitor.zones):
+        color = monitor.ZONE_COLORS[i % len(monitor.ZONE_COLORS)]
+        polygon = zone['polygon_np']
+        cv2.fillPoly(overlay, [polygon], color)
+        cv2.polylines(output, [polygon], True, color, 2)
+        M = cv2.moments(polygon)
+        if M["m00"] != 0:
+            cv2.putText(output, zone['name'], (int(M["m10"] / M["m00"]) - 50, int(M["m01"] / M["m00"])),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    cv2.addWeighted(overlay, alpha, output, 1 - alpha, 0, output)
+    return output
+
+
+def bench_draw_zones(n_zones: int, repeats: int, alpha: float = 0.2):
+    """Compară `draw_zones` (overlay din cache) cu randarea la fiecare frame.
+
+    Rulează la 1080p și 4K; raportează și costul primei randări (cache miss)
+    și diferența maximă de pixel față de referință.
+
+    Args:
+        n_zones (int): Numărul de zone.
+        repeats (int): Frame-uri per măsurătoare.
+        alpha (float): Transparența fill-ului.
+    """
+    print(f"\n📊 draw_zones: {n_zones} zone, alpha {alpha}")
+    for width, height in [(1920, 1080), (3840, 2160)]:
+        monitor = make_monitor(make_zones_config(n_zones, width, height))
+        image = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+        start = time.perf_counter()
+        overlay = monitor.get_zone_overlay(height, width, alpha)
+        t_build = (time.perf_counter() - start) * 1e3
+        t_reference = _time_per_call(lambda: _draw_zones_per_frame(monitor, image, alpha), repeats) / 1e3
+        t_cached = _time_per_call(lambda: monitor.draw_zones(image, alpha), repeats) / 1e3
+
+        x1, y1, x2, y2 = overlay.rect
+        diff = np.abs(monitor.draw_zones(image, alpha).astype(np.int16)
+                      - _draw_zones_per_frame(monitor, image, alpha)).max()
+        print(f"  • {width}x{height}: per frame {t_reference:6.2f} ms → cache {t_cached:6.2f} ms "
+              f"({t_reference / t_cached:.1f}x), randare inițială {t_build:.1f} ms, "
+              f"dreptunghi {(x2 - x1) * (y2 - y1) / (width * height):.0%} din frame, "
+              f"diferență max {diff}")
+
+
+def bench_render(n_persons: int, n_ppe: int, n_zones: int, repeats: int):
+    """Compară modurile de render ale `render_frame` la 1080p și 4K.
+
+    - `copii`: fluxul anterior, cu o copie a frame-ului în `render_frame`, două în
+      `draw_zones` (randare per frame) și una în `draw_violations`
+    - `o copie`: `render_frame(...)` cu `out=None` (overlay-urile desenate în aceeași copie)
+    - `buffer`: `out=` un buffer prealocat, reutilizat între frame-uri
+    - `in-place`: `out=packet.frame`
+
+    Pentru fiecare mod raportează ms/frame și vârful de memorie temporară
+    alocată per frame (tracemalloc).
+
+    Args:
+        n_persons (int): Persoane per frame.
+        n_ppe (int): Detectări PPE per frame.
+        n_zones (int): Numărul de zone.
+        repeats (int): Frame-uri per măsurătoare.
+    """
+    from inference_with_zones import render_frame
+    from video_pipeline import FramePacket
+
+    names = {0: 'person', 1: 'Hardhat', 2: 'Safety Vest', 3: 'gloves', 4: 'boots'}
+    name_ids = {name: class_id for class_id, name in names.items()}
+
+    print(f"\n📊 Render: {n_persons} persoane, {n_ppe} PPE, {n_zones} zone")
+    for width, height in [(1920, 1080), (3840, 2160)]:
+        monitor = make_monitor(make_zones_config(n_zones, width, height))
+        class_roles = monitor.compile_class_roles(names)
+        persons, ppe = make_detections(n_persons, n_ppe, width, height)
+        detections = DetectionBatch.from_detections(persons + ppe)
+        detections = DetectionBatch(detections.boxes, detections.confidences,
+                                    [name_ids[det.class_name] for det in persons + ppe], names)
+        violations = monitor.check_violations(detections)
+        frame = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+        def make_packet(pixels):
+            packet = FramePacket(1, pixels, datetime.now())
+            packet.detections = detections
+            packet.violations = violations
+            return packet
+
+        def render_with_copies():
+            output = _draw_zones_per_frame(monitor, frame.copy(), 0.2)
+            output = monitor.draw_violations(output, violations)
+            render_frame(monitor, make_packet(output), class_roles, show_zones=False, out=output)
+
+        buffer = np.empty_like(frame)
+        work = frame.copy()  # In-place: frame-ul e suprascris la fiecare render
+        modes = [
+            ('copii', render_with_copies),
+            ('o copie', lambda: render_frame(monitor, make_packet(frame), class_roles)),
+            ('buffer', lambda: render_frame(monitor, make_packet(frame), class_roles, out=buffer)),
+            ('in-place', lambda: render_frame(monitor, make_packet(work), class_roles, out=work)),
+        ]
+
+        print(f"  {width}x{height}:")
+        for name, fn in modes:
+            t_frame = _time_per_call(fn, repeats) / 1e3
+
+            tracemalloc.start()
+            peak_total = 0
+            for _ in range(10):
+                tracemalloc.reset_peak()
+                base, _ = tracemalloc.get_traced_memory()
+                fn()
+                _, peak = tracemalloc.get_traced_memory()
+                peak_total += peak - base
+            tracemalloc.stop()
+            print(f"    • {name:<9} {t_frame:6.2f} ms/frame  "
+                  f"memorie temporară {peak_total / 10 / 2**20:6.1f} MiB/frame "
+                  f"({peak_total / 10 / frame.nbytes:.1f} frame-uri)")
+
+
+def bench_tracking(n_tracks: int, n_frames: int, width: int = 1920, height: int = 1080,
+                   miss_rate: float = 0.05, seed: int = 0):
+    """Măsoară `IoUTracker` pe obiecte sintetice în mișcare.
+
+    Obiectele se mișcă cu viteză constantă (cu ricoșeu la margini), box-urile
+    au jitter de ±2 px, iar fiecare detecție lipsește cu probabilitatea
+    `miss_rate`. Raportează timpul per frame și schimbările de ID (un obiect
+    căruia i s-au dat mai multe ID-uri).
+
+    Args:
+        n_tracks (int): Obiecte simultane.
+        n_frames (int): Frame-uri simulate.
+        width (int): Lățimea scenei.
+        height (int): Înălțimea scenei.
+        miss_rate (float): Probabilitatea ca o detecție să lipsească.
+        seed (int): Seed pentru generatorul aleator.
+    """
+    from tracker import IoUTracker
+
+    rng = np.random.default_rng(seed)
+    size = np.array([40, 80], np.float32)
+    position = rng.uniform([0, 0], [width - 40, height - 80], (n_tracks, 2)).astype(np.float32)
+    velocity = rng.uniform(-4, 4, (n_tracks, 2)).astype(np.float32)
+    tracker = IoUTracker()
+    assigned = [set() for _ in range(n_tracks)]
+    elapsed = 0.0
+
+    for _ in range(n_frames):
+        position += velocity
+        bounce = (position < 0) | (position > [width - 40, height - 80])
+        velocity[bounce] *= -1
+
+        visible = np.nonzero(rng.random(n_tracks) >= miss_rate)[0]
+        rng.shuffle(visible)
+        jitter = rng.uniform(-2, 2, (len(visible), 4)).astype(np.float32)
+        boxes = np.concatenate([position[visible], position[visible] + size], axis=1) + jitter
+
+        start = time.perf_counter()
+        ids = tracker.update_boxes(boxes)
+        elapsed += time.perf_counter() - start
+
+        for obj, track_id in zip(visible.tolist(), ids.tolist()):
+            assigned[obj].add(track_id)
+
+    switches = sum(len(ids) - 1 for ids in assigned)
+    print(f"\n📊 Tracking: {n_tracks} obiecte × {n_frames} frame-uri (miss {miss_rate:.0%})")
+    print(f"  • IoUTracker.update: {elapsed / n_frames * 1e6:10.1f} µs/frame")
+    print(f"  • track-uri active la final: {len(tracker)}")
+    print(f"  • schimbări de ID: {switches} ({switches / n_tracks:.2f} per obiect)")
+
+
+def bench_tracker_store(n_tracks: int, n_frames: int, fps: float = 30.0):
+    """Costul per frame al persistenței `ZoneTracker` și timpul de restaurare.
+
+    Rulează `update` + `expire` pentru `n_tracks` perechi (track, zonă) per
+    frame, fără și cu `SqliteTrackerStore` (flush la 1 s), apoi măsoară
+    reîncărcarea stării dintr-un proces „repornit”.
+
+    Args:
+        n_tracks (int): Perechi (track, zonă) active per frame.
+        n_frames (int): Frame-uri simulate.
+        fps (float): Frame-uri pe secundă (timpul simulat al frame-urilor).
+    """
+    from zone_monitor import ZoneTracker
+    from tracker_store import SqliteTrackerStore
+
+    def run(store):
+        tracker = ZoneTracker()
+        if store is not None:
+            tracker.attach_store(store)
+        start_time = time.time()
+        elapsed = 0.0
+        for frame in range(n_frames):
+            now = start_time + frame / fps
+            start = time.perf_counter()
+            tracker.expire(now)
+            for track_id in range(n_tracks):
+                tracker.update(track_id, 'zone_0', now)
+            elapsed += time.perf_counter() - start
+        return tracker, elapsed / n_frames * 1e6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'state.db'
+        _, t_memory = run(None)
+        store = SqliteTrackerStore(path)
+        tracker, t_store = run(store)
+        tracker.close()
+
+        start = time.perf_counter()
+        restored = ZoneTracker()
+        restored.attach_store(SqliteTrackerStore(path), max_gap=n_frames / fps + 60)
+        t_restore = (time.perf_counter() - start) * 1000
+        restored.close()
+
+    print(f"\n📊 Persistență ZoneTracker: {n_tracks} track-uri × {n_frames} frame-uri ({fps:.0f} fps)")
+    print(f"  • fără store:            {t_memory:10.1f} µs/frame")
+    print(f"  • cu SqliteTrackerStore: {t_store:10.1f} µs/frame  (+{t_store - t_memory:.1f} µs, "
+          f"flush {store.flush_seconds / max(store.flushes, 1) * 1000:.2f} ms/s)")
+    print(f"  • restaurare: {len(restored)} intrări în {t_restore:.1f} ms")
+
+
+@dataclass
+class _DataclassDetection:
+    """Replica vechiului `Detection` (@dataclass cu `__dict__`), pentru comparație."""
+    bbox: Tuple[int, int, int, int]
+    class_name: str
+    confidence: float
+    track_id: Optional[int] = None
+
+
+@dataclass
+class _DataclassViolation:
+    """Replica vechiului `ZoneViolation` (@dataclass, mesaj construit imediat)."""
+    zone_id: str
+    zone_name: str
+    violation_type: str
+    detection: _DataclassDetection
+    message: str
+    timestamp: datetime
+    severity: str
+
+
+def _traced_bytes(factory, count: int) -> float:
+    """Memoria alocată (bytes/obiect) pentru `count` obiecte ținute în viață."""
+    tracemalloc.start()
+    objects = [factory(i) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current / count
+
+
+def bench_allocations(n_frames: int, n_persons: int, n_ppe: int):
+    """Măsoară alocările (tracemalloc) și colectările GC pentru `check_violations`.
+
+    Compară costul per obiect al recordurilor slotted (`Detection` @dataclass cu `__slots__`,
+    `ZoneViolation` cu `__slots__` și mesaj leneș) cu variantele @dataclass
+    anterioare, apoi rulează `check_violations` pe `n_frames` frame-uri sintetice.
+
+    Args:
+        n_frames (int): Numărul de frame-uri simulate (ex: 10000).
+        n_persons (int): Persoane per frame.
+        n_ppe (int): Detectări PPE per frame.
+    """
+    now = datetime.now()
+    count = 100_000
+
+    det_old = _traced_bytes(lambda i: _DataclassDetection((i, i, i + 80, i + 200), 'person', 0.9, i), count)
+    det_new = _traced_bytes(lambda i: Detection((i, i, i + 80, i + 200), 'person', 0.9, i), count)
+    viol_old = _traced_bytes(lambda i: _DataclassViolation(
+        'zone_1', 'Zona 1', 'missing_ppe', None,
+        f"PPE lipsă în Zona 1: {', '.join(('helmet', 'vest'))}", now, 'high'), count)
+    viol_new = _traced_bytes(lambda i: ZoneViolation(
+        'zone_1', 'Zona 1', 'missing_ppe', None, timestamp=now, severity='high',
+        details=('helmet', 'vest')), count)
+
+    print(f"\n📊 Memorie per obiect ({count} obiecte)")
+    print(f"  • Detection:     @dataclass {det_old:6.1f} B  →  slots      {det_new:6.1f} B")
+    print(f"  • ZoneViolation: @dataclass {viol_old:6.1f} B  →  __slots__  {viol_new:6.1f} B")
+
+    # Rulare sintetică: aceleași detectări, timestamp-uri de 30 fps
+    monitor = make_monitor(make_zones_config(30))
+    persons, ppe = make_detections(n_persons, n_ppe)
+    persons = [replace(det, track_id=i) for i, det in enumerate(persons)]
+
+    gc.collect()
+    gc_before = [stats['collections'] for stats in gc.get_stats()]
+    tracemalloc.start()
+    start = time.perf_counter()
+    n_violations = 0
+
+    for frame_idx in range(n_frames):
+        current_time = now + timedelta(seconds=frame_idx / 30)
+        n_violations += len(monitor.check_violations(persons, ppe, current_time))
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc_after = [stats['collections'] for stats in gc.get_stats()]
+
+    print(f"\n📊 check_violations: {n_frames} frame-uri × {n_persons} persoane × {n_ppe} PPE")
+    print(f"  • Timp: {elapsed / n_frames * 1e6:.1f} µs/frame (cu tracemalloc activ)")
+    print(f"  • Violări: {n_violations} ({n_violations / n_frames:.1f}/frame)")
+    print(f"  • Vârf memorie urmărită: {peak / 1024:.1f} KiB")
+    print(f"  • Colectări GC (gen0/gen1/gen2): "
+          f"{'/'.join(str(a - b) for a, b in zip(gc_after, gc_before))}")
+
+
+def main():
+    """Entry point pentru benchmark-uri."""
+    parser = argparse.ArgumentParser(description='Micro-benchmark-uri zone monitor')
+    parser.add_argument('--bench', '-b', default='point_lookup',
+                       choices=['point_lookup', 'ppe_association', 'allocations', 'tracking',
+                                'tracker_store', 'draw_zones', 'render'],
+                       help='Benchmark-ul de rulat')
+    parser.add_argument('--points', type=int, default=40,
+                       help='Persoane per frame (default: 40)')
+    parser.add_argument('--ppe', type=int, default=120,
+                       help='Detectări PPE per frame (default: 120)')
+    parser.add_argument('--zones', type=int, default=30,
+                       help='Număr de zone (default: 30)')
+    parser.add_argument('--vertices', type=int, default=6,
+                       help='Vârfuri per poligon (default: 6)')
+    parser.add_argument('--frames', type=int, default=10000,
+                       help='Frame-uri pentru benchmark-ul allocations (default: 10000)')
+    parser.add_argument('--tracks', type=int, default=100,
+                       help='Obiecte simultane pentru benchmark-ul tracking (default: 100)')
+    parser.add_argument('--repeats', '-r', type=int, default=500,
+                       help='Repetări per măsurătoare (default: 500)')
+    args = parser.parse_args()
+
+    if args.bench == 'point_lookup':
+        bench_point_lookup(args.points, args.zones, args.repeats, args.vertices)
+    elif args.bench == 'ppe_association':
+        bench_ppe_association(args.points, args.ppe, args.repeats)
+    elif args.bench == 'allocations':
+        bench_allocations(args.frames, args.points, args.ppe)
+    elif args.bench == 'tracking':
+        bench_tracking(args.tracks, args.frames)
+    elif args.bench == 'tracker_store':
+        bench_tracker_store(args.tracks, args.frames)
+    elif args.bench == 'draw_zones':
+        bench_draw_zones(args.zones, min(args.repeats, 100))
+    elif args.bench == 'render':
+        bench_render(args.points, args.ppe, args.zones, min(args.repeats, 100))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""
+Event bus asyncio pentru violări, cu sink-uri batched (JSONL, HTTP, SQLite).
+
+Bucla de frame-uri apelează `publish` (nu blochează niciodată): violările
+intră într-un buffer bounded, sunt grupate în batch-uri după număr și timp,
+apoi trimise în paralel către fiecare sink. Fiecare sink are propria coadă
+bounded de batch-uri, deci un sink lent (ex: webhook) nu le întârzie pe
+celelalte; ce nu încape e numărat în `dropped`.
+
+Example:
+    >>> bus = ViolationEventBus([JsonlSink('violations.jsonl'), SqliteSink('violations.db')])
+    >>> bus.start()
+    >>> bus.publish(violations, frame=42)
+    >>> bus.close()
+    >>> bus.print_report()
+"""
+
+import sys
+import abc
+import json
+import asyncio
+import sqlite3
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+class EventSink(abc.ABC):
+    """Sink asincron de violări; primește batch-uri de record-uri JSON-safe.
+
+    Implementările blocante (fișiere, HTTP, SQLite) rulează pe un executor
+    cu un singur thread per sink, deci ordinea batch-urilor se păstrează.
+    """
+
+    name = 'sink'
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.name)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def open(self):
+        """Pregătește sink-ul (apelat o dată, în bucla event bus-ului)."""
+
+    @abc.abstractmethod
+    async def write(self, batch: List[Dict]):
+        """Scrie un batch de record-uri."""
+
+    async def close(self):
+        """Eliberează resursele sink-ului."""
+        self._executor.shutdown(wait=True)
+
+
+class JsonlSink(EventSink):
+    """Adaugă violările într-un fișier JSON lines (un obiect per linie)."""
+
+    name = 'jsonl'
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = Path(path)
+        self._file = None
+
+    async def open(self):
+        self._file = await self._run(open, self.path, 'a', 1024 * 64, 'utf-8')
+
+    def _write(self, batch: List[Dict]):
+        self._file.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in batch))
+        self._file.flush()
+
+    async def write(self, batch: List[Dict]):
+        await self._run(self._write, batch)
+
+    async def close(self):
+        if self._file is not None:
+            await self._run(self._file.close)
+        await super().close()
+
+
+class HttpSink(EventSink):
+    """Trimite fiecare batch ca POST JSON (`{"violations": [...]}`) către un endpoint."""
+
+    name = 'http'
+
+    def __init__(self, url: str, timeout: float = 5.0, headers: Optional[Dict[str, str]] = None):
+        super().__init__()
+        self.url = url
+        self.timeout = timeout
+        self.headers = {'Content-Type': 'application/json', **(headers or {})}
+
+    def _post(self, batch: List[Dict]):
+        body = json.dumps({'violations': batch}, ensure_ascii=False).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, headers=self.headers, method='POST')
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    async def write(self, batch: List[Dict]):
+        await self._run(self._post, batch)
+
+
+class SqliteSink(EventSink):
+    """Salvează violările într-un tabel SQLite (o tranzacție per batch)."""
+
+    name = 'sqlite'
+
+    COLUMNS = ('timestamp', 'camera_id', 'frame', 'zone_id', 'zone_name',
+               'violation_type', 'severity', 'message', 'track_id')
+
+    def __init__(self, path: str, table: str = 'violations'):
+        super().__init__()
+        self.path = str(path)
+        self.table = table
+        self._conn = None
+
+    def _open(self):
+        # Conexiunea e creată și folosită doar pe thread-ul executorului
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            + ', '.join(f"{column} {'INTEGER' if column in ('frame', 'track_id') else 'TEXT'}"
+                        for column in self.COLUMNS)
+            + ", payload TEXT)"
+        )
+        self._conn.commit()
+
+    def _insert(self, batch: List[Dict]):
+        rows = [tuple(record.get(column) for column in self.COLUMNS)
+                + (json.dumps(record, ensure_ascii=False),) for record in batch]
+        placeholders = ', '.join('?' * (len(self.COLUMNS) + 1))
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO {self.table} ({', '.join(self.COLUMNS)}, payload) VALUES ({placeholders})",
+                rows
+            )
+
+    async def open(self):
+        await self._run(self._open)
+
+    async def write(self, batch: List[Dict]):
+        await self._run(self._insert, batch)
+
+    async def close(self):
+        if self._conn is not None:
+            await self._run(self._conn.close)
+        await super().close()
+
+
+def make_sink(spec: str) -> EventSink:
+    """Construiește un sink dintr-o specificație CLI.
+
+    Formate: `jsonl:violations.jsonl`, `sqlite:violations.db`,
+    `http://localhost:8000/violations` (sau `https://...`).
+
+    Args:
+        spec (str): Specificația sink-ului.
+
+    Returns:
+        EventSink: Sink-ul configurat.
+    """
+    if spec.startswith(('http://', 'https://')):
+        return HttpSink(spec)
+    kind, _, target = spec.partition(':')
+    if kind == 'jsonl' and target:
+        return JsonlSink(target)
+    if kind == 'sqlite' and target:
+        return SqliteSink(target)
+    raise ValueError(f"Sink necunoscut: {spec} (jsonl:<fișier>, sqlite:<fișier>, http://...)")
+
+
+class SinkStats:
+    """Contoare per sink.
+
+    Attributes:
+        written (int): Record-uri scrise cu succes.
+        batches (int): Batch-uri scrise cu succes.
+        dropped (int): Record-uri aruncate (coada sink-ului plină).
+        errors (int): Record-uri pierdute din cauza erorilor de scriere.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+
+
+class _SinkRunner:
+    """Coada bounded de batch-uri și task-ul care le scrie într-un sink."""
+
+    def __init__(self, sink: EventSink, max_batches: int):
+        self.sink = sink
+        self.stats = SinkStats(sink.name)
+        self.queue = None  # Creată în bucla bus-ului
+        self.max_batches = max_batches
+
+    def offer(self, batch: List[Dict]):
+        try:
+            self.queue.put_nowait(batch)
+        except asyncio.QueueFull:
+            self.stats.dropped += len(batch)
+
+    async def run(self):
+        try:
+            await self.sink.open()
+            opened = True
+        except Exception as e:
+            opened = False
+            self.stats.last_error = f"{type(e).__name__}: {e}"
+        try:
+            while True:
+                batch = await self.queue.get()
+                if batch is None:
+                    break
+                if not opened:
+                    self.stats.errors += len(batch)
+                    continue
+                try:
+                    await self.sink.write(batch)
+                except Exception as e:
+                    self.stats.errors += len(batch)
+                    self.stats.last_error = f"{type(e).__name__}: {e}"
+                else:
+                    self.stats.written += len(batch)
+                    self.stats.batches += 1
+        finally:
+            await self.sink.close()
+
+
+# Marchează închiderea bus-ului în coada de intrare
+_CLOSE = object()
+
+
+class ViolationEventBus:
+    """Bus asyncio, pe thread propriu, între bucla de frame-uri și sink-uri.
+
+    Attributes:
+        published (int): Violări primite prin `publish`.
+        dropped (int): Violări aruncate pentru că buffer-ul de intrare era plin.
+    """
+
+    def __init__(self,
+                 sinks: Sequence[EventSink],
+                 batch_size: int = 100,
+                 flush_interval: float = 1.0,
+                 max_pending: int = 10000,
+                 max_batches_per_sink: int = 32):
+        """
+        Args:
+            sinks: Sink-urile care primesc fiecare batch
+            batch_size: Numărul maxim de violări per batch
+            flush_interval: Vârsta maximă (secunde) a unui batch incomplet
+            max_pending: Capacitatea buffer-ului de intrare (violări)
+            max_batches_per_sink: Batch-uri în așteptare per sink
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._runners = [_SinkRunner(sink, max_batches_per_sink) for sink in sinks]
+        self.published = 0
+        self.dropped = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._queue = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name='event-bus', daemon=True)
+
+    def start(self) -> 'ViolationEventBus':
+        """Pornește thread-ul cu bucla asyncio (așteaptă până e gata)."""
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def publish(self, violations: Iterable, frame: Optional[int] = None,
+                camera_id: Optional[str] = None):
+        """Trimite violările spre sink-uri, fără să blocheze apelantul.
+
+        Serializarea (inclusiv mesajele) se face pe thread-ul bus-ului.
+
+        Args:
+            violations: `ZoneViolation`-urile unui frame.
+            frame: Numărul frame-ului (adăugat în record).
+            camera_id: ID-ul camerei (adăugat în record, dacă e setat).
+        """
+        violations = list(violations)
+        if not violations or not self._thread.is_alive():
+            return
+        self.published += len(violations)
+        self._loop.call_soon_threadsafe(self._enqueue, violations, frame, camera_id)
+
+    def _enqueue(self, violations: List, frame: Optional[int], camera_id: Optional[str]):
+        # Rulează în bucla bus-ului: fără race pe contoare și pe coadă
+        for violation in violations:
+            try:
+                self._queue.put_nowait((violation, frame, camera_id))
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    @staticmethod
+    def _to_record(violation, frame: Optional[int], camera_id: Optional[str]) -> Dict:
+        record = violation.to_dict()
+        if frame is not None:
+            record['frame'] = frame
+        if camera_id is not None:
+            record['camera_id'] = camera_id
+        return record
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+
+    async def _main(self):
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        for runner in self._runners:
+            runner.queue = asyncio.Queue(maxsize=runner.max_batches)
+        tasks = [asyncio.ensure_future(runner.run()) for runner in self._runners]
+        self._ready.set()
+
+        closing = False
+        while not closing:
+            item = await self._queue.get()
+            if item is _CLOSE:
+                break
+            batch = [self._to_record(*item)]
+            deadline = self._loop.time() + self.flush_interval
+
+            # Batch complet sau expirat, ce vine primul
+            while len(batch) < self.batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _CLOSE:
+                    closing = True
+                    break
+                batch.append(self._to_record(*item))
+
+            for runner in self._runners:
+                runner.offer(batch)
+
+        # Cozile sunt bounded: marcajul de sfârșit așteaptă un loc liber
+        for runner in self._runners:
+            await runner.queue.put(None)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self, timeout: float = 10.0):
+        """Trimite batch-ul curent, închide sink-urile și oprește thread-ul."""
+        if self._thread.is_alive():
+            # Cu buffer-ul plin, marcajul așteaptă până bucla bus-ului face loc
+            asyncio.run_coroutine_threadsafe(self._queue.put(_CLOSE), self._loop)
+            self._thread.join(timeout)
+
+    def stats(self) -> List[SinkStats]:
+        """Contoarele fiecărui sink, în ordinea din constructor."""
+        return [runner.stats for runner in self._runners]
+
+    def print_report(self, file=None):
+        """Afișează violările publicate, aruncate și scrise per sink."""
+        print(f"\n📨 Event bus: {self.published} violări publicate, "
+              f"{self.dropped} aruncate (buffer plin)", file=file or sys.stdout)
+        for stats in self.stats():
+            line = (f"  • {stats.name:<8} scrise {stats.written} ({stats.batches} batch-uri)  "
+                    f"aruncate {stats.dropped}  erori {stats.errors}")
+            if stats.last_error:
+                line += f"  ultima: {stats.last_error}"
+            print(line, file=file or sys.stdout)
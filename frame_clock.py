@@ -0,0 +1,133 @@
+"""
+Ceasul frame-urilor: timpul regulilor vine din stream, nu din momentul procesării.
+
+`ZoneTracker` măsoară staționarea ca diferență între timestamp-urile
+frame-urilor. Cu `datetime.now()`, un fișier procesat de 4x mai repede decât
+timpul real raportează staționări de 4x mai scurte, iar frame-urile grupate în
+batch-uri sau sărite la decodare primesc momentul procesării, nu al capturii.
+
+- `StreamClock` (fișiere): `start_time` + PTS-ul frame-ului (`CAP_PROP_POS_MSEC`),
+  sau `(index - 1) / fps` când backend-ul nu raportează PTS
+- `MonotonicClock` (surse live): momentul pornirii + `time.monotonic()` scurs,
+  fără salturi la ajustările ceasului sistemului
+
+Sursele de frame-uri (`video_sources`, `shared_frames`, `read_frames`) marchează
+fiecare `FramePacket` cu ceasul lor; `ZoneMonitor.check_violations` primește
+timestamp-ul pachetului sau, fără `current_time`, `clock.now()`.
+
+Example:
+    >>> clock = make_clock('recording.mp4', fps=25.0)
+    >>> ret, frame = cap.read()
+    >>> timestamp = clock.stamp(1, cap.get(cv2.CAP_PROP_POS_MSEC))
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Union
+
+
+CLOCK_MODES = ('auto', 'stream', 'wall')
+
+
+def is_live_source(source: Union[str, int]) -> bool:
+    """Webcam sau stream de rețea (nu fișier)."""
+    return (isinstance(source, int) or str(source).isdigit()
+            or str(source).split('://')[0] in ('rtsp', 'rtmp', 'http', 'https'))
+
+
+class MonotonicClock:
+    """Timp real pentru surse live, măsurat cu `time.monotonic()` de la pornire.
+
+    Attributes:
+        start_time (datetime): Momentul pornirii ceasului.
+    """
+
+    live = True
+
+    def __init__(self, start_time: Optional[datetime] = None):
+        """
+        Args:
+            start_time: Momentul corespunzător pornirii (default: acum)
+        """
+        self.start_time = start_time or datetime.now()
+        self._origin = time.monotonic()
+
+    def now(self) -> datetime:
+        """Momentul curent."""
+        return self.start_time + timedelta(seconds=time.monotonic() - self._origin)
+
+    def stamp(self, index: int, pos_msec: Optional[float] = None) -> datetime:
+        """Timestamp-ul unui frame tocmai capturat (PTS-ul sursei live e ignorat)."""
+        return self.now()
+
+
+class StreamClock:
+    """Timpul din stream pentru fișiere: PTS-ul frame-ului, indiferent de viteza procesării.
+
+    Attributes:
+        start_time (datetime): Momentul primului frame.
+        fps (float): Frame rate-ul, pentru frame-urile fără PTS.
+        estimated (int): Frame-uri fără PTS valid, cu timpul estimat din index.
+    """
+
+    live = False
+
+    def __init__(self, fps: float = 0.0, start_time: Optional[datetime] = None):
+        """
+        Args:
+            fps: Frame rate-ul sursei (0 = 30)
+            start_time: Momentul primului frame (default: acum, ca un replay care începe acum)
+        """
+        self.start_time = start_time or datetime.now()
+        self.fps = fps or 30.0
+        self.estimated = 0
+        self._seconds = 0.0
+
+    def seconds(self, index: int, pos_msec: Optional[float] = None) -> float:
+        """Secunde de la primul frame; crescătoare (un PTS mai mic ține timpul pe loc).
+
+        Args:
+            index (int): Numărul frame-ului în stream (de la 1).
+            pos_msec (Optional[float]): `CAP_PROP_POS_MSEC` după citirea frame-ului.
+                Unele backend-uri raportează 0 sau valori negative fără PTS.
+        """
+        if pos_msec is not None and (pos_msec > 0 or (pos_msec == 0 and index <= 1)):
+            seconds = pos_msec / 1000.0
+        else:
+            seconds = (index - 1) / self.fps
+            self.estimated += 1
+        self._seconds = max(seconds, self._seconds)
+        return self._seconds
+
+    def now(self) -> datetime:
+        """Timpul ultimului frame marcat."""
+        return self.start_time + timedelta(seconds=self._seconds)
+
+    def stamp(self, index: int, pos_msec: Optional[float] = None) -> datetime:
+        """Timestamp-ul frame-ului `index`: `start_time` + PTS."""
+        return self.start_time + timedelta(seconds=self.seconds(index, pos_msec))
+
+
+def make_clock(source: Union[str, int], fps: float = 0.0, mode: str = 'auto',
+               start_time: Optional[datetime] = None) -> Union[StreamClock, MonotonicClock]:
+    """Ceasul potrivit sursei.
+
+    Args:
+        source (Union[str, int]): Sursa video (path, URL sau index webcam).
+        fps (float): Frame rate-ul sursei.
+        mode (str): 'auto' (live → 'wall', fișier → 'stream'), 'stream' sau 'wall'.
+        start_time (Optional[datetime]): Momentul primului frame / al pornirii.
+
+    Returns:
+        Union[StreamClock, MonotonicClock]: Ceasul.
+
+    Raises:
+        ValueError: Mod necunoscut.
+    """
+    if mode == 'auto':
+        mode = 'wall' if is_live_source(source) else 'stream'
+    if mode == 'stream':
+        return StreamClock(fps, start_time)
+    if mode == 'wall':
+        return MonotonicClock(start_time)
+    raise ValueError(f"Ceas necunoscut: {mode} (disponibile: {', '.join(CLOCK_MODES)})")
@@ -4,19 +4,246 @@ Detectează persoane și PPE, apoi verifică violările în zone.
 """
 
 import cv2
+import sys
+import json
 import argparse
+import functools
+import contextlib
+import numpy as np
 from pathlib import Path
+import time
+from typing import Iterator, List, Optional, Sequence, TextIO, Union
 from ultralytics import YOLO
-from zone_monitor import ZoneMonitor, Detection
+from zone_monitor import ZoneMonitor, DetectionBatch, ClassRoles
+from video_pipeline import FramePacket, StagedPipeline, iter_batches
+from shared_frames import SharedFrameSource
+from event_bus import ViolationEventBus, make_sink
+from violation_events import ViolationDebouncer
+from tracker import IoUTracker, iou_matrix
+from tracker_store import SqliteTrackerStore
+from roi_crops import RoiDetector
+from motion_gate import MotionGate
+from video_sources import DECODE_BACKENDS, open_source
+from video_writer import ENCODER_BACKENDS, open_writer
+from frame_clock import CLOCK_MODES, MonotonicClock
 from datetime import datetime
 
 
+def read_frames(cap: cv2.VideoCapture,
+                camera_id: Optional[str] = None,
+                clock=None) -> Iterator[FramePacket]:
+    """Citește frame-urile din sursă și le marchează cu timestamp-ul ceasului.
+    
+    Args:
+        cap (cv2.VideoCapture): Sursa video deschisă.
+        camera_id (Optional[str]): ID-ul camerei, propagat în fiecare pachet.
+        clock: Ceasul sursei (vezi `frame_clock.make_clock`); default momentul capturii.
+        
+    Yields:
+        FramePacket: Frame-ul, numărul lui (de la 1) și timestamp-ul.
+    """
+    clock = clock or MonotonicClock()
+    index = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        index += 1
+        yield FramePacket(index, frame, clock.stamp(index, cap.get(cv2.CAP_PROP_POS_MSEC)), camera_id)
+
+
+def detect_frame(model, frame: np.ndarray, conf_threshold: float,
+                 class_roles: ClassRoles) -> DetectionBatch:
+    """Rulează YOLO pe un frame și păstrează doar detectările cu rol (persoană/PPE).
+    
+    Args:
+        model: Modelul YOLO încărcat.
+        frame (np.ndarray): Frame-ul BGR.
+        conf_threshold (float): Threshold pentru confidence score.
+        class_roles (ClassRoles): Tabelul class id → rol compilat din `model.names`.
+        
+    Returns:
+        DetectionBatch: Detectările frame-ului (un singur transfer device→host).
+    """
+    return detect_frames(model, [frame], conf_threshold, class_roles)[0]
+
+
+def detect_frames(model, frames: List[np.ndarray], conf_threshold: float,
+                  class_roles: Union[ClassRoles, Sequence[ClassRoles]]) -> List[DetectionBatch]:
+    """Rulează un singur predict YOLO batched pe mai multe frame-uri.
+    
+    Args:
+        model: Modelul YOLO încărcat.
+        frames (List[np.ndarray]): Frame-urile BGR, în ordine.
+        conf_threshold (float): Threshold pentru confidence score.
+        class_roles (Union[ClassRoles, Sequence[ClassRoles]]): Tabelul class id → rol
+            compilat din `model.names`, comun sau câte unul per frame (ex: frame-uri
+            din camere cu configurații de zone diferite).
+        
+    Returns:
+        List[DetectionBatch]: Detectările fiecărui frame, în aceeași ordine.
+    """
+    if isinstance(class_roles, ClassRoles):
+        class_roles = [class_roles] * len(frames)
+    results = model(frames, conf=conf_threshold, verbose=False)
+    batches = []
+    for result, frame_roles in zip(results, class_roles):
+        detections = DetectionBatch.from_yolo(result, model.names)
+        roles = frame_roles.role[detections.class_ids]
+        batches.append(detections.select(roles != ClassRoles.ROLE_IGNORE))
+    return batches
+
+
+def render_frame(zone_monitor: ZoneMonitor,
+                 packet: FramePacket,
+                 class_roles: ClassRoles,
+                 show_zones: bool = True,
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Desenează zonele, detectările, violările și info-ul frame-ului.
+    
+    Toate overlay-urile se desenează în același buffer: cel mult o copie a
+    frame-ului per apel (niciuna cu `out=packet.frame`).
+    
+    Args:
+        zone_monitor (ZoneMonitor): Monitorul de zone.
+        packet (FramePacket): Frame-ul cu detectările și violările lui.
+        class_roles (ClassRoles): Tabelul class id → rol (pentru nume și numărare persoane).
+        show_zones (bool): Dacă să deseneze zonele.
+        out (Optional[np.ndarray]): Destinația: None = copie nouă, `packet.frame` =
+            desenare in-place (pixelii originali se pierd), alt array de aceeași
+            formă = buffer prealocat, reutilizat între frame-uri.
+        
+    Returns:
+        np.ndarray: Frame-ul cu overlay-uri.
+    """
+    detections = packet.detections
+    violations = packet.violations
+    
+    # Un singur buffer pentru toate overlay-urile
+    if out is None:
+        output_frame = packet.frame.copy()
+    else:
+        output_frame = out
+        if out is not packet.frame:
+            np.copyto(out, packet.frame)
+    
+    # 1. Desenează zonele (dacă e activat)
+    if show_zones:
+        zone_monitor.draw_zones(output_frame, alpha=0.2, out=output_frame)
+    
+    # 2. Desenează detectările normale (fără violări)
+    for (x1, y1, x2, y2), class_id, conf, track_id in zip(detections.boxes.tolist(),
+                                                          detections.class_ids.tolist(),
+                                                          detections.confidences.tolist(),
+                                                          detections.track_ids.tolist()):
+        label = f"{class_roles.names[class_id]} {conf:.2f}"
+        if track_id >= 0:
+            label = f"#{track_id} {label}"
+        
+        # Verde pentru detectări normale
+        cv2.rectangle(output_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cv2.putText(output_frame, label, (x1, y1 - 10),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+    
+    # 3. Desenează violările (override peste detectările normale)
+    if violations:
+        zone_monitor.draw_violations(output_frame, violations, out=output_frame)
+        
+        # Afișează lista cu violări
+        y_offset = 30
+        for i, violation in enumerate(violations[:5]):  # Max 5
+            text = f"⚠ {violation.message}"
+            cv2.putText(output_frame, text, (10, y_offset),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+            y_offset += 30
+    
+    # Info în colțul din dreapta
+    n_persons = int(np.count_nonzero(
+        class_roles.role[detections.class_ids] == ClassRoles.ROLE_PERSON
+    ))
+    info_text = [
+        f"Frame: {packet.index}",
+        f"Persoane: {n_persons}",
+        f"Violari: {len(violations)}",
+    ]
+    
+    y_pos = 30
+    for text in info_text:
+        (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+        x_pos = output_frame.shape[1] - tw - 10
+        cv2.putText(output_frame, text, (x_pos, y_pos),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        y_pos += 30
+    
+    return output_frame
+
+
+def violation_records(packet: FramePacket, items: Optional[list] = None) -> List[dict]:
+    """Violările unui frame ca dict-uri JSON-safe (cu frame și camera_id).
+    
+    Args:
+        packet (FramePacket): Frame-ul cu violările lui.
+        items (Optional[list]): Ce se serializează în locul `packet.violations`
+            (ex: evenimentele `ViolationDebouncer`); orice obiect cu `to_dict()`.
+    
+    Returns:
+        List[dict]: Un record per violare.
+    """
+    records = []
+    for violation in packet.violations if items is None else items:
+        record = violation.to_dict()
+        record['frame'] = packet.index
+        if packet.camera_id is not None:
+            record['camera_id'] = packet.camera_id
+        records.append(record)
+    return records
+
+
+def write_violations_jsonl(stream: TextIO, packet: FramePacket, items: Optional[list] = None):
+    """Scrie violările unui frame ca JSON lines (un obiect per violare).
+    
+    Args:
+        stream (TextIO): Stream-ul de output (stdout sau fișier).
+        packet (FramePacket): Frame-ul cu violările lui.
+        items (Optional[list]): Ce se scrie în locul `packet.violations`.
+    """
+    for record in violation_records(packet, items):
+        stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+    stream.flush()
+
+
 def run_inference_with_zones(
     model_path: str,
     zones_config: str,
     source: str,
     output: str = None,
-    conf_threshold: float = 0.5
+    conf_threshold: float = 0.5,
+    pipeline: bool = False,
+    queue_size: int = 8,
+    drop_oldest: bool = False,
+    batch_size: int = 1,
+    max_latency: Optional[float] = None,
+    headless: bool = False,
+    events_path: Optional[str] = None,
+    shared_decode: bool = False,
+    ring_slots: int = 8,
+    sinks: Sequence[str] = (),
+    debouncer: Optional[ViolationDebouncer] = None,
+    tracker: Optional[IoUTracker] = None,
+    state_path: Optional[str] = None,
+    roi_margin: Optional[int] = None,
+    roi_tile: int = 0,
+    motion_threshold: Optional[float] = None,
+    max_skip: int = 15,
+    decode_backend: str = 'opencv',
+    decode_size: Optional[int] = None,
+    hwaccel: Optional[str] = None,
+    encoder: str = 'opencv',
+    codec: Optional[str] = None,
+    writer_queue: int = 8,
+    clock: str = 'auto',
+    start_time: Optional[datetime] = None,
+    exit_timeout: Optional[float] = None
 ):
     """Rulează inference YOLO cu monitorizare zone și detecție violări.
     
@@ -24,12 +251,77 @@ def run_inference_with_zones(
     verifică dacă detectările sunt în zonele configurate și afișează violările
     regulilor de siguranță în timp real.
     
+    În modul `pipeline`, decodarea, inference-ul (YOLO + reguli) și
+    render-ul/encodarea rulează pe thread-uri separate legate prin cozi
+    bounded (vezi `video_pipeline.StagedPipeline`); ordinea frame-urilor se
+    păstrează, iar throughput-ul per etapă e afișat la final.
+    
+    Cu `batch_size > 1`, frame-urile sunt acumulate și trimise modelului
+    într-un singur predict; rezultatele sunt apoi verificate frame cu frame,
+    fiecare cu timestamp-ul propriei capturi.
+    
     Args:
         model_path (str): Calea către modelul YOLO (.pt).
         zones_config (str): Calea către fișierul de configurație JSON cu zone.
         source (str): Sursa video ('0' pentru webcam, path pentru fișier).
         output (str, optional): Calea pentru salvarea video-ului procesat.
         conf_threshold (float): Threshold pentru confidence score (default: 0.5).
+        pipeline (bool): Rulează etapele pe thread-uri separate (default: False).
+        queue_size (int): Capacitatea cozilor dintre etape (default: 8).
+        drop_oldest (bool): Pentru surse live: aruncă cel mai vechi frame decodat
+            când inference-ul nu ține pasul, în loc să blocheze decodarea.
+            Cu `batch_size > 1` se aruncă batch-uri întregi.
+        batch_size (int): Frame-uri per predict YOLO (default: 1).
+        max_latency (Optional[float]): Așteptarea maximă (secunde) pentru umplerea
+            unui batch; un batch incomplet e trimis la expirare.
+        headless (bool): Fără fereastră și tastatură (servere fără display).
+            Overlay-urile se desenează doar dacă e setat `output`.
+        events_path (Optional[str]): Fișier JSON lines pentru violări; '-' = stdout.
+            În modul headless, implicit stdout.
+        shared_decode (bool): Decodare într-un proces separat, cu frame-urile
+            transmise prin memorie partajată (vezi `shared_frames`), fără pickling.
+        ring_slots (int): Sloturi de frame în memoria partajată (minim 2 × batch_size).
+            Când sunt toate ocupate decodarea așteaptă; cu `drop_oldest` sare peste frame-uri.
+        sinks (Sequence[str]): Sink-uri asincrone pentru violări (vezi `event_bus.make_sink`):
+            `jsonl:<fișier>`, `sqlite:<fișier>`, `http://...`. Publicarea nu blochează bucla.
+        debouncer (Optional[ViolationDebouncer]): Dacă e setat, JSON lines și sink-urile
+            primesc evenimente start/ongoing/end în locul violărilor repetate la fiecare frame.
+            Overlay-ul de pe frame rămâne per frame.
+        tracker (Optional[IoUTracker]): Atribuie track_id-uri stabile înainte de
+            `check_violations` (necesar pentru regulile `max_dwell_time`).
+        state_path (Optional[str]): Fișier SQLite în care starea `ZoneTracker` (și a
+            `tracker`-ului) e salvată incremental și din care e restaurată la pornire.
+        roi_margin (Optional[int]): Dacă e setat, inference-ul rulează doar pe ferestrele
+            zonelor (bbox + `roi_margin` px), vezi `roi_crops.RoiDetector`.
+        roi_tile (int): Cu `roi_margin`: tile-uri de cel mult `roi_tile` px, la rezoluție
+            nativă (0 = ferestre întregi, la scara frame-ului întreg).
+        motion_threshold (Optional[float]): Dacă e setat, frame-urile în care fracția de
+            pixeli schimbați din zone e sub prag nu trec prin model și refolosesc ultimele
+            detectări (vezi `motion_gate.MotionGate`). `check_violations` rulează în
+            continuare la fiecare frame, deci timpii de staționare avansează.
+        max_skip (int): Cu `motion_threshold`: frame-uri consecutive sărite cel mult.
+        decode_backend (str): 'opencv' sau 'ffmpeg' (vezi `video_sources`). Cu
+            `shared_decode`, procesul de decodare folosește OpenCV.
+        decode_size (Optional[int]): Dacă e setat, frame-urile sunt decodate/micșorate
+            direct la latura mare `decode_size` (ex: `imgsz`). Poligoanele zonelor sunt
+            scalate la aceeași rezoluție; detectările, violările și video-ul de output
+            sunt în pixelii frame-ului decodat.
+        hwaccel (Optional[str]): Decodare hardware pentru backend-ul ffmpeg (ex: 'auto').
+        encoder (str): Encoderul video-ului de output, 'opencv' sau 'ffmpeg'. Encodarea
+            rulează pe un thread separat (vezi `video_writer.AsyncVideoWriter`).
+        codec (Optional[str]): FOURCC (opencv, default 'mp4v') sau codec ffmpeg
+            (default 'libx264').
+        writer_queue (int): Frame-uri în așteptarea encodării; cu `drop_oldest`, frame-urile
+            care nu mai încap sunt aruncate în loc să blocheze bucla.
+        clock (str): Timpul regulilor (vezi `frame_clock`): 'stream' = `start_time` + PTS-ul
+            frame-ului (un fișier procesat mai repede sau mai încet decât timpul real
+            păstrează timpii de staționare), 'wall' = timp monoton de la pornire,
+            'auto' = 'stream' pentru fișiere și 'wall' pentru surse live.
+        start_time (Optional[datetime]): Momentul primului frame cu ceasul 'stream'
+            (default: pornirea procesării).
+        exit_timeout (Optional[float]): Secunde fără observare după care un track a ieșit
+            din zonă și timpul lui de staționare se resetează (default: cheia `exit_timeout`
+            din configurația zonelor, altfel 30 s).
     
     Raises:
         ValueError: Dacă sursa video nu poate fi deschisă.
@@ -39,168 +331,422 @@ def run_inference_with_zones(
         ...     model_path='best.pt',
         ...     zones_config='zones.json',
         ...     source='0',  # webcam
-        ...     conf_threshold=0.6
+        ...     conf_threshold=0.6,
+        ...     pipeline=True,
+        ...     drop_oldest=True
         ... )
     
     Note:
-        Controale keyboard:
+        Controale keyboard (fără `headless`):
         - 'q': oprește procesarea
         - 'z': toggle afișare zone
         - 's': salvează screenshot
     """
+    if headless and events_path is None:
+        events_path = '-'
+    
+    # Cu violările pe stdout, mesajele de status merg pe stderr
+    log_stream = sys.stderr if events_path == '-' else sys.stdout
+    log = functools.partial(print, file=log_stream)
+    
     # Încarcă modelul YOLO
-    print(f"📦 Încărcare model: {model_path}")
+    log(f"📦 Încărcare model: {model_path}")
     model = YOLO(model_path)
     
     # Încarcă zone monitor
-    print(f"🗺️  Încărcare configurație zone: {zones_config}")
-    zone_monitor = ZoneMonitor(zones_config)
+    log(f"🗺️  Încărcare configurație zone: {zones_config}")
+    zone_monitor = ZoneMonitor(zones_config, exit_timeout=exit_timeout)
     
-    # Deschide sursa video
-    if source.isdigit():
-        source = int(source)
-    cap = cv2.VideoCapture(source)
+    def close_writer(writer):
+        # Encodează frame-urile rămase în coadă
+        try:
+            writer.release()
+        except RuntimeError as e:
+            log(f"❌ {e}")
+        writer.print_report(file=log_stream)
     
-    if not cap.isOpened():
-        print(f"❌ Nu pot deschide sursa: {source}")
-        return
+    def close_bus(bus):
+        bus.close()
+        bus.print_report(file=log_stream)
     
-    # Pregătește writer pentru output (dacă e cazul)
-    writer = None
-    if output:
-        fps = int(cap.get(cv2.CAP_PROP_FPS))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        writer = cv2.VideoWriter(output, fourcc, fps, (width, height))
-        print(f"💾 Salvare output: {output}")
-    
-    print("\n▶️  Pornire inference...")
-    print("  • 'q' = oprește")
-    print("  • 'z' = toggle afișare zone")
-    print("  • 's' = screenshot\n")
-    
-    show_zones = True
-    frame_count = 0
-    
-    # Mapare clase pentru identificare ușoară
-    PERSON_CLASSES = ['person', 'Person', 'NO-Person']
-    PPE_CLASSES = ['Hardhat', 'Safety Vest', 'NO-Hardhat', 'NO-Safety Vest',
-                   'helmet', 'vest', 'gloves', 'boots']
-    
-    try:
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
+    # Tot ce e deschis de aici încolo e eliberat (în ordine inversă) și când
+    # un pas de configurare ulterior eșuează
+    with contextlib.ExitStack() as resources:
+        # Starea de staționare supraviețuiește restartului procesului
+        resources.callback(zone_monitor.tracker.close)
+        resources.callback(zone_monitor.tracker.cleanup_old_entries)
+        if state_path:
+            store = SqliteTrackerStore(state_path)
+            zone_monitor.tracker.attach_store(store)
+            if tracker is not None:
+                store.attach_tracker(tracker)
+            log(f"💾 Stare tracker: {state_path} (intrările salvate sunt restaurate la primul frame)")
+        
+        # Tabel class id → rol, compilat o singură dată din model.names
+        class_roles = zone_monitor.compile_class_roles(model.names)
+        
+        # Inference doar în jurul zonelor
+        roi_detector = None
+        if roi_margin is not None:
+            roi_detector = RoiDetector(model, zone_monitor, margin=roi_margin, tile_size=roi_tile)
+            log(f"✂️  Inference doar pe ferestrele zonelor (margine {roi_margin}px"
+                f"{f', tile-uri {roi_tile}px' if roi_tile else ''})")
+        
+        # Frame-urile statice refolosesc detectările anterioare
+        motion_gate = None
+        if motion_threshold is not None:
+            motion_gate = MotionGate(zone_monitor, min_changed=motion_threshold, max_skip=max_skip)
+            log(f"🎞️  Poartă de mișcare: prag {motion_threshold:.2%} din zone, maxim {max_skip} frame-uri sărite")
+        
+        # Deschide sursa video
+        if source.isdigit():
+            source = int(source)
+        try:
+            frames_source = open_source(source, decode_backend, long_side=decode_size, hwaccel=hwaccel,
+                                        clock=clock, start_time=start_time)
+        except ValueError as e:
+            log(f"❌ {e}")
+            return
+        # Închide sursa curentă (înlocuită de SharedFrameSource cu `shared_decode`)
+        resources.callback(lambda: frames_source.close())
+        width, height = frames_source.width, frames_source.height
+        # Regulile folosesc timpul sursei, nu momentul procesării
+        zone_monitor.clock = frames_source.clock
+        if not frames_source.clock.live:
+            log(f"🕒 Timp din stream (PTS), primul frame la {frames_source.clock.start_time.isoformat(timespec='seconds')}")
+        if frames_source.scaled:
+            source_width, source_height = frames_source.source_size
+            log(f"📐 Decodare {decode_backend}: {source_width}x{source_height} → {width}x{height}")
+        
+        # Pregătește writer pentru output (dacă e cazul), cu encodarea pe un thread separat
+        writer = None
+        if output:
+            try:
+                writer = open_writer(output, frames_source.fps, (width, height), backend=encoder,
+                                     codec=codec, queue_size=writer_queue, drop_when_full=drop_oldest)
+            except ValueError as e:
+                log(f"❌ {e}")
+                return
+            resources.callback(close_writer, writer)
+            log(f"💾 Salvare output: {output} ({encoder})")
+        
+        # Violări ca JSON lines (stdout sau fișier)
+        events = None
+        if events_path == '-':
+            events = sys.stdout
+        elif events_path:
+            events = resources.enter_context(open(events_path, 'a', encoding='utf-8'))
+            log(f"📝 Violări JSON lines: {events_path}")
+        
+        # Event bus asyncio: violările pleacă în batch-uri spre sink-uri, fără să blocheze bucla
+        bus = None
+        if sinks:
+            bus = ViolationEventBus([make_sink(spec) for spec in sinks]).start()
+            resources.callback(close_bus, bus)
+            log(f"📨 Sink-uri violări: {', '.join(sinks)}")
+        
+        # Headless: overlay-urile se calculează doar pentru video-ul de output
+        draw = writer is not None or not headless
+        
+        log("\n▶️  Pornire inference...")
+        if headless:
+            log("  • mod headless (Ctrl+C = oprește)\n")
+        else:
+            log("  • 'q' = oprește")
+            log("  • 'z' = toggle afișare zone")
+            log("  • 's' = screenshot\n")
+        
+        show_zones = True
+        frame_count = 0
+        
+        # Ultimele detectări (după tracking), refolosite pe frame-urile statice
+        last_detections = None
+        infer_seconds = 0.0
+        
+        def infer(packets: List[FramePacket]) -> List[FramePacket]:
+            nonlocal last_detections, infer_seconds
             
-            frame_count += 1
-            current_time = datetime.now()
+            # Zonele sunt scalate la rezoluția frame-urilor înainte de poartă, ROI și reguli
+            zone_monitor.set_frame_size(packets[0].frame.shape[1], packets[0].frame.shape[0])
             
-            # Rulează YOLO
-            results = model(frame, conf=conf_threshold, verbose=False)[0]
+            # Poarta de mișcare decide, în ordine, ce frame-uri ajung la model
+            fresh = [True] * len(packets)
+            if motion_gate is not None:
+                fresh = [motion_gate.should_infer(packet.frame) for packet in packets]
             
-            # Separă detectările în persoane și PPE
-            person_detections = []
-            ppe_detections = []
+            # Un singur predict YOLO pentru tot batch-ul (per dimensiune de crop, cu ROI)
+            frames = [packet.frame for packet, run in zip(packets, fresh) if run]
+            detections = []
+            if frames:
+                start = time.perf_counter()
+                if roi_detector is not None:
+                    detections = roi_detector.detect(frames, conf_threshold, class_roles)
+                else:
+                    detections = detect_frames(model, frames, conf_threshold, class_roles)
+                infer_seconds += time.perf_counter() - start
+            detections = iter(detections)
             
-            for detection in results.boxes.data:
-                x1, y1, x2, y2, conf, cls = detection.cpu().numpy()
-                class_name = model.names[int(cls)]
-                
-                det = Detection(
-                    bbox=(int(x1), int(y1), int(x2), int(y2)),
-                    class_name=class_name,
-                    confidence=float(conf),
-                    track_id=None  # Poți adăuga tracking aici
+            # Verifică violări frame cu frame, cu timestamp-ul fiecărei capturi
+            for packet, run in zip(packets, fresh):
+                if run:
+                    frame_detections = next(detections)
+                    if tracker is not None:
+                        frame_detections = tracker.update(frame_detections)
+                    last_detections = frame_detections
+                frame_detections = last_detections
+                packet.detections = frame_detections
+                packet.violations = zone_monitor.check_violations(
+                    frame_detections,
+                    current_time=packet.timestamp
                 )
+            return packets
+        
+        def render(packets: List[FramePacket]) -> List[FramePacket]:
+            for packet in packets:
+                # In-place: fiecare pachet are propriul frame, nefolosit după render
+                packet.output = render_frame(zone_monitor, packet, class_roles, show_zones,
+                                             out=packet.frame)
                 
-                # Clasifică
-                if any(pc in class_name for pc in PERSON_CLASSES):
-                    person_detections.append(det)
-                elif any(pc in class_name for pc in PPE_CLASSES):
-                    ppe_detections.append(det)
-            
-            # Verifică violări
-            violations = zone_monitor.check_violations(
-                person_detections, 
-                ppe_detections,
-                current_time
-            )
-            
-            # Desenează pe frame
-            output_frame = frame.copy()
-            
-            # 1. Desenează zonele (dacă e activat)
-            if show_zones:
-                output_frame = zone_monitor.draw_zones(output_frame, alpha=0.2)
-            
-            # 2. Desenează detectările normale (fără violări)
-            for det in person_detections + ppe_detections:
-                x1, y1, x2, y2 = det.bbox
-                label = f"{det.class_name} {det.confidence:.2f}"
+                # Scrie frame-ul (copiat în coada writer-ului, encodat pe alt thread)
+                if writer:
+                    writer.write(packet.output)
+            return packets
+        
+        if shared_decode:
+            # Procesul de decodare deschide sursa din nou; aici doar dimensiunea frame-ului
+            scaled = frames_source.scaled
+            frames_source.close()
+            # Un batch incomplet ține sloturile ocupate: ring-ul trebuie să încapă mai mult de un batch
+            slots = max(ring_slots, 2 * batch_size)
+            frames_source = SharedFrameSource(source, width, height, slots=slots,
+                                              drop_when_full=drop_oldest, resize=scaled,
+                                              clock=zone_monitor.clock)
+            log(f"🔗 Decodare în proces separat, {slots} sloturi în memorie partajată")
+        source_packets = iter(frames_source)
+        
+        source_batches = iter_batches(source_packets, batch_size, max_latency)
+        staged = None
+        if pipeline:
+            # Cu memorie partajată, frame-urile se aruncă la decodare (un pachet aruncat
+            # din coadă și-ar pierde slotul)
+            staged = StagedPipeline(source_batches, queue_size=queue_size,
+                                    drop_oldest=drop_oldest and not shared_decode)
+            staged.add_stage('inference', infer)
+            if draw:
+                staged.add_stage('render', render)
+            batches = staged.run()
+        elif draw:
+            batches = (render(infer(batch)) for batch in source_batches)
+        else:
+            batches = (infer(batch) for batch in source_batches)
+        packets = (packet for batch in batches for packet in batch)
+        
+        try:
+            for packet in packets:
+                frame_count = packet.index
+                output_frame = packet.output
                 
-                # Verde pentru detectări normale
-                cv2.rectangle(output_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                cv2.putText(output_frame, label, (x1, y1 - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-            
-            # 3. Desenează violările (override peste detectările normale)
-            if violations:
-                output_frame = zone_monitor.draw_violations(output_frame, violations)
+                # Cu debouncing, în afară pleacă doar tranzițiile (start/ongoing/end)
+                emitted = packet.violations
+                if debouncer is not None:
+                    emitted = debouncer.update(packet.violations, packet.timestamp)
+                if events is not None and emitted:
+                    write_violations_jsonl(events, packet, emitted)
+                if bus is not None and emitted:
+                    bus.publish(emitted, frame=packet.index, camera_id=packet.camera_id)
                 
-                # Afișează lista cu violări
-                y_offset = 30
-                for i, violation in enumerate(violations[:5]):  # Max 5
-                    text = f"⚠ {violation.message}"
-                    cv2.putText(output_frame, text, (10, y_offset),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
-                    y_offset += 30
-            
-            # Info în colțul din dreapta
-            info_text = [
-                f"Frame: {frame_count}",
-                f"Persoane: {len(person_detections)}",
-                f"Violari: {len(violations)}",
-            ]
-            
-            y_pos = 30
-            for text in info_text:
-                (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
-                x_pos = output_frame.shape[1] - tw - 10
-                cv2.putText(output_frame, text, (x_pos, y_pos),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                y_pos += 30
+                if not headless:
+                    # Afișează
+                    cv2.imshow('YOLO + Zone Monitor', output_frame)
+                    
+                    # Handle keyboard
+                    key = cv2.waitKey(1) & 0xFF
+                    if key == ord('q'):
+                        break
+                    elif key == ord('z'):
+                        show_zones = not show_zones
+                        log(f"Zone afișare: {'ON' if show_zones else 'OFF'}")
+                    elif key == ord('s'):
+                        screenshot_path = f"screenshot_{frame_count}.jpg"
+                        cv2.imwrite(screenshot_path, output_frame)
+                        log(f"📸 Screenshot salvat: {screenshot_path}")
+                
+                # Output-ul e desenat în buffer-ul frame-ului: eliberat după afișare și scriere
+                frames_source.release(packet)
+        
+        except KeyboardInterrupt:
+            log("\n⏹️  Oprit (Ctrl+C)")
+        
+        finally:
+            # Oprește etapele înainte de a elibera sursa și writer-ul
+            packets.close()
+            batches.close()
+            if staged is not None:
+                staged.print_report(file=log_stream)
             
-            # Scrie frame-ul
-            if writer:
-                writer.write(output_frame)
+            # Închide violările încă active la sfârșitul stream-ului
+            if debouncer is not None:
+                closing = debouncer.flush()
+                if closing and events is not None:
+                    write_violations_jsonl(events, FramePacket(frame_count, None, None), closing)
+                if closing and bus is not None:
+                    bus.publish(closing, frame=frame_count)
+            if motion_gate is not None:
+                log(f"  • {motion_gate.report(infer_seconds)}")
+            if frames_source.dropped:
+                log(f"  • decodare: {frames_source.dropped} frame-uri sărite (sloturi ocupate)")
+            if not headless:
+                cv2.destroyAllWindows()
             
-            # Afișează
-            cv2.imshow('YOLO + Zone Monitor', output_frame)
+            # Sursa, writer-ul, fișierul de violări, event bus-ul și starea tracker-ului
+            resources.close()
             
-            # Handle keyboard
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
+            log(f"\n✓ Procesare completă. Total frame-uri: {frame_count}")
+
+
+def benchmark_batch_sizes(
+    model_path: str,
+    zones_config: str,
+    source: str,
+    batch_sizes: Sequence[int] = (1, 4, 8, 16),
+    max_frames: int = 240,
+    conf_threshold: float = 0.5
+):
+    """Măsoară frames/s și latența p50/p99 pentru mai multe dimensiuni de batch.
+    
+    Rulează decode + predict YOLO + `check_violations` (fără desenare) pe
+    primele `max_frames` frame-uri din sursă, pentru fiecare dimensiune de
+    batch. Latența unui frame e măsurată de la captură până la violările
+    calculate, deci include și așteptarea umplerii batch-ului.
+    
+    Args:
+        model_path (str): Calea către modelul YOLO (.pt).
+        zones_config (str): Calea către fișierul de configurație JSON cu zone.
+        source (str): Fișier video (sursă reluabilă).
+        batch_sizes (Sequence[int]): Dimensiunile de batch testate.
+        max_frames (int): Frame-uri procesate per dimensiune.
+        conf_threshold (float): Threshold pentru confidence score.
+    """
+    model = YOLO(model_path)
+    print(f"\n📊 Benchmark batch: {source} ({max_frames} frame-uri per rulare)")
+    print(f"  {'batch':>5}  {'frames/s':>9}  {'p50 ms':>8}  {'p99 ms':>8}")
+    
+    for batch_size in batch_sizes:
+        zone_monitor = ZoneMonitor(zones_config)
+        class_roles = zone_monitor.compile_class_roles(model.names)
+        cap = cv2.VideoCapture(source)
+        
+        # Warm-up: prima rulare include inițializarea modelului
+        ret, frame = cap.read()
+        if not ret:
+            print(f"❌ Nu pot citi sursa: {source}")
+            return
+        detect_frames(model, [frame] * batch_size, conf_threshold, class_roles)
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        
+        latencies = []
+        frames = 0
+        start = time.perf_counter()
+        
+        for batch in iter_batches(read_frames(cap), batch_size):
+            detections = detect_frames(model, [packet.frame for packet in batch],
+                                       conf_threshold, class_roles)
+            for packet, frame_detections in zip(batch, detections):
+                zone_monitor.check_violations(frame_detections, current_time=packet.timestamp)
+                latencies.append(time.perf_counter() - packet.captured_at)
+            frames += len(batch)
+            if frames >= max_frames:
                 break
-            elif key == ord('z'):
-                show_zones = not show_zones
-                print(f"Zone afișare: {'ON' if show_zones else 'OFF'}")
-            elif key == ord('s'):
-                screenshot_path = f"screenshot_{frame_count}.jpg"
-                cv2.imwrite(screenshot_path, output_frame)
-                print(f"📸 Screenshot salvat: {screenshot_path}")
-    
-    finally:
+        
+        elapsed = time.perf_counter() - start
         cap.release()
-        if writer:
-            writer.release()
-        cv2.destroyAllWindows()
         
-        # Cleanup
-        zone_monitor.tracker.cleanup_old_entries()
+        p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+        print(f"  {batch_size:>5}  {frames / elapsed:>9.1f}  {p50:>8.1f}  {p99:>8.1f}")
+
+
+def benchmark_roi(
+    model_path: str,
+    zones_config: str,
+    images_dir: str = 'validation_samples',
+    margin: int = 64,
+    tile_size: int = 0,
+    conf_threshold: float = 0.5,
+    repeats: int = 5
+):
+    """Compară inference-ul pe frame întreg cu inference-ul doar pe ferestrele zonelor.
+    
+    Imaginile nu au etichete: referința sunt detectările pe frame întreg al căror
+    centru e într-o zonă (singurele care contează pentru `check_violations`).
+    Recall = fracția acestora regăsite în modul ROI (aceeași clasă, IoU >= 0.5).
+    Se compară și numărul de violări.
+    
+    Args:
+        model_path (str): Calea către modelul YOLO (.pt).
+        zones_config (str): Config-ul de zone (coordonate în pixelii imaginilor).
+        images_dir (str): Directorul cu imagini (ex: `validation_samples`).
+        margin (int): Marginea ferestrelor, în pixeli.
+        tile_size (int): Latura tile-urilor (0 = fără tiling).
+        conf_threshold (float): Threshold pentru confidence score.
+        repeats (int): Rulări per imagine pentru timp.
+    """
+    model = YOLO(model_path)
+    zone_monitor = ZoneMonitor(zones_config)
+    class_roles = zone_monitor.compile_class_roles(model.names)
+    detector = RoiDetector(model, zone_monitor, margin=margin, tile_size=tile_size)
+    
+    paths = sorted(p for p in Path(images_dir).iterdir()
+                   if p.suffix.lower() in ('.jpg', '.jpeg', '.png', '.bmp'))
+    if not paths:
+        print(f"❌ Nicio imagine în {images_dir}")
+        return
+    
+    def timed(fn):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            result = fn()
+        return result, (time.perf_counter() - start) / repeats
+    
+    print(f"\n📊 ROI: {len(paths)} imagini din {images_dir} (margine {margin}px"
+          f"{f', tile-uri {tile_size}px' if tile_size else ''})")
+    print(f"  {'imagine':<24} {'acoperire':>9} {'full ms':>8} {'roi ms':>8} "
+          f"{'recall':>7} {'violări full/roi':>17}")
+    
+    t_full = t_roi = 0.0
+    relevant_total = found_total = 0
+    for path in paths:
+        image = cv2.imread(str(path))
+        zone_monitor.set_frame_size(image.shape[1], image.shape[0])
+        
+        # Warm-up per dimensiune (inițializare model, ferestre)
+        detect_frames(model, [image], conf_threshold, class_roles)
+        detector.detect([image], conf_threshold, class_roles)
         
-        print(f"\n✓ Procesare completă. Total frame-uri: {frame_count}")
+        (full,), elapsed_full = timed(lambda: detect_frames(model, [image], conf_threshold, class_roles))
+        (roi,), elapsed_roi = timed(lambda: detector.detect([image], conf_threshold, class_roles))
+        t_full += elapsed_full
+        t_roi += elapsed_roi
+        
+        in_zone = zone_monitor.zones_for_points(full.centers) >= 0
+        reference = full.select(in_zone)
+        found = 0
+        if len(reference) and len(roi):
+            iou = iou_matrix(reference.boxes, roi.boxes)
+            iou[reference.class_ids[:, None] != roi.class_ids[None, :]] = 0.0
+            found = int(np.count_nonzero(iou.max(axis=1) >= 0.5))
+        relevant_total += len(reference)
+        found_total += found
+        
+        n_full = len(zone_monitor.check_violations(full))
+        n_roi = len(zone_monitor.check_violations(roi))
+        recall = f"{found / len(reference):.0%}" if len(reference) else "-"
+        print(f"  {path.name[:24]:<24} {detector.coverage:>9.0%} {elapsed_full * 1000:>8.1f} "
+              f"{elapsed_roi * 1000:>8.1f} {recall:>7} {f'{n_full}/{n_roi}':>17}")
+    
+    recall_total = found_total / relevant_total if relevant_total else 1.0
+    print(f"\n  • speedup: {t_full / t_roi:.2f}x ({t_full / len(paths) * 1000:.1f} → "
+          f"{t_roi / len(paths) * 1000:.1f} ms/imagine)")
+    print(f"  • recall în zone: {recall_total:.1%} ({found_total}/{relevant_total} detectări)")
 
 
 def main():
@@ -222,6 +768,77 @@ def main():
                        help='Salvează video output (optional)')
     parser.add_argument('--conf', '-c', type=float, default=0.5,
                        help='Confidence threshold (default: 0.5)')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='Decode, inference și render pe thread-uri separate')
+    parser.add_argument('--queue-size', type=int, default=8,
+                       help='Capacitatea cozilor dintre etape (default: 8)')
+    parser.add_argument('--drop-oldest', action='store_true',
+                       help='Surse live: aruncă cel mai vechi frame dacă inference-ul rămâne în urmă')
+    parser.add_argument('--batch-size', '-b', type=int, default=1,
+                       help='Frame-uri per predict YOLO (default: 1)')
+    parser.add_argument('--max-latency', type=float, default=None,
+                       help='Așteptare maximă (ms) pentru umplerea unui batch')
+    parser.add_argument('--headless', action='store_true',
+                       help='Fără display: violări ca JSON lines, desenare doar cu --output')
+    parser.add_argument('--events', '-e', default=None,
+                       help="Fișier JSON lines pentru violări ('-' = stdout; implicit stdout cu --headless)")
+    parser.add_argument('--bench-batch', action='store_true',
+                       help='Benchmark frames/s și latență p50/p99 pentru batch 1, 4, 8, 16')
+    parser.add_argument('--bench-frames', type=int, default=240,
+                       help='Frame-uri per rulare de benchmark (default: 240)')
+    parser.add_argument('--shared-memory', action='store_true',
+                       help='Decodare în proces separat, frame-uri prin memorie partajată')
+    parser.add_argument('--ring-slots', type=int, default=8,
+                       help='Sloturi de frame în memoria partajată (default: 8)')
+    parser.add_argument('--track', action='store_true',
+                       help='Tracking IoU între frame-uri (track_id pentru regulile max_dwell_time)')
+    parser.add_argument('--state', default=None,
+                       help='Fișier SQLite pentru starea de staționare (restaurată după restart)')
+    parser.add_argument('--debounce', action='store_true',
+                       help='Evenimente start/ongoing/end în loc de violări repetate la fiecare frame')
+    parser.add_argument('--open-after', type=float, default=0.5,
+                       help='Secunde de prezență până la start, cu --debounce (default: 0.5)')
+    parser.add_argument('--close-after', type=float, default=2.0,
+                       help='Secunde de absență până la end, cu --debounce (default: 2)')
+    parser.add_argument('--cooldown', type=float, default=10.0,
+                       help='Secunde după end fără un nou start pentru aceeași violare (default: 10)')
+    parser.add_argument('--roi', action='store_true',
+                       help='Inference doar pe ferestrele din jurul zonelor')
+    parser.add_argument('--roi-margin', type=int, default=64,
+                       help='Marginea ferestrelor ROI, în pixeli (default: 64)')
+    parser.add_argument('--roi-tile', type=int, default=0,
+                       help='Tile-uri ROI de maxim N px la rezoluție nativă (default: 0 = fără)')
+    parser.add_argument('--bench-roi', nargs='?', const='validation_samples', default=None,
+                       metavar='DIR',
+                       help='Benchmark speedup și recall ROI pe imaginile din DIR (default: validation_samples)')
+    parser.add_argument('--motion', action='store_true',
+                       help='Sare inference-ul pe frame-urile fără mișcare în zone (refolosește detectările)')
+    parser.add_argument('--motion-threshold', type=float, default=0.002,
+                       help='Fracția de pixeli schimbați din zone care declanșează inference (default: 0.002)')
+    parser.add_argument('--max-skip', type=int, default=15,
+                       help='Frame-uri consecutive sărite cel mult, cu --motion (default: 15)')
+    parser.add_argument('--decode', choices=DECODE_BACKENDS, default='opencv',
+                       help='Backend de decodare (default: opencv)')
+    parser.add_argument('--decode-size', type=int, default=None,
+                       help='Decodează/micșorează direct la latura mare N px (ex: 640 = imgsz)')
+    parser.add_argument('--hwaccel', default=None,
+                       help="Decodare hardware cu --decode ffmpeg (ex: auto, cuda, vaapi)")
+    parser.add_argument('--encoder', choices=ENCODER_BACKENDS, default='opencv',
+                       help='Encoderul video-ului de output (default: opencv)')
+    parser.add_argument('--codec', default=None,
+                       help='FOURCC pentru opencv (default: mp4v) sau codec ffmpeg (default: libx264)')
+    parser.add_argument('--writer-queue', type=int, default=8,
+                       help='Frame-uri în așteptarea encodării (default: 8)')
+    parser.add_argument('--clock', choices=CLOCK_MODES, default='auto',
+                       help="Timpul regulilor: 'stream' = PTS-ul frame-ului, 'wall' = timp real monoton "
+                            "(default: 'auto' = stream pentru fișiere, wall pentru surse live)")
+    parser.add_argument('--start-time', type=datetime.fromisoformat, default=None,
+                       help='Momentul primului frame cu --clock stream, ISO 8601 (default: pornirea)')
+    parser.add_argument('--exit-timeout', type=float, default=None,
+                       help='Secunde fără observare după care un track a ieșit din zonă și timpul de '
+                            "staționare se resetează (default: 'exit_timeout' din config, altfel 30)")
+    parser.add_argument('--sink', action='append', default=[],
+                       help='Sink asincron pentru violări, repetabil: jsonl:<fișier>, sqlite:<fișier>, http://...')
     
     args = parser.parse_args()
     
@@ -236,12 +853,63 @@ def main():
         print(f"❌ Config zone nu există: {zones_path}")
         return
     
+    if args.bench_roi:
+        benchmark_roi(
+            model_path=str(model_path),
+            zones_config=str(zones_path),
+            images_dir=args.bench_roi,
+            margin=args.roi_margin,
+            tile_size=args.roi_tile,
+            conf_threshold=args.conf
+        )
+        return
+    
+    if args.bench_batch:
+        benchmark_batch_sizes(
+            model_path=str(model_path),
+            zones_config=str(zones_path),
+            source=args.source,
+            max_frames=args.bench_frames,
+            conf_threshold=args.conf
+        )
+        return
+    
     run_inference_with_zones(
         model_path=str(model_path),
         zones_config=str(zones_path),
         source=args.source,
         output=args.output,
-        conf_threshold=args.conf
+        conf_threshold=args.conf,
+        pipeline=args.pipeline,
+        queue_size=args.queue_size,
+        drop_oldest=args.drop_oldest,
+        batch_size=args.batch_size,
+        max_latency=args.max_latency / 1000 if args.max_latency else None,
+        headless=args.headless,
+        events_path=args.events,
+        shared_decode=args.shared_memory,
+        ring_slots=args.ring_slots,
+        sinks=args.sink,
+        debouncer=ViolationDebouncer(
+            open_after=args.open_after,
+            close_after=args.close_after,
+            cooldown=args.cooldown
+        ) if args.debounce else None,
+        tracker=IoUTracker() if args.track else None,
+        state_path=args.state,
+        roi_margin=args.roi_margin if args.roi else None,
+        roi_tile=args.roi_tile,
+        motion_threshold=args.motion_threshold if args.motion else None,
+        max_skip=args.max_skip,
+        decode_backend=args.decode,
+        decode_size=args.decode_size,
+        hwaccel=args.hwaccel,
+        encoder=args.encoder,
+        codec=args.codec,
+        writer_queue=args.writer_queue,
+        clock=args.clock,
+        start_time=args.start_time,
+        exit_timeout=args.exit_timeout
     )
 
 
@@ -0,0 +1,167 @@
+"""
+Poartă de mișcare în fața modelului: frame-urile statice refolosesc ultimele detectări.
+
+Pe o cameră fixă scena nu se schimbă minute întregi, dar fiecare frame trece
+prin YOLO. `MotionGate` compară o versiune micșorată, grayscale și netezită a
+frame-ului cu cea a ultimului frame trimis la inference, doar în interiorul
+zonelor (lărgite cu o margine, ca obiectele care intră să fie prinse din timp).
+Dacă fracția de pixeli schimbați e sub prag, frame-ul e static și detectările
+anterioare sunt refolosite. Cel mult `max_skip` frame-uri consecutive sunt
+sărite, apoi inference-ul rulează oricum (schimbări lente, obiecte oprite).
+
+Referința e frame-ul ultimului inference, nu frame-ul anterior: o deplasare
+lentă se acumulează până depășește pragul în loc să rămână sub el la fiecare pas.
+"""
+
+import time
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from zone_monitor import ZoneMonitor
+
+
+class MotionGate:
+    """Decide, frame cu frame, dacă modelul trebuie rulat.
+
+    Attributes:
+        frames (int): Frame-uri verificate.
+        inferred (int): Frame-uri pentru care s-a cerut inference.
+        gate_seconds (float): Timpul total petrecut în poartă.
+
+    Example:
+        >>> gate = MotionGate(zone_monitor, max_skip=15)
+        >>> if gate.should_infer(frame):
+        ...     detections = detect_frame(model, frame, 0.5, class_roles)
+        >>> violations = zone_monitor.check_violations(detections)
+    """
+
+    def __init__(self, zone_monitor: Optional[ZoneMonitor] = None, width: int = 160,
+                 pixel_threshold: int = 12, min_changed: float = 0.002,
+                 max_skip: int = 15, margin: int = 32):
+        """
+        Args:
+            zone_monitor: Monitorul cu zonele; None = tot frame-ul
+            width: Lățimea frame-ului micșorat pe care se face diferența
+            pixel_threshold: Diferența de intensitate (0-255) de la care un pixel e schimbat
+            min_changed: Fracția minimă de pixeli schimbați din zone pentru inference
+            max_skip: Frame-uri consecutive sărite cel mult (0 = niciunul)
+            margin: Pixeli (la rezoluția frame-ului) adăugați în jurul zonelor
+        """
+        self.zone_monitor = zone_monitor
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.min_changed = min_changed
+        self.max_skip = max_skip
+        self.margin = margin
+
+        self.frames = 0
+        self.inferred = 0
+        self.gate_seconds = 0.0
+
+        self._key = None  # (width, height, geometry_version)
+        self._mask = None
+        self._mask_pixels = 0
+        self._reference = None
+        self._skipped = 0
+
+    @property
+    def skipped(self) -> int:
+        """Frame-uri care au refolosit detectările anterioare."""
+        return self.frames - self.inferred
+
+    def reset(self):
+        """Următorul frame trece sigur prin model (masca zonelor e reconstruită)."""
+        self._key = None
+        self._reference = None
+
+    def _prepare(self, width: int, height: int):
+        """Construiește masca zonelor la rezoluția micșorată.
+
+        Cheia include `geometry_version`, deci masca urmează zonele după
+        `reload_config` sau `set_frame_size`, fără un `reset` explicit.
+        """
+        version = self.zone_monitor.geometry_version if self.zone_monitor is not None else 0
+        key = (width, height, version)
+        if self._key == key:
+            return
+        self._key = key
+        self._reference = None
+
+        small_w = min(self.width, width)
+        small_h = max(1, int(round(height * small_w / width)))
+        scale = small_w / width
+        mask = np.zeros((small_h, small_w), np.uint8)
+        zones = self.zone_monitor.zones if self.zone_monitor is not None else []
+        for zone in zones:
+            polygon = np.round(zone['polygon_np'].reshape(-1, 2) * scale).astype(np.int32)
+            cv2.fillPoly(mask, [polygon], 255)
+        if not mask.any():
+            mask[:] = 255
+        elif self.margin:
+            radius = max(1, int(round(self.margin * scale)))
+            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * radius + 1, 2 * radius + 1))
+            mask = cv2.dilate(mask, kernel)
+        self._mask = mask
+        self._mask_pixels = cv2.countNonZero(mask)
+
+    def _small(self, frame: np.ndarray) -> np.ndarray:
+        # INTER_LINEAR citește doar câțiva pixeli per celulă (INTER_AREA, ~20x mai lent,
+        # citește tot frame-ul); netezirea de după elimină zgomotul senzorului și
+        # artefactele de compresie
+        small = cv2.resize(frame, self._mask.shape[::-1], interpolation=cv2.INTER_LINEAR)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def changed_fraction(self, frame: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Fracția de pixeli din zone schimbați față de referință, plus frame-ul micșorat."""
+        height, width = frame.shape[:2]
+        self._prepare(width, height)
+        small = self._small(frame)
+        if self._reference is None:
+            return 1.0, small
+        diff = cv2.absdiff(small, self._reference)
+        _, changed = cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)
+        changed = cv2.bitwise_and(changed, self._mask)
+        return cv2.countNonZero(changed) / self._mask_pixels, small
+
+    def should_infer(self, frame: np.ndarray) -> bool:
+        """True dacă frame-ul trebuie trimis modelului.
+
+        Primul frame, orice frame cu mișcare în zone și frame-ul de după
+        `max_skip` frame-uri sărite consecutiv trec prin model; la acestea
+        referința devine frame-ul curent.
+        """
+        start = time.perf_counter()
+        fraction, small = self.changed_fraction(frame)
+        infer = fraction >= self.min_changed or self._skipped >= self.max_skip
+        if infer:
+            self._reference = small
+            self._skipped = 0
+            self.inferred += 1
+        else:
+            self._skipped += 1
+        self.frames += 1
+        self.gate_seconds += time.perf_counter() - start
+        return infer
+
+    def report(self, infer_seconds: Optional[float] = None) -> str:
+        """Rezumat: frame-uri sărite, costul porții și (opțional) timpul de inference economisit.
+
+        Args:
+            infer_seconds (Optional[float]): Timpul total al inference-ului pe frame-urile
+                trimise modelului; din el se estimează timpul economisit.
+        """
+        if not self.frames:
+            return "poarta de mișcare: niciun frame"
+        lines = [f"poarta de mișcare: {self.inferred}/{self.frames} frame-uri la model, "
+                 f"{self.skipped} sărite ({100.0 * self.skipped / self.frames:.1f}%), "
+                 f"cost {1000.0 * self.gate_seconds / self.frames:.2f} ms/frame"]
+        if infer_seconds is not None and self.inferred:
+            per_frame = infer_seconds / self.inferred
+            saved = per_frame * self.skipped - self.gate_seconds
+            lines.append(f"inference {1000.0 * per_frame:.1f} ms/frame → ~{saved:.2f} s economisite "
+                         f"({100.0 * saved / (per_frame * self.frames):.1f}% din calcul)")
+        return "\n  • ".join(lines)
@@ -0,0 +1,680 @@
+"""
+Rulare multi-cameră cu un singur model YOLO partajat.
+
+Citește un manifest cu perechi (sursă, config zone), decodează fiecare
+cameră pe thread-ul ei, intercalează frame-urile tuturor camerelor în
+batch-uri comune de inference și trimite rezultatele la `ZoneMonitor`-ul
+fiecărei camere. Violările sunt emise ca JSON lines. Cu `--workers`,
+camerele sunt împărțite pe mai multe procese (câte un model per proces).
+
+Usage:
+    python multi_camera.py --model best.pt --manifest cameras.json
+
+Example:
+    python multi_camera.py --model best.pt --manifest cameras_manifest_example.json --batch-size 8 --events violations.jsonl
+    python multi_camera.py --model best.pt --manifest cameras.json --workers 4
+    python multi_camera.py --model best.pt --bench-workers
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import tempfile
+import argparse
+import functools
+import threading
+import multiprocessing as mp
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import cv2
+
+from zone_monitor import ZoneMonitor
+from video_pipeline import FramePacket, FrameQueue, SourceStage, END_OF_STREAM
+from inference_with_zones import detect_frames, violation_records, write_violations_jsonl
+from video_sources import DECODE_BACKENDS, open_source
+from frame_clock import is_live_source
+
+
+def load_manifest(manifest_path: str) -> List[Dict]:
+    """Încarcă manifestul cu camere.
+
+    Formatul: `{"cameras": [{"id": "cam_1", "source": "rtsp://...", "zones": "zones.json"}]}`.
+    Opțional per cameră: `"drop_oldest"` (implicit true pentru surse live), `"decode"`,
+    `"decode_size"` și `"hwaccel"` (implicit opțiunile de decodare ale runner-ului).
+
+    Args:
+        manifest_path (str): Calea către manifestul JSON.
+
+    Returns:
+        List[Dict]: Lista camerelor.
+    """
+    path = Path(manifest_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Manifest nu există: {path}")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        cameras = json.load(f).get('cameras', [])
+
+    # Căile relative din manifest sunt relative la manifest
+    for camera in cameras:
+        zones = Path(camera['zones'])
+        if not zones.is_absolute() and not zones.exists():
+            camera['zones'] = str(path.parent / zones)
+    return cameras
+
+
+class CameraStream:
+    """O cameră: sursa video, thread-ul de decodare și monitorul ei de zone.
+
+    Attributes:
+        camera_id (str): ID-ul camerei.
+        source (str): Sursa video.
+        frames_source (FrameSource): Sursa deschisă cu backend-ul de decodare (`video_sources`).
+        zone_monitor (ZoneMonitor): Monitorul de zone al camerei.
+        class_roles (Optional[ClassRoles]): Tabelul class id → rol al camerei (din zonele ei).
+        queue (FrameQueue): Frame-urile decodate care așteaptă inference.
+        frames (int): Frame-uri procesate (inference + reguli).
+        violations (int): Violări emise.
+        finished (bool): Sursa s-a terminat și coada a fost golită.
+    """
+
+    def __init__(self, camera: Dict, queue_size: int, stop_event: threading.Event,
+                 decode_backend: str = 'opencv', decode_size: Optional[int] = None,
+                 hwaccel: Optional[str] = None):
+        """
+        Args:
+            camera: Intrarea din manifest (id, source, zones, opțional drop_oldest,
+                decode, decode_size, hwaccel)
+            queue_size: Capacitatea cozii de frame-uri decodate
+            stop_event: Eveniment comun de oprire
+            decode_backend: Backend-ul de decodare implicit, 'opencv' sau 'ffmpeg'
+            decode_size: Latura mare implicită a frame-urilor decodate (None = rezoluția sursei)
+            hwaccel: Decodarea hardware implicită pentru ffmpeg
+
+        Raises:
+            ValueError: Dacă sursa nu poate fi deschisă.
+        """
+        self.camera_id = str(camera['id'])
+        self.source = str(camera['source'])
+        self.zone_monitor = ZoneMonitor(camera['zones'])
+        self.class_roles = None
+        drop_oldest = camera.get('drop_oldest', is_live_source(self.source))
+
+        try:
+            self.frames_source = open_source(int(self.source) if self.source.isdigit() else self.source,
+                                             camera.get('decode', decode_backend),
+                                             long_side=camera.get('decode_size', decode_size),
+                                             hwaccel=camera.get('hwaccel', hwaccel),
+                                             camera_id=self.camera_id)
+        except ValueError as e:
+            raise ValueError(f"Camera {self.camera_id}: {e}") from e
+
+        # Fișierele: timpul din PTS; camerele live: timp monoton
+        self.zone_monitor.clock = self.frames_source.clock
+        self.queue = FrameQueue(queue_size, drop_oldest=drop_oldest)
+        self.reader = SourceStage(f"decode-{self.camera_id}", iter(self.frames_source),
+                                  self.queue, stop_event)
+        self.queue.stats = self.reader.stats
+        self.frames = 0
+        self.violations = 0
+        self.finished = False
+
+    def next_packet(self) -> Optional[FramePacket]:
+        """Returnează următorul frame decodat, fără blocare (None dacă nu e niciunul)."""
+        if self.finished:
+            return None
+        try:
+            item = self.queue.get(timeout=0)
+        except queue.Empty:
+            return None
+        if item is END_OF_STREAM:
+            self.finished = True
+            return None
+        return item
+
+    def report(self, elapsed: float) -> str:
+        """Linie de raport: FPS procesat, adâncimea cozii, frame-uri aruncate."""
+        fps = self.frames / elapsed if elapsed > 0 else 0.0
+        return (f"{self.camera_id:<12} {self.frames:7d} frame-uri  {fps:6.1f} fps  "
+                f"coadă {self.queue.qsize():3d}  aruncate {self.queue.stats.dropped:5d}  "
+                f"violări {self.violations}")
+
+
+class MultiCameraRunner:
+    """Orchestrator: un model YOLO, batch-uri intercalate din toate camerele.
+
+    Frame-urile sunt colectate round-robin (câte unul per cameră la fiecare
+    trecere) până la `batch_size`, deci nicio cameră nu monopolizează
+    modelul. Rezultatele sunt verificate cu `ZoneMonitor`-ul camerei de
+    origine, cu timestamp-ul capturii.
+
+    Example:
+        >>> runner = MultiCameraRunner('best.pt', 'cameras.json', batch_size=8)
+        >>> runner.run()
+    """
+
+    def __init__(self,
+                 model_path: str,
+                 manifest_path: Union[str, List[Dict]],
+                 batch_size: Optional[int] = None,
+                 conf_threshold: float = 0.5,
+                 queue_size: int = 4,
+                 events_path: Optional[str] = '-',
+                 report_interval: float = 10.0,
+                 sink: Optional[Callable[[FramePacket], None]] = None,
+                 verbose: bool = True,
+                 decode_backend: str = 'opencv',
+                 decode_size: Optional[int] = None,
+                 hwaccel: Optional[str] = None):
+        """
+        Args:
+            model_path: Calea către modelul YOLO (.pt)
+            manifest_path: Calea către manifestul cu camere (sau lista camerelor deja încărcată)
+            batch_size: Frame-uri per predict (default: numărul de camere)
+            conf_threshold: Threshold pentru confidence score
+            queue_size: Capacitatea cozii per cameră
+            events_path: Fișier JSON lines pentru violări ('-' = stdout, None = dezactivat)
+            report_interval: Secunde între rapoartele periodice (0 = doar la final)
+            sink: Primește fiecare frame cu violări (în locul fișierului JSON lines); buffer-ul
+                `packet.frame` e refolosit după ce sink-ul returnează
+            verbose: Afișează mesajele de status și rapoartele
+            decode_backend: Backend-ul de decodare, 'opencv' sau 'ffmpeg' (vezi `video_sources`)
+            decode_size: Decodează/micșorează direct la latura mare N px (None = rezoluția sursei)
+            hwaccel: Decodare hardware cu backend-ul ffmpeg (ex: 'auto')
+        """
+        from ultralytics import YOLO
+
+        if verbose:
+            self.log = functools.partial(print, file=sys.stderr if events_path == '-' else sys.stdout)
+        else:
+            self.log = lambda *args, **kwargs: None
+        self.conf_threshold = conf_threshold
+        self.report_interval = report_interval
+        self.events_path = None if sink is not None else events_path
+        self.sink = sink
+        self.stop_event = threading.Event()
+
+        self.log(f"📦 Încărcare model (o singură instanță): {model_path}")
+        self.model = YOLO(model_path)
+
+        cameras = load_manifest(manifest_path) if isinstance(manifest_path, (str, Path)) else manifest_path
+        self.cameras = []
+        try:
+            for camera in cameras:
+                self.cameras.append(CameraStream(camera, queue_size, self.stop_event,
+                                                 decode_backend, decode_size, hwaccel))
+        except Exception:
+            for camera in self.cameras:
+                camera.frames_source.close()
+            raise
+        self.batch_size = batch_size or max(1, len(self.cameras))
+
+        # Fiecare cameră cu tabelul class id → rol al monitorului ei (folosit și de reguli)
+        for camera in self.cameras:
+            camera.class_roles = camera.zone_monitor.compile_class_roles(self.model.names)
+        self.log(f"🎥 {len(self.cameras)} camere, batch {self.batch_size}")
+
+        self._next_camera = 0
+        self._started = None
+
+    def _collect_batch(self) -> List[FramePacket]:
+        """Colectează până la `batch_size` frame-uri, round-robin între camere."""
+        batch = []
+        n_cameras = len(self.cameras)
+
+        while len(batch) < self.batch_size:
+            got_any = False
+            for offset in range(n_cameras):
+                camera = self.cameras[(self._next_camera + offset) % n_cameras]
+                packet = camera.next_packet()
+                if packet is None:
+                    continue
+                batch.append(packet)
+                got_any = True
+                if len(batch) >= self.batch_size:
+                    self._next_camera = (self._next_camera + offset + 1) % n_cameras
+                    break
+            if not got_any:
+                break
+
+        return batch
+
+    def run(self):
+        """Rulează până se termină toate sursele (sau Ctrl+C)."""
+        events = None
+        if self.events_path == '-':
+            events = sys.stdout
+        elif self.events_path:
+            events = open(self.events_path, 'a', encoding='utf-8')
+
+        cameras_by_id = {camera.camera_id: camera for camera in self.cameras}
+        for camera in self.cameras:
+            camera.reader.start()
+
+        self._started = time.perf_counter()
+        last_report = self._started
+
+        try:
+            while not all(camera.finished for camera in self.cameras):
+                batch = self._collect_batch()
+                if not batch:
+                    time.sleep(0.001)  # Nicio cameră nu are frame-uri gata
+                    continue
+
+                # Un singur predict pentru frame-uri din mai multe camere, fiecare
+                # frame filtrat cu rolurile claselor camerei lui
+                cameras = [cameras_by_id[packet.camera_id] for packet in batch]
+                detections = detect_frames(self.model, [packet.frame for packet in batch],
+                                           self.conf_threshold,
+                                           [camera.class_roles for camera in cameras])
+
+                for packet, camera, frame_detections in zip(batch, cameras, detections):
+                    monitor = camera.zone_monitor
+                    monitor.set_frame_size(packet.frame.shape[1], packet.frame.shape[0])
+                    packet.detections = frame_detections
+                    packet.violations = monitor.check_violations(
+                        frame_detections, current_time=packet.timestamp
+                    )
+                    camera.frames += 1
+                    camera.violations += len(packet.violations)
+
+                    if packet.violations:
+                        if self.sink is not None:
+                            self.sink(packet)
+                        elif events is not None:
+                            write_violations_jsonl(events, packet)
+                    camera.frames_source.release(packet)
+
+                now = time.perf_counter()
+                if self.report_interval and now - last_report >= self.report_interval:
+                    self.print_report()
+                    last_report = now
+
+        except KeyboardInterrupt:
+            self.log("\n⏹️  Oprit (Ctrl+C)")
+
+        finally:
+            self.stop_event.set()
+            for camera in self.cameras:
+                camera.reader.join(timeout=2.0)
+                camera.frames_source.close()
+                camera.zone_monitor.tracker.cleanup_old_entries()
+            if events is not None and events is not sys.stdout:
+                events.close()
+            self.print_report()
+
+        for camera in self.cameras:
+            if camera.reader.error is not None:
+                raise camera.reader.error
+
+    def camera_stats(self) -> List[Dict]:
+        """Statisticile per cameră (frame-uri, aruncate, violări, durată)."""
+        elapsed = time.perf_counter() - self._started
+        return [{'camera_id': camera.camera_id,
+                 'frames': camera.frames,
+                 'dropped': camera.queue.stats.dropped,
+                 'violations': camera.violations,
+                 'seconds': elapsed} for camera in self.cameras]
+
+    def print_report(self):
+        """Afișează FPS-ul și adâncimea cozii pentru fiecare cameră."""
+        elapsed = time.perf_counter() - self._started
+        total = sum(camera.frames for camera in self.cameras)
+        self.log(f"\n📊 {elapsed:.1f}s, {total} frame-uri, {total / elapsed:.1f} fps total:")
+        for camera in self.cameras:
+            self.log(f"  • {camera.report(elapsed)}")
+
+
+def _limit_torch_threads(threads: int):
+    """Limitează thread-urile torch dintr-un worker (altfel fiecare proces ia toate core-urile)."""
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(max(1, threads))
+
+
+def camera_worker(worker_id: int,
+                  model_path: str,
+                  cameras: List[Dict],
+                  results,
+                  batch_size: Optional[int] = None,
+                  conf_threshold: float = 0.5,
+                  queue_size: int = 4,
+                  torch_threads: int = 1,
+                  decode: Optional[Dict] = None):
+    """Proces worker: rulează un `MultiCameraRunner` pe shard-ul lui de camere.
+
+    Worker-ul are propriul model, propriile `ZoneMonitor`/`ZoneTracker` și
+    trimite în `results` mesaje `('violations', records)`, apoi la final
+    `('done', worker_id, stats)` sau `('error', worker_id, mesaj)`.
+
+    Args:
+        worker_id (int): Indexul worker-ului.
+        model_path (str): Calea către modelul YOLO.
+        cameras (List[Dict]): Camerele din manifest alocate acestui worker.
+        results (multiprocessing.Queue): Coada comună către procesul părinte.
+        batch_size (Optional[int]): Frame-uri per predict (default: camerele din shard).
+        conf_threshold (float): Threshold pentru confidence score.
+        queue_size (int): Capacitatea cozii per cameră.
+        torch_threads (int): Thread-uri torch pentru acest proces.
+        decode (Optional[Dict]): Opțiunile de decodare ale `MultiCameraRunner`
+            (`decode_backend`, `decode_size`, `hwaccel`).
+    """
+    _limit_torch_threads(torch_threads)
+    try:
+        runner = MultiCameraRunner(
+            model_path, cameras,
+            batch_size=batch_size,
+            conf_threshold=conf_threshold,
+            queue_size=queue_size,
+            report_interval=0,
+            sink=lambda packet: results.put(('violations', violation_records(packet))),
+            verbose=False,
+            **(decode or {})
+        )
+        runner.run()
+        results.put(('done', worker_id, runner.camera_stats()))
+    except Exception as e:
+        results.put(('error', worker_id, f"{type(e).__name__}: {e}"))
+
+
+class ShardedCameraRunner:
+    """Camerele împărțite pe procese worker, cu un singur sink de violări.
+
+    `check_violations` și decodarea rulează în Python, deci într-un singur
+    proces sunt limitate de GIL la un core. Aici fiecare worker primește un
+    shard de camere (round-robin), are propriul model și propriul
+    `ZoneMonitor`, iar violările se întorc printr-o `multiprocessing.Queue`
+    în procesul părinte, care le scrie ca JSON lines.
+
+    Example:
+        >>> runner = ShardedCameraRunner('best.pt', 'cameras.json', workers=4)
+        >>> runner.run()
+    """
+
+    def __init__(self,
+                 model_path: str,
+                 manifest_path: Union[str, List[Dict]],
+                 workers: Optional[int] = None,
+                 batch_size: Optional[int] = None,
+                 conf_threshold: float = 0.5,
+                 queue_size: int = 4,
+                 events_path: Optional[str] = '-',
+                 verbose: bool = True,
+                 decode_backend: str = 'opencv',
+                 decode_size: Optional[int] = None,
+                 hwaccel: Optional[str] = None):
+        """
+        Args:
+            model_path: Calea către modelul YOLO (.pt)
+            manifest_path: Calea către manifestul cu camere (sau lista camerelor)
+            workers: Numărul de procese (default: min(camere, core-uri))
+            batch_size: Frame-uri per predict în fiecare worker
+            conf_threshold: Threshold pentru confidence score
+            queue_size: Capacitatea cozii per cameră
+            events_path: Fișier JSON lines pentru violări ('-' = stdout, None = dezactivat)
+            verbose: Afișează mesajele de status și raportul
+            decode_backend: Backend-ul de decodare în worker-i, 'opencv' sau 'ffmpeg'
+            decode_size: Decodează/micșorează direct la latura mare N px
+            hwaccel: Decodare hardware cu backend-ul ffmpeg
+        """
+        cameras = load_manifest(manifest_path) if isinstance(manifest_path, (str, Path)) else manifest_path
+        cpus = os.cpu_count() or 1
+        workers = workers or min(len(cameras), cpus)
+        self.shards = [shard for shard in (cameras[i::workers] for i in range(workers)) if shard]
+
+        self.model_path = model_path
+        self.batch_size = batch_size
+        self.conf_threshold = conf_threshold
+        self.queue_size = queue_size
+        self.events_path = events_path
+        self.decode = {'decode_backend': decode_backend, 'decode_size': decode_size, 'hwaccel': hwaccel}
+        self.torch_threads = max(1, cpus // len(self.shards)) if self.shards else 1
+        self.stats: List[Dict] = []
+        self.elapsed = 0.0
+        if verbose:
+            self.log = functools.partial(print, file=sys.stderr if events_path == '-' else sys.stdout)
+        else:
+            self.log = lambda *args, **kwargs: None
+
+    def run(self):
+        """Pornește worker-ii și agregă violările până se termină toți."""
+        # spawn: fără fork peste thread-uri/stare torch din procesul părinte
+        ctx = mp.get_context('spawn')
+        results = ctx.Queue(maxsize=1024)
+        processes = [
+            ctx.Process(target=camera_worker, name=f"cameras-{i}", daemon=True,
+                        args=(i, self.model_path, shard, results, self.batch_size,
+                              self.conf_threshold, self.queue_size, self.torch_threads, self.decode))
+            for i, shard in enumerate(self.shards)
+        ]
+
+        events = None
+        if self.events_path == '-':
+            events = sys.stdout
+        elif self.events_path:
+            events = open(self.events_path, 'a', encoding='utf-8')
+
+        self.log(f"🧩 {sum(len(s) for s in self.shards)} camere pe {len(processes)} procese "
+                 f"({self.torch_threads} thread-uri torch/proces)")
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+
+        self.stats = []
+        errors = []
+        pending = len(processes)
+        try:
+            while pending:
+                try:
+                    message = results.get(timeout=0.5)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        errors.append("worker oprit fără rezultat")
+                        break
+                    continue
+
+                kind = message[0]
+                if kind == 'violations':
+                    if events is not None:
+                        for record in message[1]:
+                            events.write(json.dumps(record, ensure_ascii=False) + '\n')
+                        events.flush()
+                elif kind == 'done':
+                    self.stats.extend(message[2])
+                    pending -= 1
+                elif kind == 'error':
+                    errors.append(f"worker {message[1]}: {message[2]}")
+                    pending -= 1
+
+        except KeyboardInterrupt:
+            self.log("\n⏹️  Oprit (Ctrl+C)")
+
+        finally:
+            self.elapsed = time.perf_counter() - started
+            for process in processes:
+                process.join(timeout=5.0)
+                if process.is_alive():
+                    process.terminate()
+            if events is not None and events is not sys.stdout:
+                events.close()
+            self.print_report()
+
+        if errors:
+            raise RuntimeError("; ".join(errors))
+
+    def total_frames(self) -> int:
+        return sum(stats['frames'] for stats in self.stats)
+
+    def print_report(self):
+        """Afișează FPS-ul agregat și per cameră."""
+        total = self.total_frames()
+        fps = total / self.elapsed if self.elapsed > 0 else 0.0
+        self.log(f"\n📊 {self.elapsed:.1f}s, {total} frame-uri, {fps:.1f} fps total:")
+        for stats in self.stats:
+            camera_fps = stats['frames'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+            self.log(f"  • {stats['camera_id']:<12} {stats['frames']:7d} frame-uri  "
+                     f"{camera_fps:6.1f} fps  aruncate {stats['dropped']:5d}  "
+                     f"violări {stats['violations']}")
+
+
+def make_synthetic_video(path: str, frames: int = 150, width: int = 640,
+                         height: int = 360, fps: int = 25, seed: int = 0):
+    """Generează un video sintetic cu dreptunghiuri în mișcare (pentru benchmark).
+
+    Args:
+        path (str): Fișierul video de output (.mp4).
+        frames (int): Numărul de frame-uri.
+        width (int): Lățimea frame-ului.
+        height (int): Înălțimea frame-ului.
+        fps (int): FPS-ul video-ului.
+        seed (int): Seed pentru pozițiile și vitezele obiectelor.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    n_objects = 6
+    position = rng.uniform([0, 0], [width - 60, height - 120], (n_objects, 2))
+    velocity = rng.uniform(-6, 6, (n_objects, 2))
+    colors = rng.integers(0, 255, (n_objects, 3)).tolist()
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    for _ in range(frames):
+        frame = np.full((height, width, 3), 90, np.uint8)
+        position += velocity
+        bounce = (position < 0) | (position > [width - 60, height - 120])
+        velocity[bounce] *= -1
+        position = np.clip(position, 0, [width - 60, height - 120])
+        for (x, y), color in zip(position.astype(int), colors):
+            cv2.rectangle(frame, (x, y), (x + 60, y + 120), color, -1)
+        writer.write(frame)
+    writer.release()
+
+
+def benchmark_workers(model_path: str,
+                      worker_counts: Sequence[int] = (1, 2, 4, 8),
+                      n_cameras: int = 8,
+                      frames: int = 150,
+                      width: int = 640,
+                      height: int = 360):
+    """Măsoară scalarea `ShardedCameraRunner` cu numărul de procese.
+
+    Generează `n_cameras` video-uri sintetice (fiecare cu zonele lui) și
+    rulează toate camerele pentru fiecare număr de worker-i din `worker_counts`.
+
+    Args:
+        model_path (str): Calea către modelul YOLO.
+        worker_counts (Sequence[int]): Numerele de procese testate.
+        n_cameras (int): Numărul de camere sintetice.
+        frames (int): Frame-uri per cameră.
+        width (int): Lățimea video-urilor.
+        height (int): Înălțimea video-urilor.
+    """
+    from benchmark_zones import make_zones_config
+
+    print(f"\n⏱️  Benchmark procese: {n_cameras} camere × {frames} frame-uri "
+          f"({width}x{height}), {os.cpu_count()} core-uri")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cameras = []
+        for i in range(n_cameras):
+            video = str(Path(tmp) / f"cam_{i}.mp4")
+            zones = Path(tmp) / f"zones_{i}.json"
+            make_synthetic_video(video, frames, width, height, seed=i)
+            zones.write_text(json.dumps(make_zones_config(8, width, height, seed=i)), encoding='utf-8')
+            cameras.append({'id': f"cam_{i}", 'source': video, 'zones': str(zones),
+                            'drop_oldest': False})
+
+        baseline = None
+        print(f"  {'procese':>8} {'fps':>8} {'speedup':>8}")
+        for workers in [w for w in worker_counts if w <= n_cameras]:
+            runner = ShardedCameraRunner(model_path, cameras, workers=workers,
+                                         events_path=None, verbose=False)
+            runner.run()
+            fps = runner.total_frames() / runner.elapsed if runner.elapsed > 0 else 0.0
+            baseline = baseline or fps
+            print(f"  {len(runner.shards):>8d} {fps:>8.1f} {fps / baseline:>7.2f}x")
+
+
+def main():
+    """Entry point pentru rularea multi-cameră."""
+    parser = argparse.ArgumentParser(description='Inference YOLO multi-cameră cu un model partajat')
+    parser.add_argument('--model', '-m', required=True,
+                       help='Calea către modelul YOLO (.pt)')
+    parser.add_argument('--manifest',
+                       help='Manifest JSON cu camerele (id, source, zones)')
+    parser.add_argument('--batch-size', '-b', type=int, default=None,
+                       help='Frame-uri per predict (default: numărul de camere)')
+    parser.add_argument('--conf', '-c', type=float, default=0.5,
+                       help='Confidence threshold (default: 0.5)')
+    parser.add_argument('--queue-size', type=int, default=4,
+                       help='Frame-uri decodate în așteptare per cameră (default: 4)')
+    parser.add_argument('--events', '-e', default='-',
+                       help="Fișier JSON lines pentru violări (default: '-' = stdout)")
+    parser.add_argument('--report-interval', type=float, default=10.0,
+                       help='Secunde între rapoarte per cameră (default: 10)')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                       help='Împarte camerele pe N procese (0 = câte core-uri sunt; implicit un singur proces)')
+    parser.add_argument('--decode', choices=DECODE_BACKENDS, default='opencv',
+                       help='Backend de decodare (default: opencv; per cameră: "decode" în manifest)')
+    parser.add_argument('--decode-size', type=int, default=None,
+                       help='Decodează/micșorează direct la latura mare N px (ex: 640 = imgsz)')
+    parser.add_argument('--hwaccel', default=None,
+                       help="Decodare hardware cu --decode ffmpeg (ex: auto, cuda, vaapi)")
+    parser.add_argument('--bench-workers', action='store_true',
+                       help='Benchmark scalare pe video sintetic cu 1, 2, 4, 8 procese')
+    parser.add_argument('--bench-cameras', type=int, default=8,
+                       help='Camere sintetice pentru --bench-workers (default: 8)')
+    parser.add_argument('--bench-frames', type=int, default=150,
+                       help='Frame-uri per cameră pentru --bench-workers (default: 150)')
+    args = parser.parse_args()
+
+    model_path = Path(args.model)
+    if not model_path.exists():
+        print(f"❌ Modelul nu există: {model_path}")
+        return
+
+    if args.bench_workers:
+        benchmark_workers(str(model_path), n_cameras=args.bench_cameras, frames=args.bench_frames)
+        return
+
+    if not args.manifest:
+        parser.error('--manifest este obligatoriu (în afară de --bench-workers)')
+
+    if args.workers is not None:
+        runner = ShardedCameraRunner(
+            model_path=str(model_path),
+            manifest_path=args.manifest,
+            workers=args.workers or None,
+            batch_size=args.batch_size,
+            conf_threshold=args.conf,
+            queue_size=args.queue_size,
+            events_path=args.events,
+            decode_backend=args.decode,
+            decode_size=args.decode_size,
+            hwaccel=args.hwaccel
+        )
+        runner.run()
+        return
+
+    runner = MultiCameraRunner(
+        model_path=str(model_path),
+        manifest_path=args.manifest,
+        batch_size=args.batch_size,
+        conf_threshold=args.conf,
+        queue_size=args.queue_size,
+        events_path=args.events,
+        report_interval=args.report_interval,
+        decode_backend=args.decode,
+        decode_size=args.decode_size,
+        hwaccel=args.hwaccel
+    )
+    runner.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+"""
+Procesare offline a înregistrărilor: chunk-uri de timp în paralel, un singur timeline de violări.
+
+Pentru reanalizarea unor ore de înregistrări, `inference_with_zones.py` rulează
+în timp real, pe un singur thread. Aici fișierul e împărțit în chunk-uri de
+frame-uri consecutive, procesate în paralel de procese worker (fiecare cu
+propriul model). Fiecare chunk începe cu un warm-up: frame-urile dinaintea
+chunk-ului (cel puțin cel mai lung `max_dwell_time` plus `exit_timeout`) trec
+prin model, tracker și `check_violations`, dar violările lor nu sunt emise,
+doar starea `ZoneTracker` (timpii de staționare) e reconstruită. Timpul folosit
+de reguli e timpul din video (`start_time` + PTS, vezi `frame_clock.StreamClock`),
+nu ceasul sistemului.
+
+Fiecare chunk își scrie violările într-un fișier JSON lines temporar; la final
+fișierele sunt concatenate în ordinea chunk-urilor, deci timeline-ul e ordonat
+după frame. ID-urile de track sunt disjuncte între chunk-uri.
+
+Usage:
+    python offline_batch.py --model best.pt --zones zones.json --source recording.mp4
+
+Example:
+    python offline_batch.py --model best.pt --zones zones.json --source recording.mp4 --workers 8 --events timeline.jsonl
+    python offline_batch.py --model best.pt --zones zones.json --source recording.mp4 --track --start-time 2024-05-01T08:00:00
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import shutil
+import tempfile
+import argparse
+import functools
+import multiprocessing as mp
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+
+from zone_monitor import ZoneMonitor
+from video_pipeline import FramePacket, iter_batches
+from tracker import IoUTracker
+from frame_clock import StreamClock
+
+
+# ID-urile de track ale chunk-ului i încep de la i * TRACK_ID_STRIDE + 1
+TRACK_ID_STRIDE = 1_000_000
+
+
+def probe_video(source: str) -> Tuple[int, float]:
+    """Numărul de frame-uri și fps-ul unui fișier video.
+
+    Raises:
+        ValueError: Dacă fișierul nu poate fi deschis sau nu are un număr de frame-uri cunoscut.
+    """
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise ValueError(f"Nu pot deschide sursa: {source}")
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+    cap.release()
+    if total <= 0 or fps <= 0:
+        raise ValueError(f"Sursa nu e un fișier cu durată cunoscută: {source}")
+    return total, fps
+
+
+def warmup_seconds(zone_monitor: ZoneMonitor, minimum: float = 2.0) -> float:
+    """Warm-up-ul necesar ca staționările de la începutul unui chunk să fie corecte.
+
+    O violare `max_dwell_time` de la începutul chunk-ului e detectată dacă
+    warm-up-ul acoperă cel mai lung `max_dwell_time`; `exit_timeout` acoperă
+    ieșirile scurte din cadru.
+    """
+    dwell = [zone.get('rules', {}).get('max_dwell_time') or 0 for zone in zone_monitor.zones]
+    return max(minimum, max(dwell, default=0) + zone_monitor.tracker.exit_timeout)
+
+
+def plan_chunks(total_frames: int, chunks: int, warmup_frames: int) -> List[Dict]:
+    """Împarte `[0, total_frames)` în chunk-uri egale, cu warm-up înaintea fiecăruia.
+
+    Args:
+        total_frames (int): Numărul de frame-uri din video.
+        chunks (int): Numărul de chunk-uri.
+        warmup_frames (int): Frame-uri procesate înaintea chunk-ului fără emiterea violărilor.
+
+    Returns:
+        List[Dict]: `{'index', 'start', 'end', 'warmup_start'}`, poziții de frame (de la 0).
+    """
+    chunks = max(1, min(chunks, total_frames))
+    bounds = [round(i * total_frames / chunks) for i in range(chunks + 1)]
+    return [{'index': i, 'start': bounds[i], 'end': bounds[i + 1],
+             'warmup_start': max(0, bounds[i] - warmup_frames)}
+            for i in range(chunks)]
+
+
+def read_chunk(source: str, first: int, last: int, clock: StreamClock) -> Iterator[FramePacket]:
+    """Frame-urile `[first, last)` ale fișierului, cu timestamp-uri din PTS-ul lor.
+
+    Indexul pachetului e numărul global al frame-ului (de la 1), ca la rularea secvențială.
+    """
+    cap = cv2.VideoCapture(source)
+    try:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+        if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != first:
+            # Seek imprecis pentru acest container: decodare de la început
+            cap.release()
+            cap = cv2.VideoCapture(source)
+            for _ in range(first):
+                if not cap.grab():
+                    return
+        for position in range(first, last):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            index = position + 1
+            yield FramePacket(index, frame, clock.stamp(index, cap.get(cv2.CAP_PROP_POS_MSEC)))
+    finally:
+        cap.release()
+
+
+def process_chunk(model, zone_monitor: ZoneMonitor, class_roles, chunk: Dict,
+                  source: str, fps: float, start_time: datetime, out,
+                  conf_threshold: float = 0.5, batch_size: int = 8,
+                  track: bool = False) -> Dict:
+    """Rulează un chunk (cu warm-up) și scrie violările lui ca JSON lines în `out`.
+
+    Returns:
+        Dict: Statisticile chunk-ului (frame-uri, frame-uri de warm-up, violări, secunde).
+    """
+    from inference_with_zones import detect_frames, violation_records
+
+    tracker = IoUTracker(first_id=chunk['index'] * TRACK_ID_STRIDE + 1) if track else None
+    clock = zone_monitor.clock = StreamClock(fps, start_time)
+    stats = {'chunk': chunk['index'], 'frames': 0, 'warmup_frames': 0, 'violations': 0}
+    started = time.perf_counter()
+
+    packets = read_chunk(source, chunk['warmup_start'], chunk['end'], clock)
+    for batch in iter_batches(packets, batch_size):
+        detections = detect_frames(model, [packet.frame for packet in batch],
+                                   conf_threshold, class_roles)
+        for packet, frame_detections in zip(batch, detections):
+            zone_monitor.set_frame_size(packet.frame.shape[1], packet.frame.shape[0])
+            if tracker is not None:
+                frame_detections = tracker.update(frame_detections)
+            packet.violations = zone_monitor.check_violations(frame_detections,
+                                                              current_time=packet.timestamp)
+            # Warm-up: doar starea tracker-elor, fără violări emise
+            if packet.index <= chunk['start']:
+                stats['warmup_frames'] += 1
+                continue
+            stats['frames'] += 1
+            for record in violation_records(packet):
+                record['video_time'] = round((packet.timestamp - start_time).total_seconds(), 3)
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                stats['violations'] += 1
+
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+def chunk_worker(worker_id: int, model_path: str, zones_config: str, source: str,
+                 chunks: List[Dict], fps: float, start_time: datetime, tmp_dir: str,
+                 results, conf_threshold: float = 0.5, batch_size: int = 8,
+                 track: bool = False, torch_threads: int = 1):
+    """Proces worker: încarcă modelul o dată și procesează chunk-urile alocate, pe rând.
+
+    Fiecare chunk are propriul `ZoneMonitor` (stare de staționare de la zero,
+    reconstruită în warm-up) și își scrie violările în `tmp_dir/chunk_<i>.jsonl`.
+    Trimite în `results` `('chunk', stats)` după fiecare chunk, apoi
+    `('done', worker_id)` sau `('error', worker_id, mesaj)`.
+    """
+    from ultralytics import YOLO
+    from multi_camera import _limit_torch_threads
+
+    _limit_torch_threads(torch_threads)
+    try:
+        model = YOLO(model_path)
+        for chunk in chunks:
+            zone_monitor = ZoneMonitor(zones_config)
+            class_roles = zone_monitor.compile_class_roles(model.names)
+            path = Path(tmp_dir) / f"chunk_{chunk['index']:05d}.jsonl"
+            with open(path, 'w', encoding='utf-8') as out:
+                stats = process_chunk(model, zone_monitor, class_roles, chunk, source, fps,
+                                      start_time, out, conf_threshold, batch_size, track)
+            results.put(('chunk', stats))
+        results.put(('done', worker_id))
+    except Exception as e:
+        results.put(('error', worker_id, f"{type(e).__name__}: {e}"))
+
+
+class OfflineVideoProcessor:
+    """Procesează un fișier video în chunk-uri paralele și scrie un timeline ordonat de violări.
+
+    Example:
+        >>> processor = OfflineVideoProcessor('best.pt', 'zones.json', 'recording.mp4', workers=8)
+        >>> processor.run()
+    """
+
+    def __init__(self,
+                 model_path: str,
+                 zones_config: str,
+                 source: str,
+                 workers: Optional[int] = None,
+                 chunks: Optional[int] = None,
+                 warmup: Optional[float] = None,
+                 conf_threshold: float = 0.5,
+                 batch_size: int = 8,
+                 track: bool = False,
+                 start_time: Optional[datetime] = None,
+                 events_path: Optional[str] = '-',
+                 verbose: bool = True):
+        """
+        Args:
+            model_path: Calea către modelul YOLO (.pt)
+            zones_config: Calea către config JSON cu zone
+            source: Fișierul video
+            workers: Numărul de procese (default: numărul de core-uri)
+            chunks: Numărul de chunk-uri (default: `workers`); mai multe chunk-uri
+                echilibrează mai bine încărcarea, dar adaugă warm-up
+            warmup: Secunde de warm-up per chunk (default: din `max_dwell_time` și `exit_timeout`)
+            conf_threshold: Threshold pentru confidence score
+            batch_size: Frame-uri per predict în fiecare worker
+            track: Tracking IoU (track_id pentru regulile max_dwell_time)
+            start_time: Momentul primului frame (default: data modificării fișierului minus durata)
+            events_path: Fișier JSON lines pentru timeline ('-' = stdout, None = dezactivat)
+            verbose: Afișează mesajele de status și raportul
+
+        Raises:
+            ValueError: Dacă fișierul nu poate fi deschis sau nu are durată cunoscută.
+        """
+        self.model_path = model_path
+        self.zones_config = zones_config
+        self.source = str(source)
+        self.total_frames, self.fps = probe_video(self.source)
+        self.duration = self.total_frames / self.fps
+
+        cpus = os.cpu_count() or 1
+        self.workers = max(1, workers or cpus)
+        if warmup is None:
+            warmup = warmup_seconds(ZoneMonitor(zones_config))
+        self.warmup = warmup
+        self.chunks = plan_chunks(self.total_frames, chunks or self.workers,
+                                  int(round(warmup * self.fps)))
+        self.workers = min(self.workers, len(self.chunks))
+        self.torch_threads = max(1, cpus // self.workers)
+
+        self.conf_threshold = conf_threshold
+        self.batch_size = batch_size
+        self.track = track
+        if start_time is None:
+            start_time = datetime.fromtimestamp(os.path.getmtime(self.source)) - timedelta(seconds=self.duration)
+        self.start_time = start_time
+        self.events_path = events_path
+        self.stats: List[Dict] = []
+        self.elapsed = 0.0
+        if verbose:
+            self.log = functools.partial(print, file=sys.stderr if events_path == '-' else sys.stdout)
+        else:
+            self.log = lambda *args, **kwargs: None
+
+    def run(self):
+        """Pornește worker-ii, așteaptă toate chunk-urile și scrie timeline-ul în ordine."""
+        ctx = mp.get_context('spawn')
+        results = ctx.Queue()
+        tmp_dir = tempfile.mkdtemp(prefix='offline_chunks_')
+        # Chunk-uri consecutive alocate round-robin: fiecare worker are porțiuni din tot video-ul
+        assignments = [self.chunks[i::self.workers] for i in range(self.workers)]
+        processes = [
+            ctx.Process(target=chunk_worker, name=f"chunks-{i}", daemon=True,
+                        args=(i, self.model_path, self.zones_config, self.source, chunks,
+                              self.fps, self.start_time, tmp_dir, results, self.conf_threshold,
+                              self.batch_size, self.track, self.torch_threads))
+            for i, chunks in enumerate(assignments)
+        ]
+
+        self.log(f"🎞️  {self.source}: {self.total_frames} frame-uri, {self.duration:.1f}s @ {self.fps:.2f} fps")
+        self.log(f"🧩 {len(self.chunks)} chunk-uri pe {len(processes)} procese, "
+                 f"warm-up {self.warmup:.1f}s/chunk ({self.torch_threads} thread-uri torch/proces)")
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+
+        self.stats = []
+        errors = []
+        pending = len(processes)
+        try:
+            while pending:
+                try:
+                    message = results.get(timeout=0.5)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        errors.append("worker oprit fără rezultat")
+                        break
+                    continue
+
+                kind = message[0]
+                if kind == 'chunk':
+                    self.stats.append(message[1])
+                    done = sum(stats['frames'] for stats in self.stats)
+                    self.log(f"  • chunk {message[1]['chunk']:3d} gata "
+                             f"({100.0 * done / self.total_frames:5.1f}% din video)")
+                elif kind == 'done':
+                    pending -= 1
+                elif kind == 'error':
+                    errors.append(f"worker {message[1]}: {message[2]}")
+                    pending -= 1
+
+            if not errors:
+                self._merge(tmp_dir)
+
+        except KeyboardInterrupt:
+            self.log("\n⏹️  Oprit (Ctrl+C)")
+
+        finally:
+            self.elapsed = time.perf_counter() - started
+            for process in processes:
+                process.join(timeout=5.0)
+                if process.is_alive():
+                    process.terminate()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            self.print_report()
+
+        if errors:
+            raise RuntimeError("; ".join(errors))
+
+    def _merge(self, tmp_dir: str):
+        """Concatenează violările chunk-urilor, în ordine, în timeline-ul final."""
+        if not self.events_path:
+            return
+        events = sys.stdout if self.events_path == '-' else open(self.events_path, 'a', encoding='utf-8')
+        try:
+            for chunk in self.chunks:
+                path = Path(tmp_dir) / f"chunk_{chunk['index']:05d}.jsonl"
+                with open(path, 'r', encoding='utf-8') as f:
+                    shutil.copyfileobj(f, events)
+            events.flush()
+        finally:
+            if events is not sys.stdout:
+                events.close()
+
+    def print_report(self):
+        """Afișează viteza față de timpul real și overhead-ul de warm-up."""
+        frames = sum(stats['frames'] for stats in self.stats)
+        warmup = sum(stats['warmup_frames'] for stats in self.stats)
+        violations = sum(stats['violations'] for stats in self.stats)
+        fps = frames / self.elapsed if self.elapsed > 0 else 0.0
+        realtime = fps / self.fps if self.fps else 0.0
+        self.log(f"\n📊 {self.elapsed:.1f}s pentru {frames}/{self.total_frames} frame-uri: "
+                 f"{fps:.1f} fps ({realtime:.1f}x timp real), {violations} violări")
+        if frames:
+            self.log(f"  • warm-up: {warmup} frame-uri în plus ({100.0 * warmup / frames:.1f}%)")
+        for stats in sorted(self.stats, key=lambda s: s['chunk']):
+            processed = stats['frames'] + stats['warmup_frames']
+            chunk_fps = processed / stats['seconds'] if stats['seconds'] > 0 else 0.0
+            self.log(f"  • chunk {stats['chunk']:3d}  {stats['frames']:7d} frame-uri "
+                     f"(+{stats['warmup_frames']} warm-up)  {chunk_fps:6.1f} fps  "
+                     f"violări {stats['violations']}")
+
+
+def main():
+    """Entry point pentru procesarea offline în chunk-uri paralele."""
+    parser = argparse.ArgumentParser(description='Procesare offline a unei înregistrări, în chunk-uri paralele')
+    parser.add_argument('--model', '-m', required=True,
+                       help='Calea către modelul YOLO (.pt)')
+    parser.add_argument('--zones', '-z', required=True,
+                       help='Calea către config JSON cu zone')
+    parser.add_argument('--source', '-s', required=True,
+                       help='Fișierul video')
+    parser.add_argument('--events', '-e', default='-',
+                       help="Fișier JSON lines pentru timeline (default: '-' = stdout)")
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                       help='Procese worker (default: numărul de core-uri)')
+    parser.add_argument('--chunks', type=int, default=None,
+                       help='Chunk-uri de timp (default: numărul de worker-i)')
+    parser.add_argument('--warmup', type=float, default=None,
+                       help='Secunde de warm-up per chunk (default: max_dwell_time maxim + exit_timeout)')
+    parser.add_argument('--batch-size', '-b', type=int, default=8,
+                       help='Frame-uri per predict în fiecare worker (default: 8)')
+    parser.add_argument('--conf', '-c', type=float, default=0.5,
+                       help='Confidence threshold (default: 0.5)')
+    parser.add_argument('--track', action='store_true',
+                       help='Tracking IoU între frame-uri (track_id pentru regulile max_dwell_time)')
+    parser.add_argument('--start-time', type=datetime.fromisoformat, default=None,
+                       help='Momentul primului frame, ISO 8601 (default: data fișierului minus durata)')
+    args = parser.parse_args()
+
+    for path, label in ((args.model, 'Modelul'), (args.zones, 'Config zone'), (args.source, 'Video-ul')):
+        if not Path(path).exists():
+            print(f"❌ {label} nu există: {path}")
+            return
+
+    try:
+        processor = OfflineVideoProcessor(
+            model_path=args.model,
+            zones_config=args.zones,
+            source=args.source,
+            workers=args.workers,
+            chunks=args.chunks,
+            warmup=args.warmup,
+            conf_threshold=args.conf,
+            batch_size=args.batch_size,
+            track=args.track,
+            start_time=args.start_time,
+            events_path=args.events
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    processor.run()
+
+
+if __name__ == "__main__":
+    main()
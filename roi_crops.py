@@ -0,0 +1,229 @@
+"""
+Inference YOLO doar pe ferestrele care conțin zone (region-of-interest cropping).
+
+Ferestrele se obțin din bounding box-urile poligoanelor (`polygon_np`), lărgite
+cu o margine și unite când se suprapun. Fiecare fereastră e trimisă modelului
+la aceeași scară ca frame-ul întreg (un crop de 1/4 din frame devine un input
+de ~1/4 din `imgsz`), deci calculul scade proporțional cu suprafața acoperită.
+Opțional, ferestrele mari sunt împărțite în tile-uri procesate la rezoluție
+nativă (`tile_size`), pentru obiecte mici.
+
+Box-urile sunt mutate înapoi în coordonatele frame-ului, iar duplicatele din
+zonele de suprapunere dintre tile-uri sunt eliminate cu NMS per clasă.
+"""
+
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from zone_monitor import ZoneMonitor, DetectionBatch, ClassRoles
+from tracker import iou_matrix
+
+
+def merge_windows(windows: np.ndarray, gap: int = 0) -> np.ndarray:
+    """Unește ferestrele care se suprapun (sau sunt la cel mult `gap` px) în dreptunghiuri comune.
+
+    Args:
+        windows (np.ndarray): Array (K, 4) int cu (x1, y1, x2, y2).
+        gap (int): Distanța maximă dintre două ferestre unite.
+
+    Returns:
+        np.ndarray: Array (M, 4) int, M <= K, ferestre disjuncte.
+    """
+    merged = [list(window) for window in np.asarray(windows).reshape(-1, 4).tolist()]
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(len(merged) - 1, i, -1):
+                a, b = merged[i], merged[j]
+                if (a[0] - gap <= b[2] and b[0] - gap <= a[2]
+                        and a[1] - gap <= b[3] and b[1] - gap <= a[3]):
+                    merged[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    del merged[j]
+                    changed = True
+    return np.array(merged, dtype=np.int32).reshape(-1, 4)
+
+
+def split_tiles(window: Sequence[int], tile_size: int, overlap: int) -> List[Tuple[int, int, int, int]]:
+    """Împarte o fereastră în tile-uri de cel mult `tile_size`, suprapuse cu `overlap` px.
+
+    Tile-urile au aceeași mărime și acoperă fereastra de la margine la margine.
+    """
+    x1, y1, x2, y2 = window
+
+    def starts(lo: int, hi: int) -> List[int]:
+        length = hi - lo
+        if length <= tile_size:
+            return [lo]
+        n = math.ceil((length - overlap) / (tile_size - overlap))
+        step = (length - tile_size) / (n - 1)
+        return [lo + int(round(i * step)) for i in range(n)]
+
+    return [(x, y, min(x + tile_size, x2), min(y + tile_size, y2))
+            for y in starts(y1, y2) for x in starts(x1, x2)]
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, class_ids: np.ndarray,
+        iou_threshold: float = 0.5) -> np.ndarray:
+    """Non-maximum suppression per clasă, greedy, după scor.
+
+    Returns:
+        np.ndarray: Indicii box-urilor păstrate, în ordinea scorului.
+    """
+    order = np.argsort(-scores, kind='stable')
+    iou = iou_matrix(boxes[order], boxes[order])
+    iou[class_ids[order][:, None] != class_ids[order][None, :]] = 0.0
+    suppressed = np.zeros(len(order), bool)
+    keep = []
+    for i in range(len(order)):
+        if suppressed[i]:
+            continue
+        keep.append(order[i])
+        suppressed |= iou[i] > iou_threshold
+    return np.array(keep, dtype=np.intp)
+
+
+def zone_windows(zone_monitor: ZoneMonitor, width: int, height: int,
+                 margin: int = 64, tile_size: int = 0,
+                 max_coverage: float = 0.8) -> np.ndarray:
+    """Ferestrele de crop pentru un frame: bbox-ul fiecărei zone + margine, unite.
+
+    Args:
+        zone_monitor (ZoneMonitor): Monitorul cu zonele (`polygon_np`).
+        width (int): Lățimea frame-ului.
+        height (int): Înălțimea frame-ului.
+        margin (int): Pixeli adăugați pe fiecare latură (obiecte care ies din zonă).
+        tile_size (int): Latura maximă a unui tile (0 = fără tiling).
+        max_coverage (float): Peste această fracție din frame se folosește frame-ul întreg.
+
+    Returns:
+        np.ndarray: Array (K, 4) int32 cu (x1, y1, x2, y2); frame-ul întreg dacă
+        nu există zone sau ferestrele acoperă aproape tot.
+    """
+    full = np.array([[0, 0, width, height]], dtype=np.int32)
+    boxes = []
+    for zone in zone_monitor.zones:
+        polygon = zone['polygon_np'].reshape(-1, 2)
+        x1, y1 = polygon.min(axis=0) - margin
+        x2, y2 = polygon.max(axis=0) + margin + 1
+        x1, y1 = max(int(x1), 0), max(int(y1), 0)
+        x2, y2 = min(int(x2), width), min(int(y2), height)
+        if x2 > x1 and y2 > y1:
+            boxes.append((x1, y1, x2, y2))
+    if not boxes:
+        return full
+
+    windows = merge_windows(np.array(boxes))
+    area = ((windows[:, 2] - windows[:, 0]) * (windows[:, 3] - windows[:, 1])).sum()
+    if area >= max_coverage * width * height:
+        windows = full
+    if tile_size:
+        windows = np.array([tile for window in windows.tolist()
+                            for tile in split_tiles(window, tile_size, min(margin, tile_size // 2))],
+                           dtype=np.int32)
+    return windows
+
+
+class RoiDetector:
+    """Rulează modelul doar pe ferestrele zonelor și returnează detectări în coordonate de frame.
+
+    Ferestrele sunt calculate o dată per dimensiune de frame și geometrie a
+    zonelor (`zone_monitor.geometry_version`). Crop-urile de aceeași mărime, din
+    toate frame-urile unui batch, merg într-un singur predict.
+
+    Attributes:
+        windows (np.ndarray): Ferestrele pentru ultima dimensiune de frame, (K, 4).
+        coverage (float): Fracția din frame acoperită de ferestre.
+
+    Example:
+        >>> detector = RoiDetector(model, zone_monitor, margin=64)
+        >>> detections = detector.detect(frames, 0.5, class_roles)
+        >>> violations = zone_monitor.check_violations(detections[0])
+    """
+
+    def __init__(self, model, zone_monitor: ZoneMonitor, margin: int = 64,
+                 tile_size: int = 0, imgsz: int = 640, iou_threshold: float = 0.5):
+        """
+        Args:
+            model: Modelul YOLO încărcat
+            zone_monitor: Monitorul cu zonele
+            margin: Pixeli adăugați în jurul fiecărei zone (și suprapunerea tile-urilor)
+            tile_size: Latura tile-urilor procesate la rezoluție nativă (0 = fereastra
+                întreagă, la scara frame-ului întreg)
+            imgsz: Dimensiunea de inference a frame-ului întreg (ca în `model.predict`)
+            iou_threshold: IoU peste care duplicatele din tile-uri suprapuse sunt eliminate
+        """
+        self.model = model
+        self.zone_monitor = zone_monitor
+        self.margin = margin
+        self.tile_size = tile_size
+        self.imgsz = imgsz
+        self.iou_threshold = iou_threshold
+        self.windows = None
+        self.coverage = 1.0
+        self._key = None  # (width, height, geometry_version)
+        self._sizes = None
+
+    def _prepare(self, width: int, height: int):
+        """Recalculează ferestrele și dimensiunea de inference a fiecăreia.
+
+        Cheia include `geometry_version`: după `reload_config` sau `set_frame_size`
+        crop-urile urmează noile zone, chiar dacă rezoluția e aceeași.
+        """
+        key = (width, height, self.zone_monitor.geometry_version)
+        if self._key == key:
+            return
+        self._key = key
+        self.windows = zone_windows(self.zone_monitor, width, height, self.margin, self.tile_size)
+        sides = np.maximum(self.windows[:, 2] - self.windows[:, 0], self.windows[:, 3] - self.windows[:, 1])
+        # Aceeași scară ca frame-ul întreg (sau nativă, pentru tile-uri), multiplu de 32
+        scale = 1.0 if self.tile_size else self.imgsz / max(width, height)
+        self._sizes = [max(32, int(math.ceil(side * scale / 32)) * 32) for side in sides.tolist()]
+        area = ((self.windows[:, 2] - self.windows[:, 0]) * (self.windows[:, 3] - self.windows[:, 1])).sum()
+        self.coverage = float(area) / (width * height)
+
+    def detect(self, frames: List[np.ndarray], conf_threshold: float,
+               class_roles: ClassRoles) -> List[DetectionBatch]:
+        """Detectările fiecărui frame, doar din ferestrele zonelor.
+
+        Args:
+            frames (List[np.ndarray]): Frame-urile BGR (aceeași dimensiune).
+            conf_threshold (float): Threshold pentru confidence score.
+            class_roles (ClassRoles): Tabelul class id → rol compilat din `model.names`.
+
+        Returns:
+            List[DetectionBatch]: Detectările fiecărui frame, în coordonate de frame.
+        """
+        height, width = frames[0].shape[:2]
+        self._prepare(width, height)
+
+        # Crop-urile de aceeași dimensiune de inference, din toate frame-urile, într-un predict
+        parts: Dict[int, List[np.ndarray]] = {i: [] for i in range(len(frames))}
+        by_size: Dict[int, List[int]] = {}
+        for w, size in enumerate(self._sizes):
+            by_size.setdefault(size, []).append(w)
+        for size, window_ids in by_size.items():
+            crops, owners = [], []
+            for f, frame in enumerate(frames):
+                for w in window_ids:
+                    x1, y1, x2, y2 = self.windows[w]
+                    crops.append(frame[y1:y2, x1:x2])
+                    owners.append((f, x1, y1))
+            results = self.model(crops, conf=conf_threshold, imgsz=size, verbose=False)
+            for (f, x1, y1), result in zip(owners, results):
+                data = np.array(result.boxes.data.cpu().numpy(), dtype=np.float32).reshape(-1, 6)
+                data[:, [0, 2]] += x1
+                data[:, [1, 3]] += y1
+                parts[f].append(data)
+
+        batches = []
+        for f in range(len(frames)):
+            data = np.concatenate(parts[f]) if parts[f] else np.empty((0, 6), np.float32)
+            if len(self.windows) > 1 and len(data):
+                data = data[nms(data[:, :4], data[:, 4], data[:, 5].astype(np.int32), self.iou_threshold)]
+            detections = DetectionBatch.from_array(data, self.model.names)
+            roles = class_roles.role[detections.class_ids]
+            batches.append(detections.select(roles != ClassRoles.ROLE_IGNORE))
+        return batches
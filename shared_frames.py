@@ -0,0 +1,267 @@
+"""
+Transport de frame-uri fără copiere între procese, prin memorie partajată.
+
+Un `SharedFrameRing` alocă o singură dată N sloturi de frame într-un bloc
+`multiprocessing.shared_memory`; fiecare slot e văzut ca `np.ndarray` în
+ambele procese. Procesul de decodare scrie pixelii direct în slot și trimite
+doar indexul slotului; consumatorul eliberează slotul după ce nu mai are
+nevoie de pixeli. Când toate sloturile sunt ocupate, decodarea așteaptă
+(back-pressure) sau, pentru surse live, sare peste frame-uri. Odată cu slotul
+pleacă PTS-ul frame-ului, din care ceasul consumatorului (`frame_clock`) face
+timestamp-ul, deci frame-urile sărite nu deformează timpul.
+"""
+
+import queue
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Iterator, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from video_pipeline import FramePacket
+from frame_clock import StreamClock, MonotonicClock, make_clock
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Deschide un bloc existent fără să-l înregistreze pentru ștergere (Python 3.13+)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedFrameRing:
+    """Sloturi de frame prealocate în memorie partajată, cu coadă de sloturi libere.
+
+    Procesul care creează ring-ul e proprietarul blocului (`unlink` la final).
+    Ring-ul poate fi trimis ca argument unui `multiprocessing.Process`; în
+    procesul copil se reatașează la același bloc, după nume.
+
+    Attributes:
+        slots (int): Numărul de sloturi.
+        shape (Tuple[int, ...]): Forma unui frame (ex: `(1080, 1920, 3)`).
+        dtype (np.dtype): Tipul pixelilor.
+        dropped: Frame-uri sărite de producător când ring-ul era plin.
+
+    Example:
+        >>> ring = SharedFrameRing(8, (1080, 1920, 3))
+        >>> slot = ring.acquire()
+        >>> ring.view(slot)[:] = frame
+        >>> ring.release(slot)
+        >>> ring.close(); ring.unlink()
+    """
+
+    def __init__(self, slots: int, shape: Tuple[int, ...], dtype=np.uint8,
+                 ctx=None, _name: Optional[str] = None, _free=None, _dropped=None):
+        """
+        Args:
+            slots: Numărul de sloturi (frame-uri în zbor simultan)
+            shape: Forma unui frame
+            dtype: Tipul pixelilor
+            ctx: Contextul multiprocessing pentru cozi (default: spawn)
+        """
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self._owner = _name is None
+
+        if self._owner:
+            ctx = ctx or mp.get_context('spawn')
+            self._shm = shared_memory.SharedMemory(create=True, size=slots * self.frame_bytes)
+            self._free = ctx.Queue()
+            for slot in range(slots):
+                self._free.put(slot)
+            self.dropped = ctx.Value('i', 0)
+        else:
+            self._shm = _attach_shared_memory(_name)
+            self._free = _free
+            self.dropped = _dropped
+
+        buffer = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=self._shm.buf)
+        self._views = list(buffer)
+
+    def __reduce__(self):
+        # În procesul copil: reatașare la același bloc, fără realocare
+        return (SharedFrameRing,
+                (self.slots, self.shape, self.dtype, None, self._shm.name, self._free, self.dropped))
+
+    def view(self, slot: int) -> np.ndarray:
+        """View NumPy (fără copiere) peste slotul dat."""
+        return self._views[slot]
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Ia un slot liber; blochează cât timp toate sunt ocupate.
+
+        Args:
+            timeout: Așteptarea maximă în secunde (None = nelimitat, 0 = fără așteptare).
+
+        Returns:
+            Optional[int]: Indexul slotului sau None la timeout.
+        """
+        try:
+            return self._free.get(timeout=timeout) if timeout != 0 else self._free.get_nowait()
+        except queue.Empty:
+            return None
+
+    def release(self, slot: int):
+        """Marchează slotul ca liber (pixelii lui pot fi suprascriși)."""
+        self._free.put(slot)
+
+    def close(self):
+        """Eliberează view-urile și închide maparea în procesul curent."""
+        self._views = []
+        try:
+            self._shm.close()
+        except BufferError:
+            pass  # Mai există view-uri în uz; maparea se închide odată cu ele
+
+    def unlink(self):
+        """Șterge blocul de memorie partajată (doar proprietarul)."""
+        if self._owner:
+            self._shm.unlink()
+
+
+def _decode_into_ring(source: Union[str, int], ring: SharedFrameRing, ready,
+                      stop_event, drop_when_full: bool, resize: bool = False):
+    """Proces de decodare: citește frame-urile direct în sloturile ring-ului.
+
+    Cu `resize`, frame-ul decodat e micșorat direct în slot (dimensiunea slotului).
+    Trimite în `ready` tupluri `(index, slot, pos_msec)`, apoi `None` la final
+    sau un mesaj text la eroare.
+    """
+    ready.cancel_join_thread()
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        ready.put(f"Nu pot deschide sursa: {source}")
+        return
+
+    index = 0
+    decoded = None
+    try:
+        while not stop_event.is_set():
+            if drop_when_full:
+                slot = ring.acquire(timeout=0)
+                if slot is None:
+                    # Ring plin: frame-ul e decodat și aruncat, sursa live nu așteaptă
+                    if not cap.grab():
+                        break
+                    index += 1
+                    with ring.dropped.get_lock():
+                        ring.dropped.value += 1
+                    continue
+            else:
+                slot = ring.acquire(timeout=0.1)
+                if slot is None:
+                    continue  # Back-pressure: toate sloturile sunt în uz
+
+            view = ring.view(slot)
+            if resize:
+                ret, decoded = cap.read(decoded)
+                if ret:
+                    frame = cv2.resize(decoded, (view.shape[1], view.shape[0]), dst=view,
+                                       interpolation=cv2.INTER_LINEAR)
+            else:
+                ret, frame = cap.read(view)
+            if not ret:
+                ring.release(slot)
+                break
+            if frame.shape != view.shape:
+                raise ValueError(f"Frame {frame.shape} nu încape în slot {view.shape}")
+            if not np.shares_memory(frame, view):
+                view[...] = frame
+            index += 1
+            ready.put((index, slot, cap.get(cv2.CAP_PROP_POS_MSEC)))
+        ready.put(None)
+    except Exception as e:
+        ready.put(f"{type(e).__name__}: {e}")
+    finally:
+        cap.release()
+        ring.close()
+
+
+class SharedFrameSource:
+    """Decodare într-un proces separat; frame-urile vin ca view-uri peste sloturi.
+
+    Iterarea returnează `FramePacket`-uri al căror `frame` e un view în
+    memoria partajată (fără copiere) și al căror `slot` trebuie eliberat cu
+    `release` după ultima folosire a pixelilor (render/encodare).
+
+    Example:
+        >>> frames = SharedFrameSource('video.mp4', 1920, 1080, slots=8)
+        >>> for packet in frames:
+        ...     process(packet.frame)
+        ...     frames.release(packet)
+        >>> frames.close()
+    """
+
+    def __init__(self, source: Union[str, int], width: int, height: int,
+                 slots: int = 8, drop_when_full: bool = False,
+                 camera_id: Optional[str] = None, resize: bool = False,
+                 clock: Union[StreamClock, MonotonicClock, None] = None):
+        """
+        Args:
+            source: Sursa video (path, URL sau index webcam)
+            width: Lățimea frame-urilor (a sursei, sau cea dorită cu `resize`)
+            height: Înălțimea frame-urilor (a sursei, sau cea dorită cu `resize`)
+            slots: Numărul de sloturi din ring
+            drop_when_full: Sare peste frame-uri când toate sloturile sunt ocupate
+                (surse live), în loc să blocheze decodarea
+            camera_id: ID-ul camerei, propagat în pachete
+            resize: Frame-urile sunt micșorate la width × height în procesul de decodare
+            clock: Ceasul timestamp-urilor (default: `make_clock(source)`, PTS pentru fișiere)
+        """
+        self.ctx = mp.get_context('spawn')
+        self.ring = SharedFrameRing(slots, (height, width, 3), ctx=self.ctx)
+        self.camera_id = camera_id
+        self.clock = clock if clock is not None else make_clock(source)
+        self._ready = self.ctx.Queue()
+        self._stop_event = self.ctx.Event()
+        self._process = self.ctx.Process(
+            target=_decode_into_ring, name='decode-shm', daemon=True,
+            args=(source, self.ring, self._ready, self._stop_event, drop_when_full, resize)
+        )
+
+    @property
+    def dropped(self) -> int:
+        """Frame-uri sărite de decodare când ring-ul era plin."""
+        return self.ring.dropped.value
+
+    def __iter__(self) -> Iterator[FramePacket]:
+        self._process.start()
+        while True:
+            try:
+                message = self._ready.get(timeout=0.1)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    break
+                continue
+
+            if message is None:
+                break
+            if isinstance(message, str):
+                raise RuntimeError(message)
+
+            index, slot, pos_msec = message
+            packet = FramePacket(index, self.ring.view(slot), self.clock.stamp(index, pos_msec),
+                                 self.camera_id)
+            packet.slot = slot
+            yield packet
+
+    def release(self, packet: FramePacket):
+        """Returnează slotul pachetului în ring (o singură dată per pachet)."""
+        if packet.slot is not None:
+            self.ring.release(packet.slot)
+            packet.slot = None
+            packet.frame = None
+
+    def close(self):
+        """Oprește procesul de decodare și șterge memoria partajată."""
+        self._stop_event.set()
+        if self._process.is_alive():
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+        self.ring.close()
+        self.ring.unlink()
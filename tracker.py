@@ -0,0 +1,253 @@
+"""
+Tracker multi-obiect ușor (stil SORT) pentru `DetectionBatch.track_ids`.
+
+Fiecare track are un bounding box și o viteză (model cu viteză constantă).
+La fiecare frame, box-urile track-urilor sunt prezise, apoi asociate cu
+detectările noi: întâi după IoU (matrice calculată vectorizat), apoi, pentru
+ce a rămas, după distanța dintre centre relativă la mărimea box-ului. Track-urile
+nepotrivite de `max_age` frame-uri sunt șterse.
+
+Fără tracking, regulile `max_dwell_time` din `ZoneMonitor` nu pot funcționa
+(timpul în zonă se măsoară per track_id).
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from zone_monitor import DetectionBatch
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """IoU între fiecare pereche de box-uri, vectorizat.
+
+    Args:
+        boxes_a (np.ndarray): Array (N, 4) cu box-uri (x1, y1, x2, y2).
+        boxes_b (np.ndarray): Array (M, 4) cu box-uri (x1, y1, x2, y2).
+
+    Returns:
+        np.ndarray: Matrice (N, M) float32 cu IoU.
+    """
+    a = boxes_a[:, None, :].astype(np.float32)
+    b = boxes_b[None, :, :].astype(np.float32)
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-6), 0.0).astype(np.float32)
+
+
+def greedy_match(score: np.ndarray, threshold: float,
+                 higher_is_better: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Asociere greedy: perechile cele mai bune întâi, fiecare rând/coloană o dată.
+
+    Candidații (peste/sub prag) sunt sortați vectorizat; bucla Python trece
+    doar prin perechile valide, de obicei ~O(N) pentru scene reale.
+
+    Args:
+        score (np.ndarray): Matrice (N, M) de scoruri.
+        threshold (float): Pragul minim (sau maxim, dacă `higher_is_better=False`).
+        higher_is_better (bool): IoU (True) sau distanță (False).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Indicii rândurilor și coloanelor asociate.
+    """
+    valid = score >= threshold if higher_is_better else score <= threshold
+    rows, cols = np.nonzero(valid)
+    if len(rows) == 0:
+        return np.empty(0, np.intp), np.empty(0, np.intp)
+
+    values = score[rows, cols]
+    order = np.argsort(-values if higher_is_better else values, kind='stable')
+    used_rows = np.zeros(score.shape[0], bool)
+    used_cols = np.zeros(score.shape[1], bool)
+    matched_rows, matched_cols = [], []
+    for r, c in zip(rows[order].tolist(), cols[order].tolist()):
+        if used_rows[r] or used_cols[c]:
+            continue
+        used_rows[r] = used_cols[c] = True
+        matched_rows.append(r)
+        matched_cols.append(c)
+    return np.array(matched_rows, np.intp), np.array(matched_cols, np.intp)
+
+
+class IoUTracker:
+    """Tracker IoU + centroid, cu viteză constantă, pe array-uri NumPy.
+
+    Starea tuturor track-urilor e ținută columnar (box-uri, viteze, id-uri,
+    clase, frame-uri fără potrivire), ca în `DetectionBatch`.
+
+    Attributes:
+        boxes (np.ndarray): Array (T, 4) float32, ultimul box estimat per track.
+        velocities (np.ndarray): Array (T, 4) float32, deplasarea per frame.
+        ids (np.ndarray): Array (T,) int64, ID-urile track-urilor.
+        class_ids (np.ndarray): Array (T,) int32, clasa fiecărui track.
+        misses (np.ndarray): Array (T,) int32, frame-uri consecutive fără potrivire.
+        hits (np.ndarray): Array (T,) int32, frame-uri cu potrivire.
+
+    Example:
+        >>> tracker = IoUTracker(iou_threshold=0.3, max_age=30)
+        >>> for frame in stream:
+        ...     batch = tracker.update(detect_frame(model, frame, 0.5, class_roles))
+        ...     violations = monitor.check_violations(batch)
+    """
+
+    def __init__(self,
+                 iou_threshold: float = 0.3,
+                 max_age: int = 30,
+                 min_hits: int = 1,
+                 max_center_distance: float = 0.5,
+                 velocity_smoothing: float = 0.5,
+                 first_id: int = 1):
+        """
+        Args:
+            iou_threshold: IoU minim între box-ul prezis și detecție
+            max_age: Frame-uri fără potrivire după care track-ul e șters
+            min_hits: Potriviri necesare până când track-ul primește ID în output
+            max_center_distance: Distanța maximă între centre, ca fracție din
+                diagonala box-ului prezis (a doua etapă, pentru IoU prea mic)
+            velocity_smoothing: Ponderea vitezei vechi (0 = doar ultima deplasare)
+            first_id: Primul ID atribuit (ex: intervale disjuncte per chunk de video)
+        """
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.max_center_distance = max_center_distance
+        self.velocity_smoothing = velocity_smoothing
+
+        self.boxes = np.empty((0, 4), np.float32)
+        self.velocities = np.empty((0, 4), np.float32)
+        self.ids = np.empty(0, np.int64)
+        self.class_ids = np.empty(0, np.int32)
+        self.misses = np.empty(0, np.int32)
+        self.hits = np.empty(0, np.int32)
+        self._next_id = first_id
+
+    def __len__(self) -> int:
+        """Numărul de track-uri active (inclusiv cele fără potrivire recentă)."""
+        return len(self.ids)
+
+    @property
+    def next_id(self) -> int:
+        """ID-ul următorului track nou."""
+        return self._next_id
+
+    @next_id.setter
+    def next_id(self, value: int):
+        """Continuă numerotarea de la `value` (ex: după restaurarea stării); nu refolosește ID-uri.
+
+        Raises:
+            ValueError: Dacă `value` ar reatribui ID-uri deja folosite.
+        """
+        if value < self._next_id:
+            raise ValueError(f"next_id {value} < {self._next_id}: ID-urile ar fi refolosite")
+        self._next_id = int(value)
+
+    def update(self, batch: DetectionBatch) -> DetectionBatch:
+        """Asociază detectările frame-ului cu track-urile și returnează batch-ul cu `track_ids`.
+
+        Args:
+            batch (DetectionBatch): Detectările frame-ului curent.
+
+        Returns:
+            DetectionBatch: Aceleași detectări, cu `track_ids` setate
+            (-1 pentru track-urile încă neconfirmate, vezi `min_hits`).
+        """
+        track_ids = self.update_boxes(batch.boxes, batch.class_ids)
+        return DetectionBatch(batch.boxes, batch.confidences, batch.class_ids,
+                              batch.names, track_ids=track_ids)
+
+    def update_boxes(self, boxes: np.ndarray,
+                     class_ids: Optional[np.ndarray] = None) -> np.ndarray:
+        """Varianta standalone: box-uri (N, 4) și clase opționale → ID-uri (N,).
+
+        Args:
+            boxes (np.ndarray): Box-urile detectărilor (x1, y1, x2, y2).
+            class_ids (Optional[np.ndarray]): Clasele; track-urile se asociază doar
+                cu detectări din aceeași clasă.
+
+        Returns:
+            np.ndarray: Array (N,) int64 cu ID-ul track-ului fiecărei detecții.
+        """
+        boxes = np.asarray(boxes, np.float32).reshape(-1, 4)
+        class_ids = (np.zeros(len(boxes), np.int32) if class_ids is None
+                     else np.asarray(class_ids, np.int32).reshape(-1))
+
+        # 1. Predicție: fiecare track avansează cu viteza lui
+        predicted = self.boxes + self.velocities
+        same_class = self.class_ids[:, None] == class_ids[None, :]
+
+        # 2. Asociere după IoU
+        iou = iou_matrix(predicted, boxes)
+        iou[~same_class] = 0.0
+        track_idx, det_idx = greedy_match(iou, self.iou_threshold)
+
+        # 3. Ce a rămas: asociere după distanța centrelor (obiecte mici / rapide)
+        if self.max_center_distance and len(track_idx) < min(len(predicted), len(boxes)):
+            free_tracks = np.setdiff1d(np.arange(len(predicted)), track_idx)
+            free_dets = np.setdiff1d(np.arange(len(boxes)), det_idx)
+            if len(free_tracks) and len(free_dets):
+                p = predicted[free_tracks]
+                centers_t = (p[:, :2] + p[:, 2:]) / 2
+                centers_d = (boxes[free_dets, :2] + boxes[free_dets, 2:]) / 2
+                diagonal = np.hypot(p[:, 2] - p[:, 0], p[:, 3] - p[:, 1])
+                distance = np.linalg.norm(centers_t[:, None] - centers_d[None], axis=2)
+                distance = distance / np.maximum(diagonal, 1.0)[:, None]
+                distance[~same_class[np.ix_(free_tracks, free_dets)]] = np.inf
+                rows, cols = greedy_match(distance, self.max_center_distance, higher_is_better=False)
+                track_idx = np.concatenate([track_idx, free_tracks[rows]])
+                det_idx = np.concatenate([det_idx, free_dets[cols]])
+
+        # 4. Actualizează track-urile potrivite (viteză netezită)
+        if len(track_idx):
+            # self.boxes e poziția de la frame-ul anterior (observată sau prezisă)
+            motion = boxes[det_idx] - self.boxes[track_idx]
+            self.velocities[track_idx] = (self.velocity_smoothing * self.velocities[track_idx]
+                                          + (1 - self.velocity_smoothing) * motion)
+            self.boxes[track_idx] = boxes[det_idx]
+            self.hits[track_idx] += 1
+
+        matched = np.zeros(len(self.ids), bool)
+        matched[track_idx] = True
+        self.misses = np.where(matched, 0, self.misses + 1).astype(np.int32)
+        # Track-urile nepotrivite continuă pe traiectoria prezisă
+        self.boxes[~matched] = predicted[~matched]
+
+        result = np.full(len(boxes), -1, np.int64)
+        confirmed = self.hits[track_idx] >= self.min_hits
+        result[det_idx[confirmed]] = self.ids[track_idx[confirmed]]
+
+        # 5. Track-uri noi pentru detectările nepotrivite
+        new = np.ones(len(boxes), bool)
+        new[det_idx] = False
+        n_new = int(new.sum())
+        if n_new:
+            new_ids = np.arange(self._next_id, self._next_id + n_new, dtype=np.int64)
+            self._next_id += n_new
+            self.boxes = np.concatenate([self.boxes, boxes[new]])
+            self.velocities = np.concatenate([self.velocities, np.zeros((n_new, 4), np.float32)])
+            self.ids = np.concatenate([self.ids, new_ids])
+            self.class_ids = np.concatenate([self.class_ids, class_ids[new]])
+            self.misses = np.concatenate([self.misses, np.zeros(n_new, np.int32)])
+            self.hits = np.concatenate([self.hits, np.ones(n_new, np.int32)])
+            if self.min_hits <= 1:
+                result[new] = new_ids
+
+        # 6. Șterge track-urile pierdute de prea mult timp
+        alive = self.misses <= self.max_age
+        if not alive.all():
+            self.boxes = self.boxes[alive]
+            self.velocities = self.velocities[alive]
+            self.ids = self.ids[alive]
+            self.class_ids = self.class_ids[alive]
+            self.misses = self.misses[alive]
+            self.hits = self.hits[alive]
+
+        return result
+
+    def reset(self):
+        """Șterge toate track-urile (ID-urile noi continuă numerotarea)."""
+        self.__init__(self.iou_threshold, self.max_age, self.min_hits,
+                      self.max_center_distance, self.velocity_smoothing, first_id=self._next_id)
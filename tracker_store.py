@@ -0,0 +1,209 @@
+"""
+Stare persistentă pentru `ZoneTracker` (și `IoUTracker`), în SQLite cu WAL.
+
+Fără persistență, un restart al procesului resetează toate cronometrele de
+staționare. `SqliteTrackerStore` scrie la cel mult `flush_interval` secunde,
+într-o singură tranzacție, doar perechile (track, zonă) văzute de la flush-ul
+anterior și ștergerile (ieșirile), nu toată starea; `ZoneTracker.update` nu
+face nimic în plus per apel. În modul WAL cu `synchronous=NORMAL`, un crash
+al procesului pierde cel mult ultimul interval.
+
+La pornire se încarcă doar intrările văzute în ultimele `max_gap` secunde
+(index pe `last_seen`, plus `LIMIT`), deci timpul de încărcare e bounded.
+ID-urile de track sunt relevante după restart doar dacă și tracker-ul de
+obiecte își continuă ID-urile: starea `IoUTracker` (box-uri, ID-uri,
+următorul ID) e salvată la fiecare flush, tot incremental (doar track-urile
+potrivite, create sau șterse de la flush-ul anterior).
+"""
+
+import time
+import sqlite3
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+class SqliteTrackerStore:
+    """Backend SQLite (WAL) pentru starea tracker-elor, scris incremental.
+
+    Example:
+        >>> store = SqliteTrackerStore('tracker_state.db')
+        >>> monitor.tracker.attach_store(store)
+        >>> store.attach_tracker(iou_tracker)   # opțional, pentru ID-uri stabile
+        >>> ...
+        >>> monitor.tracker.close()
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0, max_entries: int = 100000):
+        """
+        Args:
+            path: Fișierul SQLite
+            flush_interval: Secunde între scrieri (0 = la fiecare frame)
+            max_entries: Numărul maxim de intrări încărcate la pornire
+        """
+        self.path = str(path)
+        self.flush_interval = flush_interval
+        self.max_entries = max_entries
+        self.tracker = None
+        self.flushes = 0
+        self.flush_seconds = 0.0
+
+        self._deleted = set()
+        self._last_flush = None
+        self._saved_hits: Dict[int, int] = {}  # {track_id: hits} așa cum e în tabelul tracks
+
+        # Creat pe thread-ul principal, folosit apoi de thread-ul de inference (`--pipeline`);
+        # accesele sunt secvențiale: un singur thread actualizează tracker-ul, `close` după oprire
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS zone_entries (
+                track_id INTEGER NOT NULL,
+                zone_id TEXT NOT NULL,
+                entry_time REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (track_id, zone_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS zone_entries_last_seen ON zone_entries (last_seen);
+            CREATE TABLE IF NOT EXISTS tracks (
+                track_id INTEGER PRIMARY KEY,
+                class_id INTEGER NOT NULL,
+                x1 REAL, y1 REAL, x2 REAL, y2 REAL,
+                hits INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL);
+        ''')
+        self._conn.commit()
+
+    def delete(self, key: Tuple[int, str]):
+        """Marchează o pereche ca ștearsă (ieșire din zonă), la următorul flush."""
+        self._deleted.add(key)
+
+    def load_entries(self, now: float, max_gap: float) -> Dict[Tuple[int, str], Tuple[float, float]]:
+        """Încarcă intrările văzute în ultimele `max_gap` secunde și șterge restul.
+
+        Intrările cu `last_seen` mai mare decât `now + max_gap` au fost salvate în
+        altă bază de timp (ex: alt `--start-time`) și sunt șterse și ele.
+
+        Args:
+            now (float): Timpul curent (aceeași bază ca timpii salvați, ex: epoch).
+            max_gap (float): Vechimea maximă a ultimei observări.
+
+        Returns:
+            Dict: {(track_id, zone_id): (entry_time, last_seen)}.
+        """
+        cutoff, future = now - max_gap, now + max_gap
+        with self._conn:
+            self._conn.execute('DELETE FROM zone_entries WHERE last_seen < ? OR last_seen > ?',
+                               (cutoff, future))
+        rows = self._conn.execute(
+            'SELECT track_id, zone_id, entry_time, last_seen FROM zone_entries '
+            'WHERE last_seen BETWEEN ? AND ? ORDER BY last_seen DESC LIMIT ?',
+            (cutoff, future, self.max_entries)
+        ).fetchall()
+        return {(track_id, zone_id): (entry_time, last_seen)
+                for track_id, zone_id, entry_time, last_seen in rows}
+
+    def attach_tracker(self, tracker, max_gap: float = 60.0):
+        """Restaurează și apoi salvează periodic starea unui `IoUTracker`.
+
+        Args:
+            tracker (IoUTracker): Tracker-ul de obiecte.
+            max_gap (float): Starea mai veche de atât (secunde, timp real) e ignorată.
+        """
+        self.tracker = tracker
+        meta = dict(self._conn.execute('SELECT key, value FROM meta').fetchall())
+        saved_at = meta.get('tracks_saved_at')
+        if saved_at is not None and meta.get('next_id'):
+            tracker.next_id = max(tracker.next_id, int(meta['next_id']))
+        if saved_at is None or time.time() - saved_at > max_gap:
+            # Stare veche: tabelul pornește gol, apoi e actualizat incremental
+            with self._conn:
+                self._conn.execute('DELETE FROM tracks')
+            self._saved_hits = {}
+            return
+
+        rows = self._conn.execute(
+            'SELECT track_id, class_id, x1, y1, x2, y2, hits FROM tracks'
+        ).fetchall()
+        if not rows:
+            return
+        data = np.array(rows, dtype=np.float64)
+        tracker.ids = data[:, 0].astype(np.int64)
+        tracker.class_ids = data[:, 1].astype(np.int32)
+        tracker.boxes = data[:, 2:6].astype(np.float32)
+        tracker.velocities = np.zeros_like(tracker.boxes)
+        tracker.hits = data[:, 6].astype(np.int32)
+        tracker.misses = np.zeros(len(rows), np.int32)
+        self._saved_hits = dict(zip(tracker.ids.tolist(), tracker.hits.tolist()))
+
+    def maybe_flush(self, now: float, zone_tracker=None, force: bool = False):
+        """Scrie modificările dacă a trecut `flush_interval` de la ultimul flush.
+
+        Args:
+            now (float): Timpul curent, în baza de timp a `zone_tracker`.
+            zone_tracker (Optional[ZoneTracker]): Sursa perechilor văzute de la ultimul flush.
+            force (bool): Scrie indiferent de interval.
+        """
+        since = self._last_flush
+        if not force and since is not None and now - since < self.flush_interval:
+            return
+        self._last_flush = now
+
+        changed = []
+        if zone_tracker is not None:
+            entries = zone_tracker.zone_entries
+            changed = [(key[0], key[1], entries[key], seen)
+                       for key, seen in zone_tracker.last_seen.items()
+                       if since is None or seen >= since]
+        if not (changed or self._deleted or self.tracker is not None):
+            return
+
+        start = time.perf_counter()
+        with self._conn:
+            if self._deleted:
+                self._conn.executemany(
+                    'DELETE FROM zone_entries WHERE track_id = ? AND zone_id = ?',
+                    list(self._deleted)
+                )
+            if changed:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO zone_entries (track_id, zone_id, entry_time, last_seen) '
+                    'VALUES (?, ?, ?, ?)',
+                    changed
+                )
+            if self.tracker is not None:
+                self._save_tracker()
+        self._deleted.clear()
+        self.flushes += 1
+        self.flush_seconds += time.perf_counter() - start
+
+    def _save_tracker(self):
+        """Scrie doar track-urile potrivite sau create (hits schimbat) și le șterge pe cele dispărute."""
+        tracker = self.tracker
+        ids = tracker.ids.tolist()
+        hits = tracker.hits.tolist()
+        saved = self._saved_hits
+        changed = [i for i, (track_id, h) in enumerate(zip(ids, hits)) if saved.get(track_id) != h]
+        removed = saved.keys() - set(ids)
+
+        if removed:
+            self._conn.executemany('DELETE FROM tracks WHERE track_id = ?', [(i,) for i in removed])
+        if changed:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO tracks (track_id, class_id, x1, y1, x2, y2, hits) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(ids[i], int(tracker.class_ids[i]), *map(float, tracker.boxes[i]), hits[i])
+                 for i in changed]
+            )
+        self._conn.executemany(
+            'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+            [('next_id', float(tracker.next_id)), ('tracks_saved_at', time.time())]
+        )
+        self._saved_hits = dict(zip(ids, hits))
+
+    def close(self, zone_tracker=None):
+        """Scrie modificările rămase și închide conexiunea."""
+        self.maybe_flush(self._last_flush or 0.0, zone_tracker, force=True)
+        self._conn.close()
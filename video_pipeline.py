@@ -0,0 +1,324 @@
+"""
+Pipeline pe etape pentru procesarea video (decode → inference → render).
+
+Fiecare etapă rulează pe propriul thread, iar etapele sunt legate prin cozi
+bounded. Ordinea frame-urilor se păstrează (un singur thread per etapă, cozi
+FIFO), iar coada de intrare poate renunța la cel mai vechi frame când e plină
+(util pentru surse live, unde contează ultimul frame, nu toate).
+"""
+
+import time
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+
+class FramePacket:
+    """Un frame și rezultatele asociate, transportate între etape.
+
+    Attributes:
+        index (int): Numărul frame-ului în sursă (de la 1).
+        frame (np.ndarray): Frame-ul BGR decodat.
+        timestamp (datetime): Momentul capturii frame-ului.
+        captured_at (float): `time.perf_counter()` la captură (pentru măsurarea latenței).
+        camera_id (Optional[str]): ID-ul camerei, când se procesează mai multe surse.
+        slot (Optional[int]): Slotul din memoria partajată care ține frame-ul (vezi `shared_frames`).
+        detections (DetectionBatch): Detectările YOLO (după inference).
+        violations (list): Violările detectate (după inference).
+        output (np.ndarray): Frame-ul cu overlay-uri (după render).
+    """
+
+    __slots__ = ('index', 'frame', 'timestamp', 'captured_at', 'camera_id', 'slot',
+                 'detections', 'violations', 'output')
+
+    def __init__(self, index: int, frame, timestamp: datetime,
+                 camera_id: Optional[str] = None):
+        self.index = index
+        self.frame = frame
+        self.timestamp = timestamp
+        self.captured_at = time.perf_counter()
+        self.camera_id = camera_id
+        self.slot = None
+        self.detections = None
+        self.violations = []
+        self.output = None
+
+
+class StageStats:
+    """Statistici de throughput pentru o etapă a pipeline-ului.
+
+    Attributes:
+        name (str): Numele etapei.
+        items (int): Numărul de elemente procesate.
+        busy_seconds (float): Timpul petrecut efectiv în procesare.
+        dropped (int): Elementele aruncate de coada de intrare a etapei.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.dropped = 0
+        self.started = None
+        self.finished = None
+
+    def report(self) -> str:
+        """Returnează o linie cu throughput-ul etapei."""
+        wall = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        fps = self.items / wall if wall > 0 else 0.0
+        busy_ms = self.busy_seconds / self.items * 1000 if self.items else 0.0
+        utilization = self.busy_seconds / wall * 100 if wall > 0 else 0.0
+        return (f"{self.name:<10} {self.items:6d} frame-uri  {fps:7.1f} fps  "
+                f"{busy_ms:7.2f} ms/frame  ocupare {utilization:5.1f}%  aruncate {self.dropped}")
+
+
+def iter_batches(packets: Iterable[FramePacket],
+                 batch_size: int,
+                 max_latency: Optional[float] = None) -> Iterator[List[FramePacket]]:
+    """Grupează frame-urile în batch-uri de cel mult `batch_size`, în ordine.
+
+    Un batch incomplet e emis mai devreme dacă cel mai vechi frame din el a
+    așteptat deja `max_latency` secunde. Verificarea se face la sosirea
+    fiecărui frame, deci pe o sursă live depășirea e de cel mult un interval
+    între frame-uri.
+
+    Args:
+        packets (Iterable[FramePacket]): Frame-urile sursei.
+        batch_size (int): Dimensiunea maximă a batch-ului.
+        max_latency (Optional[float]): Așteptarea maximă a primului frame, în secunde.
+
+    Yields:
+        List[FramePacket]: Batch-urile, în ordinea frame-urilor.
+    """
+    batch = []
+    for packet in packets:
+        batch.append(packet)
+        waited = time.perf_counter() - batch[0].captured_at
+        if len(batch) >= batch_size or (max_latency is not None and waited >= max_latency):
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _frame_count(item: Any) -> int:
+    """Numărul de frame-uri dintr-un element (batch-urile sunt liste)."""
+    return len(item) if isinstance(item, list) else 1
+
+
+# Marchează sfârșitul stream-ului; se propagă prin toate etapele
+END_OF_STREAM = object()
+
+
+class FrameQueue:
+    """Coadă bounded între etape, cu opțiunea de a arunca cel mai vechi element.
+
+    Cu `drop_oldest=False`, `put` blochează când coada e plină (back-pressure).
+    Cu `drop_oldest=True`, `put` nu blochează niciodată: cel mai vechi element
+    e scos și numărat în `stats.dropped`. `END_OF_STREAM` nu e aruncat niciodată.
+    După `stop_event`, `put` renunță în loc să blocheze.
+    """
+
+    def __init__(self, maxsize: int, drop_oldest: bool = False,
+                 stats: Optional[StageStats] = None):
+        self._queue = queue.Queue(maxsize=max(1, maxsize))
+        self.drop_oldest = drop_oldest
+        self.stats = stats
+
+    def put(self, item: Any, stop_event: Optional[threading.Event] = None):
+        """Adaugă un element; blochează sau aruncă cel mai vechi, după politică."""
+        while True:
+            try:
+                if self.drop_oldest:
+                    self._queue.put_nowait(item)
+                else:
+                    self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if stop_event is not None and stop_event.is_set():
+                    return
+                if self.drop_oldest:
+                    self._drop_one()
+
+    def _drop_one(self):
+        try:
+            oldest = self._queue.get_nowait()
+        except queue.Empty:
+            return
+        if oldest is END_OF_STREAM:
+            self._queue.put_nowait(oldest)
+            return
+        if self.stats is not None:
+            self.stats.dropped += _frame_count(oldest)
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Scoate următorul element (ridică `queue.Empty` la timeout)."""
+        return self._queue.get(timeout=timeout)
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+class PipelineStage(threading.Thread):
+    """Thread care aplică o funcție pe fiecare element dintre două cozi.
+
+    Funcția primește elementul și returnează rezultatul pentru etapa
+    următoare (sau None pentru a-l omite). Excepțiile opresc pipeline-ul și
+    sunt păstrate în `error`.
+    """
+
+    def __init__(self, name: str, fn: Callable[[Any], Any],
+                 in_queue: FrameQueue, out_queue: Optional[FrameQueue],
+                 stop_event: threading.Event):
+        super().__init__(name=name, daemon=True)
+        self.fn = fn
+        self.in_queue = in_queue
+        self.out_queue = out_queue
+        self.stop_event = stop_event
+        self.stats = in_queue.stats or StageStats(name)
+        self.error = None
+
+    def run(self):
+        self.stats.started = time.perf_counter()
+        try:
+            while True:
+                try:
+                    item = self.in_queue.get(timeout=0.1)
+                except queue.Empty:
+                    if self.stop_event.is_set():
+                        break
+                    continue
+
+                if item is END_OF_STREAM:
+                    break
+
+                start = time.perf_counter()
+                result = self.fn(item)
+                self.stats.busy_seconds += time.perf_counter() - start
+                self.stats.items += _frame_count(item)
+
+                if result is not None and self.out_queue is not None:
+                    self.out_queue.put(result, self.stop_event)
+        except Exception as e:
+            self.error = e
+            self.stop_event.set()
+        finally:
+            self.stats.finished = time.perf_counter()
+            if self.out_queue is not None:
+                self.out_queue.put(END_OF_STREAM, self.stop_event)
+
+
+class SourceStage(threading.Thread):
+    """Thread care citește elemente dintr-un iterabil (ex: frame-uri decodate)."""
+
+    def __init__(self, name: str, source: Iterable[Any],
+                 out_queue: FrameQueue, stop_event: threading.Event):
+        super().__init__(name=name, daemon=True)
+        self.source = source
+        self.out_queue = out_queue
+        self.stop_event = stop_event
+        self.stats = StageStats(name)
+        self.error = None
+
+    def run(self):
+        self.stats.started = time.perf_counter()
+        try:
+            iterator = iter(self.source)
+            while not self.stop_event.is_set():
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                self.stats.busy_seconds += time.perf_counter() - start
+                self.stats.items += _frame_count(item)
+                self.out_queue.put(item, self.stop_event)
+        except Exception as e:
+            self.error = e
+            self.stop_event.set()
+        finally:
+            self.stats.finished = time.perf_counter()
+            self.out_queue.put(END_OF_STREAM, self.stop_event)
+
+
+class StagedPipeline:
+    """Lanț de etape: sursă → funcții → coada finală consumată de apelant.
+
+    Example:
+        >>> pipeline = StagedPipeline(read_frames(cap), queue_size=8, drop_oldest=True)
+        >>> pipeline.add_stage('inference', infer)
+        >>> pipeline.add_stage('render', render)
+        >>> for packet in pipeline.run():
+        ...     cv2.imshow('out', packet.output)
+        >>> pipeline.print_report()
+    """
+
+    def __init__(self, source: Iterable[Any], queue_size: int = 8,
+                 drop_oldest: bool = False, source_name: str = 'decode'):
+        """
+        Args:
+            source: Iterabil cu elementele de intrare (rulează pe thread propriu)
+            queue_size: Capacitatea fiecărei cozi dintre etape
+            drop_oldest: Dacă coada după sursă aruncă cel mai vechi frame când e plină
+            source_name: Numele etapei sursă în raport
+        """
+        self.queue_size = queue_size
+        self.stop_event = threading.Event()
+        self._first_queue = FrameQueue(queue_size, drop_oldest=drop_oldest)
+        self._source = SourceStage(source_name, source, self._first_queue, self.stop_event)
+        self._stages: List[PipelineStage] = []
+        self._last_queue = self._first_queue
+
+    def add_stage(self, name: str, fn: Callable[[Any], Any]) -> 'StagedPipeline':
+        """Adaugă o etapă care consumă ieșirea etapei anterioare."""
+        # Statisticile etapei stau pe coada ei de intrare (inclusiv frame-urile aruncate)
+        in_queue = self._last_queue
+        in_queue.stats = StageStats(name)
+        out_queue = FrameQueue(self.queue_size)
+        self._stages.append(PipelineStage(name, fn, in_queue, out_queue, self.stop_event))
+        self._last_queue = out_queue
+        return self
+
+    def run(self):
+        """Pornește thread-urile și returnează elementele finale, în ordine."""
+        self._source.start()
+        for stage in self._stages:
+            stage.start()
+
+        try:
+            while True:
+                try:
+                    item = self._last_queue.get(timeout=0.1)
+                except queue.Empty:
+                    if self.stop_event.is_set() and not any(t.is_alive() for t in self._threads()):
+                        break
+                    continue
+                if item is END_OF_STREAM:
+                    break
+                yield item
+        finally:
+            self.stop()
+
+        for thread in self._threads():
+            if thread.error is not None:
+                raise thread.error
+
+    def stop(self):
+        """Oprește toate etapele și așteaptă terminarea thread-urilor."""
+        self.stop_event.set()
+        for thread in self._threads():
+            thread.join(timeout=2.0)
+
+    def _threads(self):
+        return [self._source] + self._stages
+
+    def stats(self) -> List[StageStats]:
+        """Statisticile tuturor etapelor, în ordine."""
+        return [thread.stats for thread in self._threads()]
+
+    def print_report(self, file=None):
+        """Afișează throughput-ul per etapă (implicit pe stdout)."""
+        print("\n📊 Throughput per etapă:", file=file)
+        for stats in self.stats():
+            print(f"  • {stats.report()}", file=file)
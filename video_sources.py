@@ -0,0 +1,367 @@
+"""
+Backend-uri de decodare video, cu opțiunea de a decoda direct la rezoluția de inference.
+
+`cv2.VideoCapture` decodează frame-uri BGR la rezoluția completă, pe care YOLO
+le micșorează apoi la `imgsz`. Cu `long_side` setat, frame-urile ajung la
+consumator deja la rezoluția de inference:
+
+- `OpenCVSource`: `cv2.VideoCapture` + `cv2.resize` direct în buffer-ul frame-ului
+- `FFmpegSource`: proces `ffmpeg` cu filtru `scale` (și `-hwaccel` opțional), care
+  scrie BGR brut într-un pipe; pixelii sunt citiți direct în buffer-e NumPy
+  reutilizate, fără decodarea la rezoluția completă în Python
+
+Ambele returnează `FramePacket`-uri; buffer-ul unui frame e refolosit după
+`release(packet)` (ca la `shared_frames.SharedFrameSource`). Timestamp-ul vine
+din ceasul sursei (`frame_clock`): PTS-ul frame-ului pentru fișiere, timpul
+monoton pentru surse live. Coordonatele
+detectărilor sunt în pixelii frame-ului decodat; `ZoneMonitor.set_frame_size`
+scalează poligoanele zonelor la aceeași rezoluție.
+"""
+
+import re
+import abc
+import json
+import shutil
+import functools
+import subprocess
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from video_pipeline import FramePacket
+from frame_clock import make_clock
+
+
+DECODE_BACKENDS = ('opencv', 'ffmpeg')
+
+
+def scaled_size(width: int, height: int, long_side: Optional[int]) -> Tuple[int, int]:
+    """Dimensiunea cu latura mare `long_side`, cu aspectul păstrat și laturi pare.
+
+    Frame-urile mai mici decât `long_side` nu sunt mărite.
+
+    Args:
+        width (int): Lățimea sursei.
+        height (int): Înălțimea sursei.
+        long_side (Optional[int]): Latura mare dorită (None = dimensiunea sursei).
+
+    Returns:
+        Tuple[int, int]: (width, height) după scalare.
+    """
+    if not long_side or max(width, height) <= long_side:
+        return width, height
+    scale = long_side / max(width, height)
+    # Laturi pare: cerute de majoritatea encoderelor și de filtrul scale
+    return (max(2, int(round(width * scale / 2)) * 2),
+            max(2, int(round(height * scale / 2)) * 2))
+
+
+class _BufferPool:
+    """Buffer-e de frame refolosite; unul nou e alocat doar când toate sunt în uz."""
+
+    def __init__(self, shape: Tuple[int, ...]):
+        self.shape = shape
+        self.allocated = 0
+        self._free = deque()
+
+    def get(self) -> np.ndarray:
+        try:
+            return self._free.pop()
+        except IndexError:
+            self.allocated += 1
+            return np.empty(self.shape, np.uint8)
+
+    def put(self, buffer: np.ndarray):
+        self._free.append(buffer)
+
+
+def _drain_lines(stream, lines: deque):
+    """Citește un pipe până la EOF, păstrând ultimele linii (pipe-ul nu se umple niciodată)."""
+    for line in iter(stream.readline, b''):
+        lines.append(line.decode(errors='replace').rstrip())
+    stream.close()
+
+
+class FrameSource(abc.ABC):
+    """Interfața comună: iterare peste `FramePacket`-uri, `release` și `close`.
+
+    Attributes:
+        width (int): Lățimea frame-urilor livrate.
+        height (int): Înălțimea frame-urilor livrate.
+        source_size (Tuple[int, int]): Rezoluția sursei (width, height).
+        fps (float): Frame rate-ul sursei (0 dacă e necunoscut).
+        clock (Union[StreamClock, MonotonicClock]): Ceasul care marchează frame-urile.
+        dropped (int): Frame-uri sărite de decodare (mereu 0 aici).
+    """
+
+    dropped = 0
+
+    def __init__(self, source: Union[str, int], source_size: Tuple[int, int], fps: float,
+                 long_side: Optional[int] = None, camera_id: Optional[str] = None,
+                 clock: str = 'auto', start_time: Optional[datetime] = None):
+        self.source_size = source_size
+        self.width, self.height = scaled_size(*source_size, long_side)
+        self.fps = fps
+        self.camera_id = camera_id
+        self.clock = make_clock(source, fps, clock, start_time)
+        self._pool = _BufferPool((self.height, self.width, 3))
+
+    @property
+    def scaled(self) -> bool:
+        """True dacă frame-urile sunt livrate la altă rezoluție decât a sursei."""
+        return (self.width, self.height) != tuple(self.source_size)
+
+    @abc.abstractmethod
+    def __iter__(self) -> Iterator[FramePacket]:
+        """Frame-urile sursei, marcate cu ceasul ei."""
+
+    def release(self, packet: FramePacket):
+        """Returnează buffer-ul frame-ului (după ultima folosire a pixelilor)."""
+        if packet.frame is not None:
+            self._pool.put(packet.frame)
+            packet.frame = None
+
+    def close(self):
+        """Eliberează sursa."""
+
+
+class OpenCVSource(FrameSource):
+    """Decodare cu `cv2.VideoCapture`, opțional micșorată direct în buffer-ul frame-ului.
+
+    Example:
+        >>> frames = OpenCVSource('video.mp4', long_side=640)
+        >>> for packet in frames:
+        ...     process(packet.frame)
+        ...     frames.release(packet)
+        >>> frames.close()
+    """
+
+    def __init__(self, source: Union[str, int], long_side: Optional[int] = None,
+                 camera_id: Optional[str] = None, clock: str = 'auto',
+                 start_time: Optional[datetime] = None):
+        """
+        Args:
+            source: Sursa video (path, URL sau index webcam)
+            long_side: Latura mare a frame-urilor livrate (None = rezoluția sursei)
+            camera_id: ID-ul camerei, propagat în pachete
+            clock: Ceasul timestamp-urilor, 'auto', 'stream' sau 'wall' (vezi `frame_clock`)
+            start_time: Momentul primului frame (ceas 'stream') sau al pornirii ('wall')
+
+        Raises:
+            ValueError: Dacă sursa nu poate fi deschisă.
+        """
+        self.cap = cv2.VideoCapture(source)
+        if not self.cap.isOpened():
+            raise ValueError(f"Nu pot deschide sursa: {source}")
+        source_size = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                       int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        super().__init__(source, source_size, self.cap.get(cv2.CAP_PROP_FPS) or 0.0, long_side,
+                         camera_id, clock, start_time)
+        self._decoded = None  # Frame-ul la rezoluția sursei, reutilizat când se scalează
+
+    def __iter__(self) -> Iterator[FramePacket]:
+        index = 0
+        while True:
+            if self.scaled:
+                ret, self._decoded = self.cap.read(self._decoded)
+                if not ret:
+                    break
+                # Aceeași interpolare ca letterbox-ul YOLO: detectările nu se schimbă
+                frame = cv2.resize(self._decoded, (self.width, self.height),
+                                   dst=self._pool.get(), interpolation=cv2.INTER_LINEAR)
+            else:
+                buffer = self._pool.get()
+                ret, frame = self.cap.read(buffer)
+                if not ret:
+                    self._pool.put(buffer)
+                    break
+            index += 1
+            timestamp = self.clock.stamp(index, self.cap.get(cv2.CAP_PROP_POS_MSEC))
+            yield FramePacket(index, frame, timestamp, self.camera_id)
+
+    def close(self):
+        self.cap.release()
+
+
+@functools.lru_cache(maxsize=None)
+def _cfr_args(ffmpeg: str) -> Tuple[str, ...]:
+    """Ieșirea la rată constantă: `-fps_mode cfr` (ffmpeg 5.1+) sau `-vsync cfr` (mai vechi).
+
+    Build-urile din git (`N-...`) și versiunile care nu pot fi citite sunt tratate ca noi.
+    """
+    try:
+        banner = subprocess.run([ffmpeg, '-version'], capture_output=True, text=True,
+                                timeout=10.0).stdout
+    except (OSError, subprocess.SubprocessError):
+        banner = ''
+    match = re.match(r'ffmpeg version n?(\d+)\.(\d+)', banner)
+    if match and (int(match.group(1)), int(match.group(2))) < (5, 1):
+        return ('-vsync', 'cfr')
+    return ('-fps_mode', 'cfr')
+
+
+class FFmpegSource(FrameSource):
+    """Decodare și scalare într-un proces `ffmpeg`, cu frame-uri BGR citite dintr-un pipe.
+
+    Scalarea (filtrul `scale`) și, cu `hwaccel`, decodarea rulează în ffmpeg,
+    pe orice accelerator disponibil (`auto`, `cuda`, `vaapi`, `videotoolbox`...).
+    Python doar citește `width * height * 3` octeți per frame direct într-un
+    buffer refolosit. Pipe-ul nu transportă PTS: pentru fișiere (ceas 'stream')
+    ffmpeg scoate frame-urile la rată constantă (`-fps_mode cfr`, `-vsync cfr` înainte
+    de ffmpeg 5.1, duplicând sau aruncând frame-uri la VFR), deci PTS-ul frame-ului `n`
+    e exact `(n - 1) / fps`.
+
+    Example:
+        >>> frames = FFmpegSource('rtsp://camera', long_side=640, hwaccel='auto')
+        >>> for packet in frames:
+        ...     process(packet.frame)
+        ...     frames.release(packet)
+        >>> frames.close()
+    """
+
+    def __init__(self, source: Union[str, int], long_side: Optional[int] = None,
+                 hwaccel: Optional[str] = None, camera_id: Optional[str] = None,
+                 clock: str = 'auto', start_time: Optional[datetime] = None,
+                 ffmpeg: str = 'ffmpeg', ffprobe: str = 'ffprobe'):
+        """
+        Args:
+            source: Sursa video (path sau URL; webcam-urile merg prin backend-ul opencv)
+            long_side: Latura mare a frame-urilor livrate (None = rezoluția sursei)
+            hwaccel: Valoarea `-hwaccel` pentru ffmpeg (None = decodare software)
+            camera_id: ID-ul camerei, propagat în pachete
+            clock: Ceasul timestamp-urilor, 'auto', 'stream' sau 'wall' (vezi `frame_clock`)
+            start_time: Momentul primului frame (ceas 'stream') sau al pornirii ('wall')
+            ffmpeg: Executabilul ffmpeg
+            ffprobe: Executabilul ffprobe (dimensiunea și fps-ul sursei)
+
+        Raises:
+            ValueError: Dacă ffmpeg lipsește sau sursa nu poate fi citită.
+        """
+        if isinstance(source, int):
+            raise ValueError("Backend-ul ffmpeg nu deschide webcam-uri după index; folosește opencv")
+        for tool in (ffmpeg, ffprobe):
+            if shutil.which(tool) is None:
+                raise ValueError(f"Nu găsesc '{tool}' în PATH")
+        self.source = str(source)
+        self.hwaccel = hwaccel
+        self.ffmpeg = ffmpeg
+        width, height, fps = self._probe(ffprobe)
+        super().__init__(source, (width, height), fps, long_side, camera_id, clock, start_time)
+        self.process = None
+
+    def _probe(self, ffprobe: str) -> Tuple[int, int, float]:
+        """Dimensiunea și fps-ul primului stream video, din ffprobe."""
+        result = subprocess.run(
+            [ffprobe, '-v', 'error', '-select_streams', 'v:0',
+             '-show_entries', 'stream=width,height,avg_frame_rate', '-of', 'json', self.source],
+            capture_output=True, text=True
+        )
+        streams = json.loads(result.stdout or '{}').get('streams') if result.returncode == 0 else None
+        if not streams:
+            raise ValueError(f"Nu pot deschide sursa: {self.source} ({result.stderr.strip()})")
+        stream = streams[0]
+        num, _, den = stream.get('avg_frame_rate', '0/1').partition('/')
+        fps = float(num) / float(den) if den and float(den) else 0.0
+        return int(stream['width']), int(stream['height']), fps
+
+    def command(self) -> List[str]:
+        """Linia de comandă ffmpeg: decodare (opțional hardware), scalare, BGR brut pe stdout."""
+        cmd = [self.ffmpeg, '-nostdin', '-loglevel', 'error']
+        if self.hwaccel:
+            cmd += ['-hwaccel', self.hwaccel]
+        cmd += ['-i', self.source]
+        if self.scaled:
+            cmd += ['-vf', f'scale={self.width}:{self.height}:flags=bilinear']
+        if not self.clock.live and self.fps:
+            # Rată constantă: indexul frame-ului dă PTS-ul (timestamp-ul ceasului)
+            cmd += [*_cfr_args(self.ffmpeg), '-r', f'{self.fps:g}']
+        cmd += ['-f', 'rawvideo', '-pix_fmt', 'bgr24', '-an', '-sn', '-']
+        return cmd
+
+    def __iter__(self) -> Iterator[FramePacket]:
+        frame_bytes = self.width * self.height * 3
+        self.process = subprocess.Popen(self.command(), stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE, bufsize=frame_bytes)
+        # Stderr golit continuu: un stream corupt nu blochează ffmpeg cu pipe-ul plin
+        errors = deque(maxlen=20)
+        drain = threading.Thread(target=_drain_lines, args=(self.process.stderr, errors),
+                                 name='ffmpeg-stderr', daemon=True)
+        drain.start()
+        stdout = self.process.stdout
+        index = 0
+        completed = False
+        try:
+            while True:
+                buffer = self._pool.get()
+                view = memoryview(buffer.reshape(-1))
+                read = 0
+                while read < frame_bytes:
+                    n = stdout.readinto(view[read:])
+                    if not n:
+                        break
+                    read += n
+                if read < frame_bytes:
+                    self._pool.put(buffer)
+                    break
+                index += 1
+                yield FramePacket(index, buffer, self.clock.stamp(index), self.camera_id)
+            completed = True
+        finally:
+            if completed:
+                # EOF pe stdout: ffmpeg își termină singur ieșirea
+                try:
+                    self.process.wait(timeout=10.0)
+                except subprocess.TimeoutExpired:
+                    self.close()
+            else:
+                # Consumatorul s-a oprit mai devreme (sau eroare): oprim ffmpeg
+                self.close()
+            stdout.close()
+            drain.join(timeout=2.0)
+
+        if self.process.returncode != 0:
+            raise RuntimeError(f"ffmpeg (după {index} frame-uri, cod {self.process.returncode}): "
+                               + "\n".join(errors))
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def open_source(source: Union[str, int], backend: str = 'opencv',
+                long_side: Optional[int] = None, hwaccel: Optional[str] = None,
+                camera_id: Optional[str] = None, clock: str = 'auto',
+                start_time: Optional[datetime] = None) -> FrameSource:
+    """Deschide sursa cu backend-ul cerut.
+
+    Args:
+        source (Union[str, int]): Sursa video (path, URL sau index webcam).
+        backend (str): 'opencv' sau 'ffmpeg'.
+        long_side (Optional[int]): Latura mare a frame-urilor livrate (ex: `imgsz`).
+        hwaccel (Optional[str]): Decodare hardware, doar pentru ffmpeg.
+        camera_id (Optional[str]): ID-ul camerei, propagat în pachete.
+        clock (str): Ceasul timestamp-urilor: 'auto' (fișier → PTS, live → monoton),
+            'stream' sau 'wall'.
+        start_time (Optional[datetime]): Momentul primului frame (default: acum).
+
+    Returns:
+        FrameSource: Sursa deschisă.
+
+    Raises:
+        ValueError: Backend, ceas necunoscut sau sursă care nu poate fi deschisă.
+    """
+    if backend == 'opencv':
+        return OpenCVSource(source, long_side=long_side, camera_id=camera_id,
+                            clock=clock, start_time=start_time)
+    if backend == 'ffmpeg':
+        return FFmpegSource(source, long_side=long_side, hwaccel=hwaccel, camera_id=camera_id,
+                            clock=clock, start_time=start_time)
+    raise ValueError(f"Backend de decodare necunoscut: {backend} (disponibile: {', '.join(DECODE_BACKENDS)})")
@@ -0,0 +1,247 @@
+"""
+Scriere video asincronă: encodarea rulează pe un thread separat, nu în bucla de frame-uri.
+
+`cv2.VideoWriter.write` encodează sincron, deci timpul encoderului se adună la
+latența fiecărui frame. `AsyncVideoWriter` copiază frame-ul într-unul din cele
+`queue_size` buffer-e prealocate și îl pune într-o coadă; thread-ul writer-ului
+îl encodează și returnează buffer-ul. Când toate buffer-ele sunt ocupate
+(encoderul nu ține pasul), `write` așteaptă (frame "întârziat") sau, pentru
+surse live, aruncă frame-ul. `release` golește coada și închide encoderul.
+
+Encodere:
+
+- `OpenCVEncoder`: `cv2.VideoWriter` (implicit `mp4v`)
+- `FFmpegEncoder`: proces `ffmpeg` care primește BGR brut pe stdin, pentru
+  codec-uri mai rapide/eficiente (`libx264`, `h264_nvenc`, `hevc_vaapi`...)
+
+Example:
+    >>> writer = open_writer('output.mp4', 30, (1920, 1080), backend='ffmpeg')
+    >>> writer.write(frame)
+    >>> writer.release()
+    >>> writer.print_report()
+"""
+
+import sys
+import time
+import queue
+import shutil
+import subprocess
+import threading
+from collections import deque
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from video_sources import _drain_lines
+
+
+ENCODER_BACKENDS = ('opencv', 'ffmpeg')
+
+
+class OpenCVEncoder:
+    """Encoder sincron `cv2.VideoWriter`."""
+
+    def __init__(self, path: str, fps: float, size: Tuple[int, int], codec: str = 'mp4v'):
+        """
+        Args:
+            path: Fișierul video de output
+            fps: Frame rate-ul video-ului
+            size: (width, height)
+            codec: Codul FOURCC
+
+        Raises:
+            ValueError: Dacă writer-ul nu poate fi deschis.
+        """
+        self._writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec), fps, size)
+        if not self._writer.isOpened():
+            raise ValueError(f"Nu pot deschide writer-ul video: {path} ({codec})")
+
+    def write(self, frame: np.ndarray):
+        self._writer.write(frame)
+
+    def release(self):
+        self._writer.release()
+
+
+class FFmpegEncoder:
+    """Encoder `ffmpeg`: frame-urile BGR brute sunt scrise pe stdin-ul procesului."""
+
+    def __init__(self, path: str, fps: float, size: Tuple[int, int], codec: str = 'libx264',
+                 preset: Optional[str] = 'veryfast', ffmpeg: str = 'ffmpeg'):
+        """
+        Args:
+            path: Fișierul video de output
+            fps: Frame rate-ul video-ului
+            size: (width, height)
+            codec: Codec-ul ffmpeg (`-c:v`)
+            preset: Preset-ul encoderului (doar pentru libx264/libx265)
+            ffmpeg: Executabilul ffmpeg
+
+        Raises:
+            ValueError: Dacă ffmpeg lipsește.
+        """
+        if shutil.which(ffmpeg) is None:
+            raise ValueError(f"Nu găsesc '{ffmpeg}' în PATH")
+        width, height = size
+        cmd = [ffmpeg, '-nostdin', '-loglevel', 'error', '-y',
+               '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{width}x{height}', '-r', f'{fps:g}',
+               '-i', '-', '-an', '-c:v', codec]
+        if preset and codec in ('libx264', 'libx265'):
+            cmd += ['-preset', preset]
+        cmd += ['-pix_fmt', 'yuv420p', str(path)]
+        self.command = cmd
+        self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        # Stderr golit continuu: cu pipe-ul plin, ffmpeg s-ar bloca și `write` odată cu el
+        self._errors = deque(maxlen=20)
+        self._drain = threading.Thread(target=_drain_lines, args=(self._process.stderr, self._errors),
+                                       name='ffmpeg-encoder-stderr', daemon=True)
+        self._drain.start()
+
+    def write(self, frame: np.ndarray):
+        self._process.stdin.write(memoryview(np.ascontiguousarray(frame)).cast('B'))
+
+    def release(self):
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = self._process.wait()
+        self._drain.join(timeout=2.0)
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg (cod {returncode}): " + "\n".join(self._errors))
+
+
+class AsyncVideoWriter:
+    """Writer cu interfața `cv2.VideoWriter` (`write`/`release`), encodare pe un thread separat.
+
+    Attributes:
+        frames (int): Frame-uri primite de `write`.
+        written (int): Frame-uri encodate.
+        dropped (int): Frame-uri aruncate cu toate buffer-ele ocupate (`drop_when_full`).
+        late (int): Frame-uri pentru care `write` a așteptat un buffer liber.
+        wait_seconds (float): Timpul total de așteptare în `write`.
+        encode_seconds (float): Timpul total petrecut în encoder (pe thread-ul writer-ului).
+    """
+
+    def __init__(self, encoder, size: Tuple[int, int], queue_size: int = 8,
+                 drop_when_full: bool = False):
+        """
+        Args:
+            encoder: Encoder-ul (`OpenCVEncoder`, `FFmpegEncoder` sau orice cu `write`/`release`)
+            size: (width, height) ale frame-urilor
+            queue_size: Numărul de buffer-e prealocate (frame-uri în așteptarea encodării)
+            drop_when_full: Aruncă frame-ul în loc să aștepte când toate buffer-ele sunt ocupate
+        """
+        self.encoder = encoder
+        self.size = tuple(size)
+        self.drop_when_full = drop_when_full
+
+        self.frames = 0
+        self.written = 0
+        self.dropped = 0
+        self.late = 0
+        self.wait_seconds = 0.0
+        self.encode_seconds = 0.0
+        self.error = None
+
+        width, height = self.size
+        self._free = queue.Queue()
+        for _ in range(max(1, queue_size)):
+            self._free.put(np.empty((height, width, 3), np.uint8))
+        self._pending = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='video-writer', daemon=True)
+        self._thread.start()
+
+    def write(self, frame: np.ndarray):
+        """Copiază frame-ul într-un buffer liber și îl pune în coada de encodare.
+
+        Raises:
+            ValueError: Dacă frame-ul nu are dimensiunea writer-ului.
+            RuntimeError: Dacă encoderul a eșuat.
+        """
+        if self.error is not None:
+            raise RuntimeError(f"Encoderul video a eșuat: {self.error}") from self.error
+        self.frames += 1
+        try:
+            buffer = self._free.get_nowait()
+        except queue.Empty:
+            if self.drop_when_full:
+                self.dropped += 1
+                return
+            self.late += 1
+            start = time.perf_counter()
+            buffer = self._free.get()
+            self.wait_seconds += time.perf_counter() - start
+
+        if frame.shape != buffer.shape:
+            self._free.put(buffer)
+            raise ValueError(f"Frame {frame.shape} diferit de dimensiunea writer-ului {buffer.shape}")
+        np.copyto(buffer, frame)
+        self._pending.put(buffer)
+
+    def _run(self):
+        while True:
+            buffer = self._pending.get()
+            if buffer is None:
+                break
+            if self.error is None:
+                start = time.perf_counter()
+                try:
+                    self.encoder.write(buffer)
+                    self.written += 1
+                except Exception as e:
+                    self.error = e
+                self.encode_seconds += time.perf_counter() - start
+            self._free.put(buffer)
+
+    def release(self):
+        """Encodează frame-urile rămase în coadă și închide encoderul (o singură dată)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._pending.put(None)
+        self._thread.join()
+        self.encoder.release()
+
+    def print_report(self, file=None):
+        """Afișează frame-urile scrise, aruncate și întârziate."""
+        per_frame = 1000.0 * self.encode_seconds / self.written if self.written else 0.0
+        line = (f"\n🎬 Writer video: {self.written}/{self.frames} frame-uri scrise, "
+                f"{self.dropped} aruncate, {self.late} întârziate "
+                f"(așteptare {1000.0 * self.wait_seconds:.0f} ms), encodare {per_frame:.1f} ms/frame")
+        if self.error is not None:
+            line += f"\n  • eroare: {self.error}"
+        print(line, file=file or sys.stdout)
+
+
+def open_writer(path: str, fps: float, size: Tuple[int, int], backend: str = 'opencv',
+                codec: Optional[str] = None, queue_size: int = 8,
+                drop_when_full: bool = False) -> AsyncVideoWriter:
+    """Deschide un writer asincron cu encoderul cerut.
+
+    Args:
+        path (str): Fișierul video de output.
+        fps (float): Frame rate-ul video-ului (0 = 30).
+        size (Tuple[int, int]): (width, height).
+        backend (str): 'opencv' sau 'ffmpeg'.
+        codec (Optional[str]): FOURCC pentru opencv (default 'mp4v'), `-c:v` pentru
+            ffmpeg (default 'libx264').
+        queue_size (int): Buffer-e prealocate între bucla de frame-uri și encoder.
+        drop_when_full (bool): Aruncă frame-urile când encoderul rămâne în urmă.
+
+    Returns:
+        AsyncVideoWriter: Writer-ul pornit.
+
+    Raises:
+        ValueError: Backend necunoscut sau writer care nu poate fi deschis.
+    """
+    fps = fps or 30.0
+    if backend == 'opencv':
+        encoder = OpenCVEncoder(path, fps, size, codec or 'mp4v')
+    elif backend == 'ffmpeg':
+        encoder = FFmpegEncoder(path, fps, size, codec or 'libx264')
+    else:
+        raise ValueError(f"Encoder necunoscut: {backend} (disponibile: {', '.join(ENCODER_BACKENDS)})")
+    return AsyncVideoWriter(encoder, size, queue_size=queue_size, drop_when_full=drop_when_full)
@@ -0,0 +1,234 @@
+"""
+Deduplicare și debouncing pentru violări: evenimente start / ongoing / end.
+
+`ZoneMonitor.check_violations` raportează aceeași violare la fiecare frame
+cât timp condiția persistă. `ViolationDebouncer` ține starea fiecărei violări
+(cheie: track_id sau celulă spațială, zonă, tip) și emite doar tranzițiile:
+
+- `start`: condiția a persistat `open_after` secunde (și cooldown-ul a expirat)
+- `ongoing`: reamintire la fiecare `ongoing_interval` secunde cât e activă
+- `end`: condiția lipsește de `close_after` secunde
+
+Starea e bounded: cheile nevăzute de `close_after` secunde sunt închise și
+eliminate, cooldown-urile expirate sunt șterse, iar peste `max_keys` cele mai
+vechi chei sunt închise forțat.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from zone_monitor import ZoneViolation
+
+
+class ViolationEvent:
+    """O tranziție a unei violări (start, ongoing sau end).
+
+    Attributes:
+        event (str): 'start', 'ongoing' sau 'end'.
+        key (tuple): Cheia violării (subiect, zone_id, violation_type).
+        violation (ZoneViolation): Ultima violare observată pentru cheie.
+        started_at (datetime): Momentul evenimentului `start`.
+        timestamp (datetime): Momentul evenimentului (pentru `end`: ultima observare).
+        frames (int): Frame-uri în care violarea a fost observată de la start.
+    """
+
+    __slots__ = ('event', 'key', 'violation', 'started_at', 'timestamp', 'frames')
+
+    def __init__(self, event: str, key: Tuple, violation: ZoneViolation,
+                 started_at: datetime, timestamp: datetime, frames: int):
+        self.event = event
+        self.key = key
+        self.violation = violation
+        self.started_at = started_at
+        self.timestamp = timestamp
+        self.frames = frames
+
+    @property
+    def duration(self) -> float:
+        """Secunde de la `start` până la acest eveniment."""
+        return (self.timestamp - self.started_at).total_seconds()
+
+    def to_dict(self) -> Dict:
+        """Violarea serializată plus câmpurile evenimentului (compatibil JSON)."""
+        data = self.violation.to_dict()
+        data.update({
+            'event': self.event,
+            'started_at': self.started_at.isoformat(),
+            'timestamp': self.timestamp.isoformat(),
+            'duration': round(self.duration, 3),
+            'frames': self.frames,
+        })
+        return data
+
+    def __repr__(self) -> str:
+        return (f"ViolationEvent({self.event!r}, {self.violation.violation_type!r}, "
+                f"zone={self.violation.zone_id!r}, duration={self.duration:.1f}s)")
+
+
+class _KeyState:
+    """Starea unei chei: prima/ultima observare și dacă e deschisă."""
+
+    __slots__ = ('first_seen', 'last_seen', 'last_event', 'started_at',
+                 'frames', 'active', 'violation')
+
+    def __init__(self, now: datetime, violation: ZoneViolation):
+        self.first_seen = now
+        self.last_seen = now
+        self.last_event = None
+        self.started_at = None
+        self.frames = 0
+        self.active = False
+        self.violation = violation
+
+
+class ViolationDebouncer:
+    """Transformă violările per frame în evenimente start / ongoing / end.
+
+    Example:
+        >>> debouncer = ViolationDebouncer(open_after=0.5, close_after=2.0, cooldown=10.0)
+        >>> for frame in stream:
+        ...     violations = monitor.check_violations(detections, current_time=now)
+        ...     for event in debouncer.update(violations, now):
+        ...         print(event.event, event.violation.message)
+        >>> final_events = debouncer.flush()
+    """
+
+    def __init__(self,
+                 open_after: float = 0.5,
+                 close_after: float = 2.0,
+                 cooldown: float = 10.0,
+                 ongoing_interval: Optional[float] = 30.0,
+                 cell_size: int = 64,
+                 max_keys: int = 10000):
+        """
+        Args:
+            open_after: Secunde de prezență continuă până la `start` (0 = imediat)
+            close_after: Secunde de absență până la `end` (gap-urile mai scurte sunt ignorate)
+            cooldown: Secunde după `end` în care aceeași cheie nu poate emite un nou `start`
+            ongoing_interval: Secunde între evenimentele `ongoing` (None = dezactivat)
+            cell_size: Latura celulei spațiale (pixeli) pentru detectările fără track_id
+            max_keys: Numărul maxim de chei ținute în memorie
+        """
+        self.open_after = timedelta(seconds=open_after)
+        self.close_after = timedelta(seconds=close_after)
+        self.cooldown = timedelta(seconds=cooldown)
+        self.ongoing_interval = timedelta(seconds=ongoing_interval) if ongoing_interval else None
+        self.cell_size = cell_size
+        self.max_keys = max_keys
+
+        # Ordonate după ultima observare / expirare: cele vechi sunt mereu la început
+        self._states: 'OrderedDict[Tuple, _KeyState]' = OrderedDict()
+        self._cooldowns: 'OrderedDict[Tuple, datetime]' = OrderedDict()
+
+    def key_for(self, violation: ZoneViolation) -> Tuple[Hashable, str, str]:
+        """Cheia de deduplicare: track_id sau celula centrului, zona, tipul violării."""
+        detection = violation.detection
+        if detection is None:
+            subject = None
+        elif detection.track_id is not None:
+            subject = ('track', int(detection.track_id))
+        else:
+            cx, cy = detection.center
+            subject = ('cell', cx // self.cell_size, cy // self.cell_size)
+        return (subject, violation.zone_id, violation.violation_type)
+
+    def update(self, violations: Iterable[ZoneViolation],
+               current_time: Optional[datetime] = None) -> List[ViolationEvent]:
+        """Procesează violările unui frame și returnează evenimentele rezultate.
+
+        Args:
+            violations: Violările frame-ului (de la `check_violations`); violările cu
+                aceeași cheie sunt numărate o singură dată.
+            current_time: Timestamp-ul frame-ului (default: acum).
+
+        Returns:
+            List[ViolationEvent]: Evenimentele `end` pentru cheile expirate, apoi
+            `start`/`ongoing` pentru violările frame-ului.
+        """
+        now = current_time or datetime.now()
+        events = self._expire(now)
+
+        # O cheie contează o singură dată per frame (ex: două PPE lipsă în aceeași
+        # celulă); rămâne ultima ei violare
+        by_key: Dict[Tuple, ZoneViolation] = {}
+        for violation in violations:
+            by_key[self.key_for(violation)] = violation
+
+        for key, violation in by_key.items():
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _KeyState(now, violation)
+            else:
+                self._states.move_to_end(key)
+                state.last_seen = now
+                state.violation = violation
+            state.frames += 1
+
+            if not state.active:
+                if now - state.first_seen >= self.open_after and not self._cooling_down(key, now):
+                    state.active = True
+                    state.started_at = state.last_event = now
+                    state.frames = 1
+                    events.append(ViolationEvent('start', key, violation, now, now, 1))
+            elif self.ongoing_interval is not None and now - state.last_event >= self.ongoing_interval:
+                state.last_event = now
+                events.append(ViolationEvent('ongoing', key, violation, state.started_at,
+                                             now, state.frames))
+
+        # Limita de memorie: cele mai vechi chei sunt închise forțat
+        while len(self._states) > self.max_keys:
+            key, state = self._states.popitem(last=False)
+            events.extend(self._close(key, state, now))
+
+        return events
+
+    def flush(self) -> List[ViolationEvent]:
+        """Închide toate violările active (ex: la sfârșitul stream-ului)."""
+        events = []
+        while self._states:
+            key, state = self._states.popitem(last=False)
+            events.extend(self._close(key, state, state.last_seen))
+        self._cooldowns.clear()
+        return events
+
+    def _expire(self, now: datetime) -> List[ViolationEvent]:
+        """Închide cheile nevăzute de `close_after` și șterge cooldown-urile expirate."""
+        events = []
+        while self._states:
+            key, state = next(iter(self._states.items()))
+            if now - state.last_seen <= self.close_after:
+                break
+            del self._states[key]
+            events.extend(self._close(key, state, state.last_seen))
+
+        while self._cooldowns:
+            key, until = next(iter(self._cooldowns.items()))
+            if until > now:
+                break
+            del self._cooldowns[key]
+        return events
+
+    def _close(self, key: Tuple, state: _KeyState, ended_at: datetime) -> List[ViolationEvent]:
+        if not state.active:
+            return []
+        if self.cooldown:
+            self._cooldowns.pop(key, None)
+            self._cooldowns[key] = ended_at + self.cooldown
+            while len(self._cooldowns) > self.max_keys:
+                self._cooldowns.popitem(last=False)
+        return [ViolationEvent('end', key, state.violation, state.started_at,
+                               ended_at, state.frames)]
+
+    def _cooling_down(self, key: Tuple, now: datetime) -> bool:
+        until = self._cooldowns.get(key)
+        return until is not None and until > now
+
+    @property
+    def active_count(self) -> int:
+        """Numărul de violări deschise (după ultimul `update`)."""
+        return sum(1 for state in self._states.values() if state.active)
+
+    def __len__(self) -> int:
+        """Numărul de chei ținute în memorie (stări + cooldown-uri)."""
+        return len(self._states) + len(self._cooldowns)
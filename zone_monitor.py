@@ -3,19 +3,28 @@ Modul pentru monitorizarea zonelor de interes (ROI)
 Verifică dacă detectările sunt în poligoane și aplică reguli specifice.
 """
 
+import re
 import cv2
+import heapq
 import numpy as np
 import json
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union, Iterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+from frame_clock import MonotonicClock
 
-@dataclass
+
+@dataclass(init=False)
 class Detection:
     """Reprezintă o detecție YOLO cu informații despre locație și clasă.
     
+    Dataclass cu `__slots__` declarat explicit (fără `__dict__` per instanță),
+    ca să fie ieftin de alocat când e nevoie de câte un obiect per detecție.
+    Default-ul lui `track_id` e în `__init__`, fiindcă `dataclass(slots=True)`
+    cere Python 3.10.
+    
     Attributes:
         bbox (Tuple[int, int, int, int]): Bounding box (x1, y1, x2, y2).
         class_name (str): Numele clasei detectate.
@@ -26,10 +35,23 @@ class Detection:
         >>> det = Detection(bbox=(100, 100, 200, 200), class_name='person', confidence=0.95)
         >>> print(det.center)  # (150, 150)
     """
+    
+    __slots__ = ('bbox', 'class_name', 'confidence', 'track_id')
+    
     bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2
     class_name: str
     confidence: float
-    track_id: Optional[int] = None
+    track_id: Optional[int]
+    
+    def __init__(self,
+                 bbox: Tuple[int, int, int, int],
+                 class_name: str,
+                 confidence: float,
+                 track_id: Optional[int] = None):
+        self.bbox = bbox
+        self.class_name = class_name
+        self.confidence = confidence
+        self.track_id = track_id
     
     @property
     def center(self) -> Tuple[int, int]:
@@ -42,66 +64,494 @@ class Detection:
         return (int((x1 + x2) / 2), int((y1 + y2) / 2))
 
 
-@dataclass
+class DetectionBatch:
+    """Detectările unui frame în format columnar (array-uri NumPy contigue).
+    
+    Înlocuiește lista de obiecte `Detection` în bucla de frame: datele vin din
+    model printr-un singur transfer device→host, iar centrele se calculează
+    vectorizat. `batch[i]` returnează un `Detection` pentru codul care lucrează
+    per obiect (ex: `ZoneViolation.detection`).
+    
+    Attributes:
+        boxes (np.ndarray): Array (N, 4) int32 cu bounding box-urile (x1, y1, x2, y2).
+        confidences (np.ndarray): Array (N,) float32 cu scorurile de încredere.
+        class_ids (np.ndarray): Array (N,) int32 cu id-urile claselor.
+        track_ids (np.ndarray): Array (N,) int64 cu ID-urile de tracking (-1 = fără).
+        names (dict): Maparea {class_id: class_name}.
+    
+    Example:
+        >>> batch = DetectionBatch.from_yolo(results, model.names)
+        >>> violations = monitor.check_violations(batch)
+        >>> print(batch.centers[:3])
+    """
+    
+    def __init__(self,
+                 boxes: np.ndarray,
+                 confidences: np.ndarray,
+                 class_ids: np.ndarray,
+                 names: Dict[int, str],
+                 track_ids: Optional[np.ndarray] = None):
+        """
+        Args:
+            boxes: Bounding box-uri (N, 4); coordonatele float sunt trunchiate la int
+            confidences: Scorurile de încredere (N,)
+            class_ids: Id-urile claselor (N,)
+            names: Maparea {class_id: class_name} (ex: `model.names`)
+            track_ids: ID-urile de tracking (N,), -1 = fără tracking
+        """
+        self.boxes = np.ascontiguousarray(np.asarray(boxes).reshape(-1, 4), dtype=np.int32)
+        self.confidences = np.ascontiguousarray(confidences, dtype=np.float32).reshape(-1)
+        self.class_ids = np.ascontiguousarray(class_ids, dtype=np.int32).reshape(-1)
+        self.names = names
+        if track_ids is None:
+            self.track_ids = np.full(len(self.boxes), -1, dtype=np.int64)
+        else:
+            self.track_ids = np.ascontiguousarray(track_ids, dtype=np.int64).reshape(-1)
+        self._centers = None
+        self._detections = None  # Obiectele originale, dacă batch-ul vine din from_detections
+    
+    @classmethod
+    def from_array(cls, data: np.ndarray, names: Dict[int, str]) -> 'DetectionBatch':
+        """Creează batch-ul din array-ul `boxes.data` al Ultralytics.
+        
+        Acceptă formatul (N, 6) `x1, y1, x2, y2, conf, cls` și formatul cu
+        tracking (N, 7) `x1, y1, x2, y2, track_id, conf, cls`.
+        """
+        data = np.asarray(data, dtype=np.float32)
+        if data.shape[-1] == 7:
+            return cls(data[:, :4], data[:, 5], data[:, 6], names, track_ids=data[:, 4])
+        return cls(data[:, :4], data[:, 4], data[:, 5], names)
+    
+    @classmethod
+    def from_yolo(cls, results, names: Dict[int, str]) -> 'DetectionBatch':
+        """Creează batch-ul dintr-un rezultat YOLO, cu un singur transfer device→host.
+        
+        Args:
+            results: Rezultatul Ultralytics pentru un frame (`model(frame)[0]`).
+            names (Dict[int, str]): Maparea claselor (`model.names`).
+        """
+        return cls.from_array(results.boxes.data.cpu().numpy(), names)
+    
+    @classmethod
+    def from_detections(cls, detections: List[Detection]) -> 'DetectionBatch':
+        """Creează batch-ul dintr-o listă de `Detection` (API-ul per obiect).
+        
+        `batch[i]` returnează apoi exact obiectele originale.
+        """
+        name_ids = {}
+        class_ids = [name_ids.setdefault(det.class_name, len(name_ids)) for det in detections]
+        batch = cls(
+            boxes=np.array([det.bbox for det in detections], dtype=np.int32).reshape(-1, 4),
+            confidences=np.array([det.confidence for det in detections], dtype=np.float32),
+            class_ids=np.array(class_ids, dtype=np.int32),
+            names={class_id: name for name, class_id in name_ids.items()},
+            track_ids=np.array([-1 if det.track_id is None else det.track_id
+                                for det in detections], dtype=np.int64)
+        )
+        batch._detections = list(detections)
+        return batch
+    
+    @property
+    def centers(self) -> np.ndarray:
+        """Centrele bounding box-urilor, array (N, 2) int32 (calculat o singură dată)."""
+        if self._centers is None:
+            self._centers = ((self.boxes[:, :2] + self.boxes[:, 2:]) / 2).astype(np.int32)
+        return self._centers
+    
+    def select(self, index: np.ndarray) -> 'DetectionBatch':
+        """Returnează un sub-batch (mască booleană sau array de indici)."""
+        subset = DetectionBatch(self.boxes[index], self.confidences[index],
+                                self.class_ids[index], self.names,
+                                track_ids=self.track_ids[index])
+        if self._detections is not None:
+            positions = np.arange(len(self))[index]
+            subset._detections = [self._detections[i] for i in positions]
+        return subset
+    
+    def __len__(self) -> int:
+        return len(self.boxes)
+    
+    def __getitem__(self, i: int) -> Detection:
+        """Returnează detecția `i` ca `Detection`."""
+        if self._detections is not None:
+            return self._detections[i]
+        track_id = int(self.track_ids[i])
+        return Detection(
+            bbox=tuple(int(v) for v in self.boxes[i]),
+            class_name=self.names[int(self.class_ids[i])],
+            confidence=float(self.confidences[i]),
+            track_id=track_id if track_id >= 0 else None
+        )
+    
+    def __iter__(self) -> Iterator[Detection]:
+        for i in range(len(self)):
+            yield self[i]
+
+
 class ZoneViolation:
     """Reprezintă o violare a regulilor unei zone de monitorizare.
     
+    Folosește `__slots__` (fără `__dict__` per instanță), iar mesajul e
+    construit leneș, la primul acces la `message` (desenare sau logare), din
+    `violation_type`, `zone_name` și `details`.
+    
     Attributes:
         zone_id (str): ID-ul unic al zonei.
         zone_name (str): Numele zonei.
         violation_type (str): Tipul violării ('missing_ppe', 'dwell_time_exceeded', 'restricted_access').
         detection (Detection): Detecția care a cauzat violarea.
-        message (str): Mesaj descriptiv pentru violarea.
+        message (str): Mesaj descriptiv pentru violarea (generat la cerere).
         timestamp (datetime): Momentul în care a fost detectată violarea.
         severity (str): Severitatea violării ('low', 'medium', 'high').
+        details (tuple): Datele mesajului: PPE-urile lipsă pentru 'missing_ppe',
+            (dwell_time, max_dwell) pentru 'dwell_time_exceeded'.
+    """
+    
+    __slots__ = ('zone_id', 'zone_name', 'violation_type', 'detection',
+                 'timestamp', 'severity', 'details', '_message')
+    
+    def __init__(self,
+                 zone_id: str,
+                 zone_name: str,
+                 violation_type: str,
+                 detection: Detection,
+                 message: Optional[str] = None,
+                 timestamp: Optional[datetime] = None,
+                 severity: str = 'high',
+                 details: tuple = ()):
+        self.zone_id = zone_id
+        self.zone_name = zone_name
+        self.violation_type = violation_type
+        self.detection = detection
+        self.timestamp = timestamp
+        self.severity = severity  # 'low', 'medium', 'high'
+        self.details = details
+        self._message = message
+    
+    @property
+    def message(self) -> str:
+        """Mesajul descriptiv, generat la primul acces și apoi memorat."""
+        if self._message is None:
+            self._message = self._render_message()
+        return self._message
+    
+    def _render_message(self) -> str:
+        """Construiește mesajul din tipul violării și `details`."""
+        if self.violation_type == 'missing_ppe':
+            return f"PPE lipsă în {self.zone_name}: {', '.join(self.details)}"
+        if self.violation_type == 'dwell_time_exceeded':
+            dwell_time, max_dwell = self.details
+            return f"Timp depășit în {self.zone_name}: {int(dwell_time)}s / {max_dwell}s"
+        if self.violation_type == 'restricted_access':
+            return f"Acces neautorizat în {self.zone_name}"
+        return f"{self.violation_type} în {self.zone_name}"
+    
+    def to_dict(self) -> Dict:
+        """Serializează violarea într-un dict compatibil JSON (ex: pentru JSON lines).
+        
+        Returns:
+            Dict: Câmpurile violării, cu timestamp ISO 8601 și datele detecției.
+        """
+        data = {
+            'zone_id': self.zone_id,
+            'zone_name': self.zone_name,
+            'violation_type': self.violation_type,
+            'severity': self.severity,
+            'message': self.message,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
+            'details': [v if isinstance(v, str) else float(v) for v in self.details],
+        }
+        if self.detection is not None:
+            data.update({
+                'bbox': [int(v) for v in self.detection.bbox],
+                'class_name': self.detection.class_name,
+                'confidence': round(float(self.detection.confidence), 4),
+                'track_id': self.detection.track_id,
+            })
+        return data
+    
+    def _key(self) -> tuple:
+        return (self.zone_id, self.zone_name, self.violation_type, self.detection,
+                self.message, self.timestamp, self.severity)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ZoneViolation):
+            return NotImplemented
+        return self._key() == other._key()
+    
+    def __repr__(self) -> str:
+        return (f"ZoneViolation(zone_id={self.zone_id!r}, violation_type={self.violation_type!r}, "
+                f"severity={self.severity!r}, detection={self.detection!r}, "
+                f"timestamp={self.timestamp!r})")
+
+
+# Clase YOLO considerate persoane (comparate după normalizare, vezi ClassRoles)
+PERSON_CLASSES = ['person']
+
+# Prefix pentru clasele negative (ex: 'no_helmet', 'NO-Hardhat')
+NEGATIVE_PREFIX = 'no_'
+
+
+class ClassRoles:
+    """Tabel precompilat class id → rol, pentru lookup-uri întregi în bucla de frame.
+    
+    Numele claselor sunt normalizate o singură dată (lowercase, spații și '-'
+    devin '_') și comparate exact cu aliasurile, deci 'no_glove' nu mai e
+    confundat cu 'glove'. Clasele cu prefixul `NEGATIVE_PREFIX` primesc rolul
+    ROLE_NO_PPE pentru tipul PPE corespunzător.
+    
+    Attributes:
+        names (dict): Maparea originală {class_id: class_name} (ex: `model.names`).
+        ppe_types (List[str]): Tipurile PPE, în ordinea din `ppe_classes`.
+        role (np.ndarray): Array int8 indexat după class id, cu valori ROLE_*.
+        ppe_type (np.ndarray): Array int16 cu indexul în `ppe_types` (-1 = niciunul).
+    
+    Example:
+        >>> roles = ClassRoles(model.names, ZoneMonitor.PPE_CLASSES)
+        >>> roles.role[6] == ClassRoles.ROLE_NO_PPE  # 'no_helmet'
+        True
+    """
+    
+    ROLE_IGNORE = 0
+    ROLE_PERSON = 1
+    ROLE_PPE = 2
+    ROLE_NO_PPE = 3
+    
+    def __init__(self,
+                 names: Dict[int, str],
+                 ppe_classes: Dict[str, List[str]],
+                 person_classes: List[str] = PERSON_CLASSES):
+        """
+        Args:
+            names: Maparea {class_id: class_name} a modelului
+            ppe_classes: Maparea {tip_ppe: [aliasuri clasă]}
+            person_classes: Aliasurile pentru clasa persoană
+        """
+        if isinstance(names, (list, tuple)):
+            names = dict(enumerate(names))
+        self.names = names
+        self.ppe_types = list(ppe_classes)
+        
+        size = max(self.names, default=-1) + 1
+        self.role = np.full(size, self.ROLE_IGNORE, dtype=np.int8)
+        self.ppe_type = np.full(size, -1, dtype=np.int16)
+        
+        for class_id, class_name in self.names.items():
+            role, ppe_type = self.resolve(class_name, ppe_classes, person_classes)
+            self.role[class_id] = role
+            self.ppe_type[class_id] = self.ppe_types.index(ppe_type) if ppe_type else -1
+    
+    @staticmethod
+    def normalize(class_name: str) -> str:
+        """Normalizează un nume de clasă ('NO-Safety Vest' -> 'no_safety_vest')."""
+        return re.sub(r'[\s\-]+', '_', class_name.strip().lower())
+    
+    @classmethod
+    def resolve(cls,
+                class_name: str,
+                ppe_classes: Dict[str, List[str]],
+                person_classes: List[str] = PERSON_CLASSES) -> Tuple[int, Optional[str]]:
+        """Determină rolul unei clase după nume.
+        
+        Args:
+            class_name (str): Numele clasei YOLO.
+            ppe_classes (Dict[str, List[str]]): Maparea {tip_ppe: [aliasuri]}.
+            person_classes (List[str]): Aliasurile pentru persoană.
+            
+        Returns:
+            Tuple[int, Optional[str]]: (rol ROLE_*, tip PPE sau None).
+        """
+        key = cls.normalize(class_name)
+        negative = key.startswith(NEGATIVE_PREFIX)
+        base = key[len(NEGATIVE_PREFIX):] if negative else key
+        
+        if base in {cls.normalize(name) for name in person_classes}:
+            return (cls.ROLE_IGNORE if negative else cls.ROLE_PERSON), None
+        
+        for ppe_type, aliases in ppe_classes.items():
+            if base in {cls.normalize(name) for name in aliases}:
+                return (cls.ROLE_NO_PPE if negative else cls.ROLE_PPE), ppe_type
+        
+        return cls.ROLE_IGNORE, None
+
+
+# Secunde fără observare după care un track a ieșit din zonă: acoperă ocluziuni,
+# detectări ratate și camere cu fps mic, fără să reseteze timpul de staționare
+DEFAULT_EXIT_TIMEOUT = 30.0
+
+# Ceasul implicit comun: `ZoneTracker` și `ZoneMonitor` fără timp explicit folosesc
+# aceeași bază (monotonă, exprimată ca datetime apropiat de ora reală)
+DEFAULT_CLOCK = MonotonicClock()
+
+
+def to_seconds(t: Union[datetime, float, None]) -> float:
+    """Convertește un timestamp (datetime sau secunde float) în secunde float.
+    
+    Args:
+        t (Union[datetime, float, None]): Timestamp-ul; None = `DEFAULT_CLOCK.now()`,
+            aceeași bază ca `ZoneMonitor.check_violations` fără `current_time`.
+        
+    Returns:
+        float: Secunde (epoch pentru datetime, altfel valoarea primită).
     """
-    zone_id: str
-    zone_name: str
-    violation_type: str
-    detection: Detection
-    message: str
-    timestamp: datetime
-    severity: str  # 'low', 'medium', 'high'
+    if t is None:
+        t = DEFAULT_CLOCK.now()
+    if isinstance(t, datetime):
+        return t.timestamp()
+    return float(t)
 
 
 class ZoneTracker:
     """Tracking pentru timpul petrecut de obiecte în zone.
     
     Menține evidența momentului în care fiecare obiect tracked a intrat într-o zonă
-    și calculează timpul de staționare.
+    și calculează timpul de staționare. Timpii sunt secunde float (`datetime` convertit
+    la epoch, timpul video sau `DEFAULT_CLOCK` când lipsesc); toate apelurile unui
+    tracker trebuie să folosească aceeași bază.
+    
+    Un min-heap după ultima observare găsește în O(log n) perechile (track, zonă)
+    nevăzute de `exit_timeout` secunde, care sunt tratate ca ieșiri din zonă și
+    eliminate. Fiecare pereche are o singură intrare în heap, reprogramată
+    leneș la scoatere, deci memoria e proporțională cu perechile active.
+    
+    Opțional, starea e persistată incremental printr-un store (vezi
+    `tracker_store.SqliteTrackerStore`), ca un restart să nu reseteze timpii.
     
     Attributes:
         zone_entries (dict): Dicționar {(track_id, zone_id): entry_time}.
+        last_seen (dict): Dicționar {(track_id, zone_id): ultima observare}.
+        exit_timeout (float): Secunde fără observare după care obiectul a ieșit din zonă.
+        store (Optional[SqliteTrackerStore]): Backend-ul de persistență.
     
     Example:
-        >>> tracker = ZoneTracker()
-        >>> dwell_time = tracker.update(track_id=5, zone_id='zone_1', current_time=datetime.now())
+        >>> tracker = ZoneTracker(exit_timeout=30.0)
+        >>> dwell_time = tracker.update(track_id=5, zone_id='zone_1')
         >>> print(f"Timp în zonă: {dwell_time:.1f}s")
+        >>> for track_id, zone_id, dwell in tracker.expire():
+        ...     print(f"Track {track_id} a ieșit din {zone_id} după {dwell:.1f}s")
     """
     
-    def __init__(self):
-        """Inițializează tracker-ul cu un dicționar gol."""
+    def __init__(self, exit_timeout: float = DEFAULT_EXIT_TIMEOUT):
+        """Inițializează tracker-ul cu dicționare și heap goale.
+        
+        Args:
+            exit_timeout: Secunde fără observare până la ieșirea din zonă
+        """
+        self.exit_timeout = exit_timeout
         self.zone_entries = {}  # {(track_id, zone_id): entry_time}
+        self.last_seen = {}     # {(track_id, zone_id): last_seen}
+        self._heap = []         # [(last_seen la programare, (track_id, zone_id))]
+        self._scheduled = set()
+        self._latest = None
+        self.store = None
+        self._restore_gap = None  # Setat de attach_store până la primul timp văzut
     
-    def update(self, track_id: int, zone_id: str, current_time: datetime) -> Optional[float]:
+    def attach_store(self, store, max_gap: float = 60.0):
+        """Persistă modificările de acum înainte; starea salvată e restaurată la primul frame.
+        
+        Restaurarea are loc la primul `update`/`expire`, cu timpul acelui frame
+        (aceeași bază de timp ca restul apelurilor, ex: ceasul sursei din
+        `check_violations`). Perechile restaurate primesc ultima observare = acel
+        timp, deci au `exit_timeout` secunde să fie văzute din nou. Intrările
+        salvate într-o bază de timp incompatibilă (mai vechi de `max_gap` sau din
+        viitor, ex: alt `--start-time`) sunt ignorate.
+        
+        Args:
+            store (SqliteTrackerStore): Backend-ul de persistență.
+            max_gap (float): Intrările nevăzute de mai mult (ex: oprire lungă) sunt ignorate.
+        """
+        self.store = store
+        self._restore_gap = max_gap
+    
+    def _restore(self, now: float) -> int:
+        """Încarcă intrările salvate, în baza de timp a primului frame."""
+        max_gap, self._restore_gap = self._restore_gap, None
+        restored = 0
+        for key, (entry_time, last_seen) in self.store.load_entries(now, max_gap).items():
+            self.zone_entries[key] = min(entry_time, now)
+            self.last_seen[key] = now
+            if key not in self._scheduled:
+                heapq.heappush(self._heap, (now, key))
+                self._scheduled.add(key)
+            restored += 1
+        return restored
+    
+    def close(self):
+        """Scrie starea rămasă în store și îl închide."""
+        if self.store is not None:
+            self.store.close(self)
+            self.store = None
+    
+    def update(self, track_id: int, zone_id: str,
+               current_time: Union[datetime, float, None] = None) -> Optional[float]:
         """Actualizează tracking-ul și returnează timpul petrecut în zonă.
         
         Args:
             track_id (int): ID-ul obiectului tracked.
             zone_id (str): ID-ul zonei.
-            current_time (datetime): Timestamp-ul curent.
+            current_time (Union[datetime, float, None]): Timestamp-ul curent
+                (secunde float sau datetime; default: `DEFAULT_CLOCK`).
             
         Returns:
             Optional[float]: Timpul petrecut în zonă în secunde, sau 0 la prima intrare.
         """
+        now = to_seconds(current_time)
+        if self._restore_gap is not None:
+            self._restore(now)
         key = (track_id, zone_id)
+        self.last_seen[key] = now
+        if self._latest is None or now > self._latest:
+            self._latest = now
+        
+        if key not in self._scheduled:
+            heapq.heappush(self._heap, (now, key))
+            self._scheduled.add(key)
         
         if key not in self.zone_entries:
-            self.zone_entries[key] = current_time
+            self.zone_entries[key] = now
             return 0.0
         
-        dwell_time = (current_time - self.zone_entries[key]).total_seconds()
-        return dwell_time
+        return now - self.zone_entries[key]
+    
+    def expire(self, current_time: Union[datetime, float, None] = None,
+               timeout: Optional[float] = None) -> List[Tuple[int, str, float]]:
+        """Elimină perechile nevăzute de `timeout` secunde (ieșiri din zonă).
+        
+        Scoate din heap doar intrările scadente: O(log n) amortizat per pereche.
+        
+        Args:
+            current_time (Union[datetime, float, None]): Timestamp-ul curent.
+            timeout (Optional[float]): Default: `exit_timeout`.
+            
+        Returns:
+            List[Tuple[int, str, float]]: (track_id, zone_id, timp petrecut) pentru fiecare ieșire.
+        """
+        now = to_seconds(current_time)
+        if self._restore_gap is not None:
+            self._restore(now)
+        timeout = self.exit_timeout if timeout is None else timeout
+        exits = []
+        
+        while self._heap and self._heap[0][0] + timeout < now:
+            _, key = heapq.heappop(self._heap)
+            last_seen = self.last_seen.get(key)
+            if last_seen is None:
+                self._scheduled.discard(key)  # Eliminat deja cu remove()
+                continue
+            if last_seen + timeout >= now:
+                heapq.heappush(self._heap, (last_seen, key))  # Văzut între timp: reprogramează
+                continue
+            
+            self._scheduled.discard(key)
+            entry_time = self.zone_entries.pop(key, last_seen)
+            del self.last_seen[key]
+            if self.store is not None:
+                self.store.delete(key)
+            exits.append((key[0], key[1], last_seen - entry_time))
+        
+        if self.store is not None:
+            self.store.maybe_flush(now, self)
+        return exits
     
     def remove(self, track_id: int, zone_id: str):
         """Elimină tracking-ul când obiectul părăsește zona.
@@ -111,25 +561,70 @@ class ZoneTracker:
             zone_id (str): ID-ul zonei.
         """
         key = (track_id, zone_id)
-        if key in self.zone_entries:
-            del self.zone_entries[key]
+        self.zone_entries.pop(key, None)
+        self.last_seen.pop(key, None)
+        if self.store is not None:
+            self.store.delete(key)
     
     def cleanup_old_entries(self, max_age_seconds: int = 300):
-        """Curăță entry-urile vechi pentru a elibera memorie.
+        """Curăță entry-urile nevăzute de `max_age_seconds` față de ultima observare.
         
         Args:
             max_age_seconds (int): Vechimea maximă în secunde (default: 300 = 5 minute).
         """
-        current_time = datetime.now()
-        to_remove = []
-        
-        for key, entry_time in self.zone_entries.items():
-            age = (current_time - entry_time).total_seconds()
-            if age > max_age_seconds:
-                to_remove.append(key)
-        
-        for key in to_remove:
-            del self.zone_entries[key]
+        if self._latest is not None:
+            self.expire(self._latest, timeout=max_age_seconds)
+    
+    def __len__(self) -> int:
+        """Numărul de perechi (track, zonă) urmărite."""
+        return len(self.zone_entries)
+
+
+def _output_buffer(image: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+    """Destinația unei funcții de desenare: copie nouă, in-place sau buffer reutilizat."""
+    if out is None:
+        return image.copy()
+    if out is not image:
+        np.copyto(out, image)
+    return out
+
+
+class ZoneOverlay:
+    """Overlay-ul zonelor pre-randat, decupat la dreptunghiul care conține zonele.
+
+    Pentru fiecare pixel, rezultatul lui `draw_zones` e o funcție afină de
+    pixelul original: `original * pondere + culoare` (fill = blend cu o culoare
+    fixă, contur/etichetă = culoarea lor, în afara zonelor = neschimbat).
+    Ponderea și culoarea sunt precalculate ca straturi uint8, deci la fiecare
+    frame rămâne un singur blend mascat pe dreptunghi (două operații OpenCV).
+
+    Attributes:
+        key (tuple): (height, width, alpha, show_labels) pentru care e valid.
+        rect (Tuple[int, int, int, int]): (x1, y1, x2, y2) în frame.
+        weight (np.ndarray): Ponderea pixelului original × 255, (h, w, 3) uint8.
+        bias (np.ndarray): Culoarea adăugată, (h, w, 3) uint8.
+    """
+
+    __slots__ = ('key', 'rect', 'weight', 'bias')
+
+    def __init__(self, key, rect, weight, bias):
+        self.key = key
+        self.rect = rect
+        self.weight = weight
+        self.bias = bias
+
+    def apply(self, output: np.ndarray, source: Optional[np.ndarray] = None):
+        """Aplică overlay-ul în `output`, cu pixelii originali din `source`.
+
+        Args:
+            output (np.ndarray): Imaginea destinație (modificată in-place).
+            source (Optional[np.ndarray]): Imaginea originală (default: `output`).
+        """
+        x1, y1, x2, y2 = self.rect
+        roi = output[y1:y2, x1:x2]
+        src = roi if source is None else source[y1:y2, x1:x2]
+        cv2.multiply(src, self.weight, dst=roi, scale=1 / 255)
+        cv2.add(roi, self.bias, dst=roi)
 
 
 class ZoneMonitor:
@@ -143,6 +638,16 @@ class ZoneMonitor:
         config (dict): Configurația încărcată.
         zones (list): Lista zonelor din configurație.
         tracker (ZoneTracker): Tracker pentru timpul de staționare.
+        last_exits (List[Tuple[int, str, float]]): Ieșirile din zone detectate la
+            ultimul `check_violations` (track_id, zone_id, timp petrecut).
+        frame_size (Optional[Tuple[int, int]]): Rezoluția frame-ului (width, height).
+            Poligoanele din configurație sunt în pixelii `image_size`; `polygon_np`
+            e scalat la `frame_size` (ex: decodare la rezoluție redusă).
+        label_raster (Optional[np.ndarray]): Mască uint8/uint16 cu `index_zonă + 1`
+            per pixel, la rezoluția `frame_size * raster_scale`.
+        geometry_version (int): Crește la fiecare recalculare a `polygon_np`
+            (`reload_config`, `set_frame_size`); cheie pentru cache-urile derivate din zone.
+        clock: Ceasul sursei pentru `check_violations` fără `current_time` (vezi `frame_clock`).
         PPE_CLASSES (dict): Mapare între tipuri PPE și clasele YOLO.
     
     Example:
@@ -152,27 +657,107 @@ class ZoneMonitor:
         ...     print(f"Violare: {v.message}")
     """
     
-    # Mapare clase PPE
+    # Mapare clase PPE (aliasuri comparate exact după normalizare, vezi ClassRoles)
     PPE_CLASSES = {
         'helmet': ['Hardhat', 'helmet'],
         'vest': ['Safety Vest', 'vest'],
-        'gloves': ['gloves'],
-        'boots': ['boots', 'safety-boots']
+        'gloves': ['gloves', 'glove'],
+        'boots': ['boots', 'safety-boots', 'shoes'],
+        'goggles': ['goggles'],
+        'mask': ['mask']
     }
     
-    def __init__(self, config_path: str):
+    # Dimensiunea celulei (px) din grila folosită la asocierea PPE-persoană
+    PPE_GRID_CELL = 128
+    
+    # Culorile zonelor (BGR), în ordinea din configurație
+    ZONE_COLORS = [
+        (0, 255, 0),    # Verde
+        (0, 0, 255),    # Roșu
+        (255, 0, 0),    # Albastru
+        (0, 255, 255),  # Galben
+        (255, 0, 255),  # Magenta
+    ]
+    
+    def __init__(self, config_path: str, raster_scale: Optional[float] = 1.0,
+                 exit_timeout: Optional[float] = None, clock=None):
         """
         Args:
             config_path: Calea către fișierul JSON cu configurația zonelor
+            raster_scale: Scara rasterului de etichete față de frame (ex: 0.5 =
+                jumătate din rezoluție). None dezactivează rasterul și zonele
+                se verifică prin teste pe poligoane.
+            exit_timeout: Secunde în care un track nu mai e văzut într-o zonă
+                până e considerat ieșit (timpul de staționare se resetează).
+                None = cheia `exit_timeout` din configurație, altfel `DEFAULT_EXIT_TIMEOUT`
+            clock: Ceasul sursei (`frame_clock.StreamClock`/`MonotonicClock`), folosit de
+                `check_violations` fără `current_time`; None = `DEFAULT_CLOCK`
         """
         self.config_path = Path(config_path)
+        self.raster_scale = raster_scale
+        self.clock = clock if clock is not None else DEFAULT_CLOCK
+        self._exit_timeout = exit_timeout
+        self.tracker = ZoneTracker(exit_timeout=DEFAULT_EXIT_TIMEOUT if exit_timeout is None else exit_timeout)
+        self.last_exits = []
+        self.frame_size = None
+        self.label_raster = None
+        self.class_roles = None
+        self._role_cache = {}  # {class_name: (rol, tip_ppe)}
+        self._zone_overlay = None  # (cheie, ZoneOverlay), vezi get_zone_overlay
+        self.geometry_version = 0
+        self._setup_zones()
+    
+    def _setup_zones(self):
+        """Încarcă configurația și precalculează structurile derivate din poligoane."""
         self.config = self._load_config()
         self.zones = self.config.get('zones', [])
-        self.tracker = ZoneTracker()
+        if self._exit_timeout is None:
+            self.tracker.exit_timeout = float(self.config.get('exit_timeout', DEFAULT_EXIT_TIMEOUT))
+        
+        # Geometria camerei e fixă: rasterul se construiește din image_size
+        # (sau din rezoluția frame-urilor deja văzute, la reîncărcare)
+        image_size = self.config.get('image_size')
+        if image_size and self.frame_size is None:
+            self.frame_size = (int(image_size['width']), int(image_size['height']))
+        self._scale_polygons()
+        self._build_label_raster()
+    
+    def _scale_polygons(self):
+        """Convertește poligoanele din pixelii `image_size` în pixelii frame-ului (`polygon_np`)."""
+        image_size = self.config.get('image_size')
+        scale = np.ones(2)
+        if image_size and self.frame_size is not None:
+            scale = np.array(self.frame_size, np.float64) / (image_size['width'], image_size['height'])
         
-        # Pre-convertește poligoanele în numpy arrays
         for zone in self.zones:
-            zone['polygon_np'] = np.array(zone['polygon'], dtype=np.int32)
+            polygon = np.array(zone['polygon'], dtype=np.float64).reshape(-1, 2)
+            zone['polygon_np'] = np.round(polygon * scale).astype(np.int32)
+        
+        self._build_edge_table()
+        self._zone_overlay = None
+        self.geometry_version += 1
+    
+    def reload_config(self):
+        """Reîncarcă configurația de pe disc; rasterul și overlay-ul de zone se reconstruiesc."""
+        self._setup_zones()
+    
+    def set_frame_size(self, width: int, height: int):
+        """Setează rezoluția frame-urilor; poligoanele și rasterul se reconstruiesc doar la schimbare.
+        
+        Apelul e ieftin când dimensiunea nu se schimbă, deci poate fi făcut la
+        fiecare frame. Dacă configurația are `image_size`, poligoanele sunt
+        scalate la noua rezoluție, deci zonele, detectările și overlay-urile
+        rămân în același sistem de coordonate (al frame-ului).
+        
+        Args:
+            width (int): Lățimea frame-ului.
+            height (int): Înălțimea frame-ului.
+        """
+        frame_size = (int(width), int(height))
+        if frame_size != self.frame_size:
+            self.frame_size = frame_size
+            self._scale_polygons()
+            self._build_label_raster()
     
     def _load_config(self) -> Dict:
         """Încarcă configurația din JSON"""
@@ -198,6 +783,137 @@ class ZoneMonitor:
                 return zone
         return None
     
+    def _build_edge_table(self):
+        """Construiește tabelul cu laturile tuturor poligoanelor.
+        
+        Laturile sunt concatenate zonă după zonă, astfel încât `_edge_offsets[i]`
+        indică prima latură a zonei `i` (folosit de `np.add.reduceat`).
+        """
+        starts, ends, offsets = [], [], []
+        n_edges = 0
+        
+        for zone in self.zones:
+            polygon = zone['polygon_np'].reshape(-1, 2).astype(np.float64)
+            offsets.append(n_edges)
+            starts.append(polygon)
+            ends.append(np.roll(polygon, -1, axis=0))
+            n_edges += len(polygon)
+        
+        if n_edges:
+            self._edge_start = np.concatenate(starts)
+            self._edge_end = np.concatenate(ends)
+        else:
+            self._edge_start = np.empty((0, 2), dtype=np.float64)
+            self._edge_end = np.empty((0, 2), dtype=np.float64)
+        self._edge_offsets = np.array(offsets, dtype=np.intp)
+    
+    def _build_label_raster(self):
+        """Rasterizează toate poligoanele într-o mască de etichete la rezoluția frame-ului.
+        
+        Pixelul conține `index_zonă + 1` (0 = nicio zonă). Zonele sunt desenate
+        în ordine inversă, deci la suprapuneri câștigă prima zonă din
+        configurație, la fel ca în `get_zone_for_point`.
+        """
+        self.label_raster = None
+        if self.raster_scale is None or self.frame_size is None or not self.zones:
+            return
+        
+        width, height = self.frame_size
+        raster_w = max(1, int(round(width * self.raster_scale)))
+        raster_h = max(1, int(round(height * self.raster_scale)))
+        dtype = np.uint8 if len(self.zones) < 255 else np.uint16
+        raster = np.zeros((raster_h, raster_w), dtype=dtype)
+        
+        for idx in range(len(self.zones) - 1, -1, -1):
+            polygon = np.round(self.zones[idx]['polygon_np'] * self.raster_scale)
+            cv2.fillPoly(raster, [polygon.astype(np.int32)], idx + 1)
+        
+        self.label_raster = raster
+    
+    def zones_for_points(self, centers: np.ndarray) -> np.ndarray:
+        """Clasifică toate punctele față de toate zonele într-o singură trecere NumPy.
+        
+        Dacă rasterul de etichete e disponibil, fiecare punct din frame costă
+        un singur acces în array, indiferent de numărul de zone și vârfuri.
+        Punctele din afara frame-ului (sau fără raster) trec prin testul exact
+        pe poligoane (`_zones_for_points_exact`).
+        La zone suprapuse câștigă prima zonă din configurație.
+        
+        Args:
+            centers (np.ndarray): Array (N, 2) cu coordonatele (x, y) ale punctelor.
+            
+        Returns:
+            np.ndarray: Array (N,) cu indexul zonei din `self.zones` pentru fiecare
+            punct, sau -1 dacă punctul nu e în nicio zonă.
+            
+        Example:
+            >>> idx = monitor.zones_for_points(np.array([[150, 300], [5, 5]]))
+            >>> print(idx)  # [ 0 -1]
+        """
+        points = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        
+        if self.label_raster is None or len(points) == 0:
+            return self._zones_for_points_exact(points)
+        
+        width, height = self.frame_size
+        in_frame = ((points[:, 0] >= 0) & (points[:, 0] < width)
+                    & (points[:, 1] >= 0) & (points[:, 1] < height))
+        
+        raster_h, raster_w = self.label_raster.shape
+        cols = np.minimum((points[in_frame, 0] * self.raster_scale).astype(np.intp), raster_w - 1)
+        rows = np.minimum((points[in_frame, 1] * self.raster_scale).astype(np.intp), raster_h - 1)
+        
+        result = np.empty(len(points), dtype=np.intp)
+        result[in_frame] = self.label_raster[rows, cols].astype(np.intp) - 1
+        if not in_frame.all():
+            result[~in_frame] = self._zones_for_points_exact(points[~in_frame])
+        return result
+    
+    def _zones_for_points_exact(self, points: np.ndarray) -> np.ndarray:
+        """Test exact pe poligoane pentru toate punctele, vectorizat.
+        
+        Echivalent cu `get_zone_for_point`: folosește ray casting (regula
+        par-impar) pe toate laturile simultan, iar punctele aflate pe contur
+        sunt considerate în interior, ca la `cv2.pointPolygonTest`.
+        
+        Args:
+            points (np.ndarray): Array (N, 2) float64 cu coordonatele punctelor.
+            
+        Returns:
+            np.ndarray: Array (N,) cu indexul zonei sau -1.
+        """
+        result = np.full(len(points), -1, dtype=np.intp)
+        
+        if len(points) == 0 or len(self._edge_offsets) == 0:
+            return result
+        
+        # Coloane (N, 1) contra laturi (M,) -> matrici (N, M)
+        px = points[:, 0:1]
+        py = points[:, 1:2]
+        x1, y1 = self._edge_start[:, 0], self._edge_start[:, 1]
+        x2, y2 = self._edge_end[:, 0], self._edge_end[:, 1]
+        
+        # Ray casting spre dreapta: latura traversează orizontala punctului
+        straddle = (y1 > py) != (y2 > py)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        crossings = straddle & (px < x_cross)
+        
+        # Puncte pe contur (coliniare și în interiorul segmentului)
+        cross = (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1)
+        on_edge = ((cross == 0)
+                   & (px >= np.minimum(x1, x2)) & (px <= np.maximum(x1, x2))
+                   & (py >= np.minimum(y1, y2)) & (py <= np.maximum(y1, y2)))
+        
+        # Reduce pe zone: paritatea intersecțiilor + contur
+        counts = np.add.reduceat(crossings, self._edge_offsets, axis=1, dtype=np.intp)
+        touches = np.logical_or.reduceat(on_edge, self._edge_offsets, axis=1)
+        inside = (counts % 2 == 1) | touches
+        
+        hit = inside.any(axis=1)
+        result[hit] = inside.argmax(axis=1)[hit]
+        return result
+    
     def check_ppe_requirements(self, 
                                person_detection: Detection,
                                ppe_detections: List[Detection],
@@ -216,6 +932,7 @@ class ZoneMonitor:
         person_area = (px1, py1, px2, py2)
         
         detected_ppe = set()
+        absent_ppe = set()
         
         for ppe in ppe_detections:
             # Verifică overlap între persoană și PPE
@@ -224,14 +941,132 @@ class ZoneMonitor:
             # IoU simplu sau verificare că PPE e în bbox persoană
             if self._boxes_overlap(person_area, (ppx1, ppy1, ppx2, ppy2)):
                 # Identifică tipul PPE
-                for ppe_type, class_names in self.PPE_CLASSES.items():
-                    if any(cn.lower() in ppe.class_name.lower() for cn in class_names):
-                        detected_ppe.add(ppe_type)
+                role, ppe_type = self._class_role(ppe.class_name)
+                if role == ClassRoles.ROLE_PPE:
+                    detected_ppe.add(ppe_type)
+                elif role == ClassRoles.ROLE_NO_PPE:
+                    absent_ppe.add(ppe_type)
         
-        # Ce lipsește?
-        missing = [ppe for ppe in required_ppe if ppe not in detected_ppe]
+        # Ce lipsește? (clasele negative, ex: 'no_helmet', au prioritate)
+        missing = [ppe for ppe in required_ppe
+                   if ppe not in detected_ppe or ppe in absent_ppe]
         return missing
     
+    def compile_class_roles(self, names: Dict[int, str]) -> ClassRoles:
+        """Compilează tabelul class id → rol pentru clasele modelului.
+        
+        Args:
+            names (Dict[int, str]): Maparea {class_id: class_name} (ex: `model.names`).
+            
+        Returns:
+            ClassRoles: Tabelul compilat (păstrat și în `self.class_roles`).
+        """
+        self.class_roles = ClassRoles(names, self.PPE_CLASSES)
+        return self.class_roles
+    
+    def _class_role(self, class_name: str) -> Tuple[int, Optional[str]]:
+        """Returnează (rol, tip PPE) pentru o clasă YOLO (memorat per nume de clasă)."""
+        if class_name not in self._role_cache:
+            self._role_cache[class_name] = ClassRoles.resolve(class_name, self.PPE_CLASSES)
+        return self._role_cache[class_name]
+    
+    def _batch_roles(self, batch: DetectionBatch) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """Returnează rolul fiecărei detecții din batch și tipul PPE al fiecăreia.
+        
+        Pentru batch-urile create cu `model.names` se folosește direct tabelul
+        compilat (`compile_class_roles`); altfel rolurile se rezolvă o dată
+        per clasă distinctă.
+        """
+        roles = self.class_roles
+        if roles is not None and batch.names is roles.names:
+            role = roles.role[batch.class_ids]
+            type_idx = roles.ppe_type[batch.class_ids]
+            ppe_types = [roles.ppe_types[t] if t >= 0 else None for t in type_idx.tolist()]
+            return role, ppe_types
+        
+        lookup = {class_id: self._class_role(name) for class_id, name in batch.names.items()}
+        resolved = [lookup[class_id] for class_id in batch.class_ids.tolist()]
+        role = np.array([r for r, _ in resolved], dtype=np.int8)
+        return role, [ppe_type for _, ppe_type in resolved]
+    
+    @staticmethod
+    def _as_batch(detections: Union[DetectionBatch, List[Detection], None]) -> DetectionBatch:
+        """Convertește o listă de `Detection` în `DetectionBatch` (dacă e nevoie)."""
+        if isinstance(detections, DetectionBatch):
+            return detections
+        return DetectionBatch.from_detections(detections or [])
+    
+    def associate_ppe(self,
+                      person_detections: Union[DetectionBatch, List[Detection]],
+                      ppe_detections: Union[DetectionBatch, List[Detection]]) -> List[set]:
+        """Asociază PPE-urile cu persoanele pentru tot frame-ul, printr-o grilă uniformă.
+        
+        Fiecare PPE e pus o singură dată în celulele de `PPE_GRID_CELL` px pe care
+        le acoperă; fiecare persoană verifică doar PPE-urile din celulele ei,
+        deci costul e aproximativ liniar în numărul de detectări. Criteriul de
+        overlap e același ca în `check_ppe_requirements`.
+        
+        Args:
+            person_detections: Detectările de persoane (listă sau DetectionBatch).
+            ppe_detections: Detectările de PPE (listă sau DetectionBatch).
+            
+        Returns:
+            List[set]: Pentru fiecare persoană, mulțimea tipurilor PPE detectate
+            pe ea (ex: {'helmet', 'vest'}).
+        """
+        persons = self._as_batch(person_detections)
+        ppe = self._as_batch(ppe_detections)
+        return self._associate_ppe(persons, ppe, self._batch_roles(ppe))[0]
+    
+    def _associate_ppe(self,
+                       persons: DetectionBatch,
+                       ppe: DetectionBatch,
+                       ppe_roles: Tuple[np.ndarray, List[Optional[str]]]
+                       ) -> Tuple[List[set], List[set], List[bool]]:
+        """Asocierea pe grilă, inclusiv clasele negative (ex: 'no_helmet').
+        
+        Returns:
+            Tuple: (PPE prezent per persoană, PPE explicit lipsă per persoană,
+            flag per detecție PPE dacă se suprapune cu vreo persoană).
+        """
+        ppe_sets = [set() for _ in range(len(persons))]
+        no_ppe_sets = [set() for _ in range(len(persons))]
+        attributed = [False] * len(ppe)
+        if not len(persons) or not len(ppe):
+            return ppe_sets, no_ppe_sets, attributed
+        
+        role, ppe_types = ppe_roles
+        role = role.tolist()
+        ppe_boxes = ppe.boxes.tolist()
+        cell = self.PPE_GRID_CELL
+        grid = {}  # {(cx, cy): [index PPE]}
+        
+        for j, (x1, y1, x2, y2) in enumerate(ppe_boxes):
+            if role[j] not in (ClassRoles.ROLE_PPE, ClassRoles.ROLE_NO_PPE):
+                continue
+            for cx in range(x1 // cell, x2 // cell + 1):
+                for cy in range(y1 // cell, y2 // cell + 1):
+                    grid.setdefault((cx, cy), []).append(j)
+        
+        for i, person_box in enumerate(persons.boxes.tolist()):
+            px1, py1, px2, py2 = person_box
+            seen = set()
+            
+            for cx in range(px1 // cell, px2 // cell + 1):
+                for cy in range(py1 // cell, py2 // cell + 1):
+                    for j in grid.get((cx, cy), ()):
+                        if j in seen:
+                            continue
+                        seen.add(j)
+                        if self._boxes_overlap(person_box, ppe_boxes[j]):
+                            if role[j] == ClassRoles.ROLE_PPE:
+                                ppe_sets[i].add(ppe_types[j])
+                            else:
+                                no_ppe_sets[i].add(ppe_types[j])
+                            attributed[j] = True
+        
+        return ppe_sets, no_ppe_sets, attributed
+    
     def _boxes_overlap(self, box1: Tuple, box2: Tuple) -> bool:
         """Verifică dacă două bounding boxes se suprapun"""
         x1_1, y1_1, x2_1, y2_1 = box1
@@ -240,8 +1075,8 @@ class ZoneMonitor:
         return not (x2_1 < x1_2 or x2_2 < x1_1 or y2_1 < y1_2 or y2_2 < y1_1)
     
     def check_violations(self,
-                        person_detections: List[Detection],
-                        ppe_detections: List[Detection],
+                        person_detections: Union[DetectionBatch, List[Detection]],
+                        ppe_detections: Union[DetectionBatch, List[Detection], None] = None,
                         current_time: Optional[datetime] = None) -> List[ZoneViolation]:
         """Verifică toate violările pentru frame-ul curent.
         
@@ -251,139 +1086,273 @@ class ZoneMonitor:
         - Dacă a depășit timpul maxim de staționare
         - Dacă are acces în zona restricționată
         
+        Detectările negative din `ppe_detections` (ex: 'no_helmet') marchează PPE-ul
+        ca lipsă pentru persoana pe care o suprapun; cele fără persoană produc
+        direct o violare 'missing_ppe' dacă zona lor cere acel PPE.
+        
         Args:
-            person_detections (List[Detection]): Lista cu detectări de persoane.
-            ppe_detections (List[Detection]): Lista cu detectări de PPE.
-            current_time (Optional[datetime]): Timestamp-ul curent (default: datetime.now()).
+            person_detections (Union[DetectionBatch, List[Detection]]): Detectările de
+                persoane. Un `DetectionBatch` cu `ppe_detections=None` e tratat ca
+                toate detectările frame-ului și e separat după rolul claselor.
+            ppe_detections (Union[DetectionBatch, List[Detection], None]): Detectările de PPE.
+            current_time (Optional[datetime]): Timestamp-ul frame-ului, ex: `packet.timestamp`
+                (default: `self.clock.now()`).
             
         Returns:
             List[ZoneViolation]: Lista cu toate violările detectate în frame.
         """
         if current_time is None:
-            current_time = datetime.now()
+            current_time = self.clock.now()
+        now = to_seconds(current_time)
+        
+        # Ieșirile din zone: track-urile nevăzute de `exit_timeout` (O(log n) per ieșire)
+        self.last_exits = self.tracker.expire(now)
+        
+        if isinstance(person_detections, DetectionBatch) and ppe_detections is None:
+            role, _ = self._batch_roles(person_detections)
+            persons = person_detections.select(role == ClassRoles.ROLE_PERSON)
+            ppe = person_detections.select((role == ClassRoles.ROLE_PPE)
+                                           | (role == ClassRoles.ROLE_NO_PPE))
+        else:
+            persons = self._as_batch(person_detections)
+            ppe = self._as_batch(ppe_detections)
         
         violations = []
+        ppe_roles = self._batch_roles(ppe)
+        association = None  # Asocierea PPE se calculează o dată, la prima nevoie
         
-        for person in person_detections:
-            center = person.center
-            zone = self.get_zone_for_point(center)
-            
-            if zone is None:
-                continue  # Persoana nu e în nicio zonă
-            
+        # Toate centrele clasificate într-o singură trecere
+        zone_indices = self.zones_for_points(persons.centers)
+        track_ids = persons.track_ids
+        
+        for i in np.flatnonzero(zone_indices >= 0).tolist():
+            zone = self.zones[zone_indices[i]]
             rules = zone.get('rules', {})
             zone_id = zone['id']
             zone_name = zone['name']
+            person = None  # Detection creat doar dacă persoana are violări
             
             # 1. Verifică PPE necesar
             required_ppe = rules.get('ppe_required', [])
             if required_ppe:
-                missing_ppe = self.check_ppe_requirements(
-                    person, ppe_detections, required_ppe
-                )
+                if association is None:
+                    association = self._associate_ppe(persons, ppe, ppe_roles)
+                ppe_sets, no_ppe_sets, _ = association
+                missing_ppe = [ppe_type for ppe_type in required_ppe
+                               if ppe_type not in ppe_sets[i] or ppe_type in no_ppe_sets[i]]
                 if missing_ppe:
+                    person = person or persons[i]
                     violations.append(ZoneViolation(
                         zone_id=zone_id,
                         zone_name=zone_name,
                         violation_type='missing_ppe',
                         detection=person,
-                        message=f"PPE lipsă în {zone_name}: {', '.join(missing_ppe)}",
                         timestamp=current_time,
-                        severity='high'
+                        severity='high',
+                        details=tuple(missing_ppe)
                     ))
             
             # 2. Verifică timp de staționare
             max_dwell = rules.get('max_dwell_time')
-            if max_dwell and person.track_id is not None:
-                dwell_time = self.tracker.update(person.track_id, zone_id, current_time)
+            track_id = int(track_ids[i])
+            if max_dwell and track_id >= 0:
+                dwell_time = self.tracker.update(track_id, zone_id, now)
                 
                 if dwell_time > max_dwell:
+                    person = person or persons[i]
                     violations.append(ZoneViolation(
                         zone_id=zone_id,
                         zone_name=zone_name,
                         violation_type='dwell_time_exceeded',
                         detection=person,
-                        message=f"Timp depășit în {zone_name}: {int(dwell_time)}s / {max_dwell}s",
                         timestamp=current_time,
-                        severity='medium'
+                        severity='medium',
+                        details=(dwell_time, max_dwell)
                     ))
             
             # 3. Verifică acces restricționat
             if rules.get('restricted_access', False):
+                person = person or persons[i]
                 violations.append(ZoneViolation(
                     zone_id=zone_id,
                     zone_name=zone_name,
                     violation_type='restricted_access',
                     detection=person,
-                    message=f"Acces neautorizat în {zone_name}",
                     timestamp=current_time,
                     severity='high'
                 ))
         
+        # 4. Clase negative (ex: 'no_helmet') care nu aparțin unei persoane detectate
+        violations.extend(self._check_negative_ppe(
+            persons, ppe, ppe_roles, association, current_time
+        ))
+        
+        return violations
+    
+    def _check_negative_ppe(self,
+                            persons: DetectionBatch,
+                            ppe: DetectionBatch,
+                            ppe_roles: Tuple[np.ndarray, List[Optional[str]]],
+                            association: Optional[Tuple],
+                            current_time: datetime) -> List[ZoneViolation]:
+        """Violări directe pentru detectările negative neatribuite unei persoane."""
+        role, ppe_types = ppe_roles
+        negatives = role == ClassRoles.ROLE_NO_PPE
+        if not negatives.any():
+            return []
+        
+        if association is None and len(persons):
+            association = self._associate_ppe(persons, ppe, ppe_roles)
+        if association is not None:
+            negatives &= ~np.array(association[2], dtype=bool)
+        
+        negative_idx = np.flatnonzero(negatives)
+        if not len(negative_idx):
+            return []
+        
+        zone_indices = self.zones_for_points(ppe.centers[negative_idx])
+        violations = []
+        
+        for j, zone_idx in zip(negative_idx.tolist(), zone_indices.tolist()):
+            if zone_idx < 0:
+                continue
+            
+            zone = self.zones[zone_idx]
+            ppe_type = ppe_types[j]
+            if ppe_type not in zone.get('rules', {}).get('ppe_required', []):
+                continue
+            
+            violations.append(ZoneViolation(
+                zone_id=zone['id'],
+                zone_name=zone['name'],
+                violation_type='missing_ppe',
+                detection=ppe[j],
+                timestamp=current_time,
+                severity='high',
+                details=(ppe_type,)
+            ))
+        
         return violations
     
     def draw_zones(self, image: np.ndarray, 
                    alpha: float = 0.3,
-                   show_labels: bool = True) -> np.ndarray:
+                   show_labels: bool = True,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
         """Desenează zonele de monitorizare pe imagine.
         
+        Overlay-ul (fill, contururi, etichete) e randat o singură dată și ținut
+        în cache (vezi `get_zone_overlay`); per frame rămâne un blend mascat
+        limitat la dreptunghiul care conține zonele.
+        
         Args:
             image (np.ndarray): Imaginea pe care să deseneze zonele.
             alpha (float): Transparența fill-ului (0-1, default: 0.3).
             show_labels (bool): Dacă să afișeze numele zonelor (default: True).
+            out (Optional[np.ndarray]): Destinația: None = copie nouă, `image` =
+                desenare in-place, alt array de aceeași formă = buffer reutilizat.
             
         Returns:
-            np.ndarray: Imaginea cu zonele desenate.
+            np.ndarray: Imaginea cu zonele desenate (`out`, dacă e setat).
         """
-        overlay = image.copy()
-        output = image.copy()
+        output = _output_buffer(image, out)
+        overlay = self.get_zone_overlay(image.shape[0], image.shape[1], alpha, show_labels)
+        if overlay is not None:
+            overlay.apply(output)
+        return output
+    
+    def get_zone_overlay(self, height: int, width: int, alpha: float = 0.3,
+                         show_labels: bool = True) -> Optional[ZoneOverlay]:
+        """Returnează overlay-ul zonelor pentru parametrii dați, din cache.
+        
+        Overlay-ul e randat o singură dată per (dimensiune frame, alpha,
+        show_labels); cache-ul e invalidat de `reload_config`.
+        
+        Returns:
+            Optional[ZoneOverlay]: None dacă nu există zone (sau niciuna nu e în frame).
+        """
+        key = (int(height), int(width), float(alpha), bool(show_labels))
+        if self._zone_overlay is None or self._zone_overlay[0] != key:
+            self._zone_overlay = (key, self._build_zone_overlay(*key))
+        return self._zone_overlay[1]
+    
+    def _build_zone_overlay(self, height: int, width: int, alpha: float,
+                            show_labels: bool) -> Optional[ZoneOverlay]:
+        """Randează fill-ul, contururile și etichetele zonelor pe straturi separate.
         
-        colors = [
-            (0, 255, 0),    # Verde
-            (0, 0, 255),    # Roșu
-            (255, 0, 0),    # Albastru
-            (0, 255, 255),  # Galben
-            (255, 0, 255),  # Magenta
-        ]
+        Ordinea de desenare e aceeași ca înainte de cache (fill, contur, etichetă,
+        zonă cu zonă), deci suprapunerile arată identic.
+        """
+        if not self.zones:
+            return None
+        
+        fill = np.zeros((height, width, 3), np.uint8)
+        fill_mask = np.zeros((height, width), np.uint8)
+        # Contururile și etichetele (antialiasate) pe fundal negru și pe fundal alb:
+        # din cele două se obține, per pixel, ponderea pixelului original și culoarea
+        lines_black = np.zeros((height, width, 3), np.uint8)
+        lines_white = np.full((height, width, 3), 255, np.uint8)
         
         for i, zone in enumerate(self.zones):
-            color = colors[i % len(colors)]
+            color = self.ZONE_COLORS[i % len(self.ZONE_COLORS)]
             polygon = zone['polygon_np']
             
             # Fill semi-transparent
-            cv2.fillPoly(overlay, [polygon], color)
+            cv2.fillPoly(fill, [polygon], color)
+            cv2.fillPoly(fill_mask, [polygon], 255)
             
-            # Contur
-            cv2.polylines(output, [polygon], True, color, 2)
-            
-            # Label
-            if show_labels:
-                # Calculează centroid pentru text
-                M = cv2.moments(polygon)
-                if M["m00"] != 0:
-                    cx = int(M["m10"] / M["m00"])
-                    cy = int(M["m01"] / M["m00"])
-                    
-                    text = zone['name']
-                    font = cv2.FONT_HERSHEY_SIMPLEX
-                    cv2.putText(output, text, (cx - 50, cy),
-                              font, 0.6, (255, 255, 255), 2)
-        
-        # Blend
-        cv2.addWeighted(overlay, alpha, output, 1 - alpha, 0, output)
+            for canvas in (lines_black, lines_white):
+                # Contur
+                cv2.polylines(canvas, [polygon], True, color, 2)
+                
+                # Label
+                if show_labels:
+                    # Calculează centroid pentru text
+                    M = cv2.moments(polygon)
+                    if M["m00"] != 0:
+                        cx = int(M["m10"] / M["m00"])
+                        cy = int(M["m01"] / M["m00"])
+                        
+                        text = zone['name']
+                        font = cv2.FONT_HERSHEY_SIMPLEX
+                        cv2.putText(canvas, text, (cx - 50, cy),
+                                  font, 0.6, (255, 255, 255), 2)
         
-        return output
+        drawn = fill_mask.astype(bool) | ((lines_black != 0) | (lines_white != 255)).any(axis=2)
+        x, y, w, h = cv2.boundingRect(drawn.astype(np.uint8))
+        if w == 0 or h == 0:
+            return None
+        
+        # Blend = alpha * strat_fill + (1 - alpha) * strat_contur, ambele afine în
+        # pixelul original: fill = culoare sau original, contur = pondere * original + culoare
+        region = np.s_[y:y + h, x:x + w]
+        alpha = np.float32(alpha)
+        black = lines_black[region].astype(np.float32)
+        line_weight = (lines_white[region] - black) * ((1 - alpha) / 255)
+        outside_fill = (fill_mask[region] == 0)[..., None]
+        weight = line_weight + outside_fill * alpha
+        # Stratul `fill` e negru în afara zonelor
+        bias = (1 - alpha) * black + alpha * fill[region].astype(np.float32)
+        
+        return ZoneOverlay(
+            key=(height, width, alpha, show_labels),
+            rect=(x, y, x + w, y + h),
+            weight=np.rint(weight * 255).clip(0, 255).astype(np.uint8),
+            bias=np.rint(bias).clip(0, 255).astype(np.uint8)
+        )
     
     def draw_violations(self, image: np.ndarray, 
-                       violations: List[ZoneViolation]) -> np.ndarray:
+                       violations: List[ZoneViolation],
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
         """Desenează violările pe imagine cu bounding boxes și text.
         
         Args:
             image (np.ndarray): Imaginea pe care să deseneze.
             violations (List[ZoneViolation]): Lista cu violările de desenat.
+            out (Optional[np.ndarray]): Destinația: None = copie nouă, `image` =
+                desenare in-place, alt array de aceeași formă = buffer reutilizat.
             
         Returns:
-            np.ndarray: Imaginea cu violările vizualizate.
+            np.ndarray: Imaginea cu violările vizualizate (`out`, dacă e setat).
             
         Note:
             Culoarea bounding box-ului depinde de severity:
@@ -391,7 +1360,7 @@ class ZoneMonitor:
             - medium: portocaliu
             - low: galben
         """
-        output = image.copy()
+        output = _output_buffer(image, out)
         
         for violation in violations:
             bbox = violation.detection.bbox